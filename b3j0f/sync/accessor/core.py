@@ -29,6 +29,7 @@
 __all__ = ['Accessor']
 
 from ..record.core import Record
+from ..record.batch import RecordBatch
 
 
 class Accessor(Record):
@@ -39,6 +40,33 @@ class Accessor(Record):
 
     __rtypes__ = []  #: specify record type accessor implementations.
 
+    def connect(self, store):
+        """Open a connection to a store backend.
+
+        Stores pool connections of accessors which override this method, and
+        borrow one per accessor call (see Store.connection).
+
+        :param Store store: store which owns the connection pool.
+        :return: new connection."""
+
+        return None
+
+    def disconnect(self, store, connection):
+        """Close a connection opened by the connect method.
+
+        :param Store store: store which owns the connection pool.
+        :param connection: connection to close."""
+
+    def check(self, store, connection):
+        """Check an idle connection before its reuse.
+
+        :param Store store: store which owns the connection pool.
+        :param connection: connection to check.
+        :return: False if the connection is broken. Default is True.
+        :rtype: bool"""
+
+        return True
+
     def record2data(self, store, record, dirty=True):
         """Get a specific store data from a record.
 
@@ -81,11 +109,13 @@ class Accessor(Record):
 
         raise NotImplementedError()
 
-    def get(self, store, record):
+    def get(self, store, record, fields=None):
         """Get a record from a store.
 
         :param Store store: store from which get a record.
         :param Record record: record to get from the store.
+        :param list fields: field names to load (see Record.lazy). Only given
+            by stores if not None.
         :rtype: Record"""
 
         raise NotImplementedError()
@@ -100,9 +130,22 @@ class Accessor(Record):
 
         raise NotImplementedError()
 
+    def estimate(self, store, rtypes):
+        """Get an estimated number of records without scanning them, such
+        as database statistics.
+
+        Default implementation returns None.
+
+        :param Store store: store from where get number of records.
+        :param list rtypes: record types.
+        :return: estimated count or None if the store has no statistics.
+        :rtype: int"""
+
+        return None
+
     def find(
         self, store, rtypes, records=None, data=None,
-        limit=None, skip=None, sort=None
+        limit=None, skip=None, sort=None, fields=None
     ):
         """Find records from a store.
 
@@ -113,6 +156,8 @@ class Accessor(Record):
         :param int limit: maximal number of records to retrieve.
         :param int skip: number of elements to avoid.
         :param list sort: list of field name to sort by value.
+        :param list fields: field names to load (see Record.lazy). Only given
+            by stores if not None.
         :return: records of input type and field values.
         :rtype: list"""
 
@@ -127,3 +172,68 @@ class Accessor(Record):
         :param dict filter: data content to filter."""
 
         raise NotImplementedError()
+
+    def add_batch(self, store, batch):
+        """Add a record batch in a store.
+
+        Default implementation adds records of the batch.
+
+        :param Store store: store where add records.
+        :param RecordBatch batch: records to add.
+        :return: number of added records.
+        :rtype: int"""
+
+        return len(self.add(store=store, records=batch.records()))
+
+    def update_batch(self, store, batch, upsert=False):
+        """Update a record batch in a store.
+
+        Default implementation updates records of the batch.
+
+        :param Store store: store where update records.
+        :param RecordBatch batch: records to update.
+        :param bool upsert: if True (default False), add records which do not
+            exist.
+        :return: number of updated records.
+        :rtype: int"""
+
+        return len(
+            self.update(store=store, records=batch.records(), upsert=upsert)
+        )
+
+    def find_batch(
+            self, store, rtype, data=None, limit=None, skip=None, sort=None
+    ):
+        """Find records of a type in a batch.
+
+        Default implementation finds records and puts them in a batch.
+
+        :param Store store: store from where find records.
+        :param type rtype: record type.
+        :param dict data: data content to filter.
+        :param int limit: maximal number of records to retrieve.
+        :param int skip: number of elements to avoid.
+        :param list sort: list of field name to sort by value.
+        :rtype: RecordBatch"""
+
+        return RecordBatch.fromrecords(
+            rtype=rtype, stores=[store],
+            records=self.find(
+                store=store, rtypes=[rtype], data=data,
+                limit=limit, skip=skip, sort=sort
+            )
+        )
+
+    def bytesize(self, store, cmd, params, result):
+        """Get the number of bytes exchanged with a store by a command.
+
+        Used by store instrumentation. Default implementation returns None.
+
+        :param Store store: store used by the command.
+        :param str cmd: command name.
+        :param dict params: command parameters.
+        :param result: command result.
+        :return: number of bytes or None if unknown.
+        :rtype: int"""
+
+        return None
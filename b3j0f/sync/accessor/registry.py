@@ -28,22 +28,114 @@
 
 __all__ = ['AccessorRegistry']
 
-from ..record import Record
-
 
 class AccessorRegistry(dict):
     """In charge of register accessors.
 
     Accessors are registered related to record type such as python class or
-    record name (a collection name for example)."""
+    record name (a collection name for example).
+
+    The get method resolves a python class along its mro if it is not
+    registered, and memoizes the result until the next registry change.
+
+    Changes replace the memo once applied instead of clearing it, so a
+    resolution running in another thread never memoizes an obsolete accessor.
+    """
 
     def __init__(self, accessors=None, *args, **kwargs):
 
+        self._resolved = {}  # resolved accessors by record type.
+
         super(AccessorRegistry, self).__init__(*args, **kwargs)
 
         if accessors is not None:
             self.register(accessors=accessors)
 
+    def get(self, rtype, default=None):
+        """Get the accessor of input record type.
+
+        If rtype is not registered and is a python class, get the accessor of
+        the nearest registered class in its mro.
+
+        :param rtype: record type.
+        :param default: value to return if no accessor is found.
+        :return: resolved accessor or default."""
+
+        resolved = self._resolved  # snapshot of the memo
+
+        try:
+            result = resolved[rtype]
+
+        except KeyError:
+            result = resolved[rtype] = self._resolve(rtype)
+
+        return default if result is None else result
+
+    def _resolve(self, rtype):
+        """Resolve the accessor of input record type without memoization.
+
+        :return: resolved accessor or None."""
+
+        # atomic lookups, types can be unregistered by other threads
+        result = dict.get(self, rtype)
+
+        if result is None and isinstance(rtype, type):
+            for base in rtype.__mro__[1:]:
+                result = dict.get(self, base)
+
+                if result is not None:
+                    break
+
+        return result
+
+    def __setitem__(self, key, value):
+
+        super(AccessorRegistry, self).__setitem__(key, value)
+
+        self._resolved = {}
+
+    def __delitem__(self, key):
+
+        super(AccessorRegistry, self).__delitem__(key)
+
+        self._resolved = {}
+
+    def clear(self):
+
+        super(AccessorRegistry, self).clear()
+
+        self._resolved = {}
+
+    def pop(self, *args):
+
+        result = super(AccessorRegistry, self).pop(*args)
+
+        self._resolved = {}
+
+        return result
+
+    def popitem(self):
+
+        result = super(AccessorRegistry, self).popitem()
+
+        self._resolved = {}
+
+        return result
+
+    def setdefault(self, key, default=None):
+
+        result = super(AccessorRegistry, self).setdefault(key, default)
+
+        self._resolved = {}
+
+        return result
+
+    def update(self, *args, **kwargs):
+
+        super(AccessorRegistry, self).update(*args, **kwargs)
+
+        self._resolved = {}
+
     def register(self, accessors):
         """Register accessors.
 
@@ -68,5 +160,4 @@ class AccessorRegistry(dict):
         if accessors is not None:
             for accessor in accessors:
                 for rtype in accessor.__rtypes__:
-                    if rtype in self:
-                        del self[rtype]
+                    self.pop(rtype, None)
@@ -100,7 +100,7 @@ class MyAccessor(Accessor):
 
     def count(self, store, rtypes, data=None):
 
-        return len(self.find(store, rtypes, data))
+        return len(self.find(store=store, rtypes=rtypes, data=data))
 
     def remove(self, store, rtypes, records=None, data=None):
 
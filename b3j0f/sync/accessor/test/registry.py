@@ -113,6 +113,40 @@ class AccessorRegistryTest(UTCase):
         accessor = self.ar.get(MyRecord2)
         self.assertIsNone(accessor)
 
+    def test_mro(self):
+
+        class MyRecord00(MyRecord0):
+            pass
+
+        accessor = self.ar.get(MyRecord00)
+        self.assertIsNone(accessor)
+
+        self.ar.register(accessors=[self.myaccessor0])
+
+        accessor = self.ar.get(MyRecord00)
+        self.assertIs(accessor, self.myaccessor0)
+        self.assertNotIn(MyRecord00, self.ar)
+
+        self.ar[MyRecord00] = self.myaccessor12
+
+        accessor = self.ar.get(MyRecord00)
+        self.assertIs(accessor, self.myaccessor12)
+
+        self.ar.clear()
+
+        accessor = self.ar.get(MyRecord00, 1)
+        self.assertEqual(accessor, 1)
+
+    def test_name(self):
+
+        self.ar['records'] = self.myaccessor0
+
+        accessor = self.ar.get('records')
+        self.assertIs(accessor, self.myaccessor0)
+
+        accessor = self.ar.get('other')
+        self.assertIsNone(accessor)
+
 
 if __name__ == '__main__':
     main()
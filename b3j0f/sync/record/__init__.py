@@ -28,3 +28,5 @@
 
 from .core import Record
 from .field import Field
+from .batch import RecordBatch
+from .intern import InternTable
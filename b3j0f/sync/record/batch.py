@@ -0,0 +1,283 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------------------------
+# The MIT License (MIT)
+#
+# Copyright (c) 2014 Jonathan Labéjof <jonathan.labejof@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# --------------------------------------------------------------------
+
+"""Columnar record batch definition module."""
+
+__all__ = ['RecordBatch']
+
+from array import array
+
+from collections import OrderedDict
+
+from six import integer_types
+
+try:
+    array('q')
+
+except ValueError:  # python < 3.3
+    _INTCODE = 'l'
+
+else:
+    _INTCODE = 'q'
+
+#: array type codes by field type.
+TYPECODES = dict((ftype, _INTCODE) for ftype in integer_types)
+TYPECODES[float] = 'd'
+
+
+def column(values, ftype=None):
+    """Get a column of values.
+
+    The column is a typed array if the field type allows it and if values
+    fit in it, otherwise a list.
+
+    :param values: column values.
+    :param type ftype: field type.
+    :rtype: array or list"""
+
+    code = TYPECODES.get(ftype)
+
+    if code is None:
+        result = list(values)
+
+    else:
+        values = list(values)
+
+        try:
+            result = array(code, values)
+
+        except (TypeError, OverflowError):  # None or big values
+            result = values
+
+    return result
+
+
+class RecordBatch(object):
+    """Values of records of a same type stored column by column.
+
+    Records are built only when items are got, and are cached. A slice is a
+    batch."""
+
+    def __init__(
+            self, rtype, columns=None, stores=None, unloaded=None,
+            *args, **kwargs
+    ):
+        """
+        :param type rtype: record type.
+        :param dict columns: columns of same length by field name. Columns of
+            integer and float fields are converted to typed arrays if
+            possible.
+        :param list stores: stores to bind to built records.
+        :param list unloaded: names of fields unloaded by a projection in
+            source records. Such a batch can not be written.
+        """
+
+        super(RecordBatch, self).__init__(*args, **kwargs)
+
+        self.rtype = rtype
+        self.stores = stores
+        self.unloaded = frozenset(unloaded or ())
+
+        fields = rtype.getfields()
+
+        self._columns = OrderedDict()
+        self._size = 0
+
+        if columns:
+            for name in columns:
+                field = fields.get(name)
+                self._columns[name] = column(
+                    columns[name], None if field is None else field.ftype
+                )
+
+            self._size = len(next(iter(self._columns.values())))
+
+        self._records = None  # built records
+
+    @classmethod
+    def fromrows(cls, rtype, rows, stores=None):
+        """Create a batch from data dictionaries.
+
+        :param type rtype: record type.
+        :param list rows: record data.
+        :param list stores: stores to bind to built records.
+        :rtype: RecordBatch"""
+
+        names = OrderedDict()
+
+        for row in rows:
+            for name in row:
+                names[name] = None
+
+        columns = OrderedDict(
+            (name, [row.get(name) for row in rows]) for name in names
+        )
+
+        return cls(rtype=rtype, columns=columns, stores=stores)
+
+    @classmethod
+    def fromrecords(cls, rtype, records, stores=None):
+        """Create a batch from records.
+
+        :param type rtype: record type.
+        :param list records: records of type rtype.
+        :param list stores: stores to bind to built records.
+        :rtype: RecordBatch"""
+
+        result = cls.fromrows(
+            rtype=rtype, rows=[record._data for record in records],
+            stores=stores
+        )
+
+        result.unloaded = frozenset().union(
+            *[record.unloaded for record in records]
+        )
+
+        return result
+
+    @property
+    def names(self):
+        """Get column names.
+
+        :rtype: list"""
+
+        return list(self._columns)
+
+    def column(self, name):
+        """Get a column.
+
+        :param str name: field name.
+        :return: column values.
+        :rtype: array or list
+        :raises: KeyError if the column does not exist."""
+
+        return self._columns[name]
+
+    def row(self, index):
+        """Get record data without building the record.
+
+        Missing field values are field default values, and values of
+        non-field columns which are None are ignored.
+
+        :param int index: record index.
+        :rtype: dict"""
+
+        fields = self.rtype.getfields()
+
+        result = {}
+
+        for name, values in self._columns.items():
+            value = values[index]
+
+            if value is not None:
+                result[name] = value
+
+        for name in fields:
+            if name not in result:
+                result[name] = fields[name].default
+
+        return result
+
+    def rows(self):
+        """Iterate on record data without building records.
+
+        :rtype: generator"""
+
+        for index in range(self._size):
+            yield self.row(index)
+
+    def identities(self):
+        """Get record identities.
+
+        Records are built if the record type has no identifier field.
+
+        :rtype: list"""
+
+        rtype = self.rtype
+        identifiers = rtype.getidentifiers()
+
+        if identifiers:
+            columns = [
+                self._columns.get(name) or [None] * self._size
+                for name in identifiers
+            ]
+
+            result = [(rtype, values) for values in zip(*columns)]
+
+        else:
+            result = [record.identity for record in self]
+
+        return result
+
+    def records(self):
+        """Get all records.
+
+        :rtype: list"""
+
+        return [self[index] for index in range(self._size)]
+
+    def __len__(self):
+
+        return self._size
+
+    def __iter__(self):
+
+        for index in range(self._size):
+            yield self[index]
+
+    def __getitem__(self, index):
+
+        if isinstance(index, slice):
+            result = RecordBatch(
+                rtype=self.rtype, stores=self.stores, unloaded=self.unloaded,
+                columns=OrderedDict(
+                    (name, values[index])
+                    for name, values in self._columns.items()
+                )
+            )
+
+        else:
+            records = self._records
+
+            if records is None:
+                records = self._records = [None] * self._size
+
+            result = records[index]
+
+            if result is None:
+                result = records[index] = self.rtype(**self.row(index))
+
+                if self.stores:
+                    result.stores = self.stores
+
+        return result
+
+    def __repr__(self):
+
+        return '{0}({1}, {2} records, columns: {3})'.format(
+            self.__class__.__name__, self.rtype.__name__, self._size,
+            self.names
+        )
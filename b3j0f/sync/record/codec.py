@@ -0,0 +1,518 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------------------------
+# The MIT License (MIT)
+#
+# Copyright (c) 2014 Jonathan Labéjof <jonathan.labejof@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# --------------------------------------------------------------------
+
+"""Binary record codec.
+
+Records are encoded in batches. A record type is described once per stream
+with its field names, then record values refer to fields by index. Values are
+tagged and packed by type, and a record found several times in a batch is
+encoded once, further occurrences being references to the first one. Names
+of fields unloaded by a projection follow record values.
+
+Values of other types are pickled. Decoding is restricted by default to given
+record types, without unpickling, since imports and unpickling of untrusted
+data can execute code. Record type imports and unpickling are allowed for
+trusted streams only."""
+
+__all__ = ['RecordEncoder', 'RecordDecoder', 'dumps', 'loads']
+
+from io import BytesIO
+
+from importlib import import_module
+
+from struct import Struct
+
+from six import binary_type, text_type, integer_types, int2byte, iterbytes
+from six.moves import cPickle as pickle
+
+from .core import Record, _rebuild
+
+MAGIC = b'BSR\x02'  #: stream header.
+
+# value tags
+_NONE = int2byte(0)
+_TRUE = int2byte(1)
+_FALSE = int2byte(2)
+_INT = int2byte(3)
+_FLOAT = int2byte(4)
+_TEXT = int2byte(5)
+_BYTES = int2byte(6)
+_LIST = int2byte(7)
+_TUPLE = int2byte(8)
+_DICT = int2byte(9)
+_SET = int2byte(10)
+_FROZENSET = int2byte(11)
+_RECORD = int2byte(12)
+_REF = int2byte(13)
+_TYPE = int2byte(14)
+_PICKLE = int2byte(15)
+_BATCH = int2byte(16)
+
+_DOUBLE = Struct('<d')
+
+
+def typename(rtype):
+    """Get the encoded name of a record type.
+
+    :param type rtype: record type.
+    :rtype: str"""
+
+    return '{0}:{1}'.format(
+        rtype.__module__, getattr(rtype, '__qualname__', rtype.__name__)
+    )
+
+
+class RecordEncoder(object):
+    """Encode record batches in a binary stream."""
+
+    def __init__(self, stream, *args, **kwargs):
+        """
+        :param stream: binary stream with a write method.
+        """
+
+        super(RecordEncoder, self).__init__(*args, **kwargs)
+
+        self.stream = stream
+
+        self._types = {}  # type indexes and field indexes by record type
+        self._refs = {}  # record indexes by record id in the current batch
+
+        stream.write(MAGIC)
+
+    def write(self, records):
+        """Encode a batch of records.
+
+        :param list records: records to encode."""
+
+        buf = []
+        write = buf.append
+
+        write(_BATCH)
+        self._varint(len(records), write)
+
+        refs = self._refs = {}
+
+        try:
+            for record in records:
+                self._value(record, write)
+
+        finally:
+            refs.clear()
+
+        self.stream.write(b''.join(buf))
+
+    @staticmethod
+    def _varint(value, write):
+        """Write an unsigned variable length integer."""
+
+        while value > 0x7f:
+            write(int2byte((value & 0x7f) | 0x80))
+            value >>= 7
+
+        write(int2byte(value))
+
+    def _text(self, value, write):
+        """Write a text value without tag."""
+
+        value = value.encode('utf-8')
+        self._varint(len(value), write)
+        write(value)
+
+    def _value(self, value, write):
+        """Write a tagged value."""
+
+        if value is None:
+            write(_NONE)
+
+        elif value is True:
+            write(_TRUE)
+
+        elif value is False:
+            write(_FALSE)
+
+        elif isinstance(value, integer_types):
+            write(_INT)
+            self._varint(value << 1 if value >= 0 else (-value << 1) - 1, write)
+
+        elif isinstance(value, float):
+            write(_FLOAT)
+            write(_DOUBLE.pack(value))
+
+        elif isinstance(value, text_type):
+            write(_TEXT)
+            self._text(value, write)
+
+        elif isinstance(value, binary_type):
+            write(_BYTES)
+            self._varint(len(value), write)
+            write(value)
+
+        elif isinstance(value, Record):
+            self._record(value, write)
+
+        elif isinstance(value, dict):
+            write(_DICT)
+            self._varint(len(value), write)
+
+            for key in value:
+                self._value(key, write)
+                self._value(value[key], write)
+
+        elif isinstance(value, (list, tuple, set, frozenset)):
+            if isinstance(value, list):
+                write(_LIST)
+
+            elif isinstance(value, tuple):
+                write(_TUPLE)
+
+            elif isinstance(value, set):
+                write(_SET)
+
+            else:
+                write(_FROZENSET)
+
+            self._varint(len(value), write)
+
+            for item in value:
+                self._value(item, write)
+
+        else:
+            write(_PICKLE)
+            value = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+            self._varint(len(value), write)
+            write(value)
+
+    def _record(self, record, write):
+        """Write a record, or a reference to an already written record."""
+
+        refs = self._refs
+        ref = refs.get(id(record))
+
+        if ref is None:
+            refs[id(record)] = len(refs)
+
+            rtype = record.__class__
+            schema = self._types.get(rtype)
+
+            if schema is None:  # describe the record type
+                names = sorted(rtype.getfields())
+                schema = self._types[rtype] = (
+                    len(self._types),
+                    dict((name, index + 1) for index, name in enumerate(names))
+                )
+
+                write(_TYPE)
+                self._text(typename(rtype), write)
+                self._varint(len(names), write)
+
+                for name in names:
+                    self._text(name, write)
+
+            index, fields = schema
+
+            data = record._data
+
+            write(_RECORD)
+            self._varint(index, write)
+            self._varint(len(data), write)
+
+            for name in data:
+                field = fields.get(name)
+
+                if field is None:  # not a field
+                    write(b'\x00')
+                    self._text(name, write)
+
+                else:
+                    self._varint(field, write)
+
+                self._value(data[name], write)
+
+            unloaded = record._unloaded or ()
+
+            self._varint(len(unloaded), write)
+
+            for name in sorted(unloaded):
+                self._text(name, write)
+
+        else:
+            write(_REF)
+            self._varint(ref, write)
+
+
+class RecordDecoder(object):
+    """Decode record batches from a binary stream."""
+
+    class Error(Exception):
+        """Handle decoding errors."""
+
+    def __init__(
+            self, stream, rtypes=None, imports=False, unpickle=False,
+            *args, **kwargs
+    ):
+        """
+        :param stream: binary stream with a read method.
+        :param list rtypes: record types to decode.
+        :param bool imports: if True (default False), import record types
+            which are not given. For trusted streams only.
+        :param bool unpickle: if True (default False), unpickle values which
+            are not natively encoded. For trusted streams only.
+        """
+
+        super(RecordDecoder, self).__init__(*args, **kwargs)
+
+        self.stream = stream
+        self.rtypes = dict(
+            (typename(rtype), rtype) for rtype in (rtypes or ())
+        )
+        self.imports = imports
+        self.unpickle = unpickle
+
+        self._types = []  # (record type, field names) by type index
+        self._refs = []  # decoded records of the current batch
+
+        if stream.read(len(MAGIC)) != MAGIC:
+            raise RecordDecoder.Error('Wrong stream header')
+
+    def __iter__(self):
+
+        while True:
+            records = self.read()
+
+            if records is None:
+                break
+
+            yield records
+
+    def read(self):
+        """Decode the next batch of records.
+
+        :return: records, or None at the end of the stream.
+        :rtype: list"""
+
+        result = None
+
+        tag = self.stream.read(1)
+
+        if tag:
+            if tag != _BATCH:
+                raise RecordDecoder.Error('Wrong batch tag {0}'.format(tag))
+
+            self._refs = []
+
+            result = [self._value() for _ in range(self._varint())]
+
+            self._refs = []
+
+        return result
+
+    def _read(self, size):
+        """Read exactly size bytes."""
+
+        result = self.stream.read(size)
+
+        if len(result) != size:
+            raise RecordDecoder.Error('Unexpected end of stream')
+
+        return result
+
+    def _varint(self):
+        """Read an unsigned variable length integer."""
+
+        result = shift = 0
+
+        read = self.stream.read
+
+        while True:
+            byte = read(1)
+
+            if not byte:
+                raise RecordDecoder.Error('Unexpected end of stream')
+
+            byte = next(iterbytes(byte))
+
+            result |= (byte & 0x7f) << shift
+
+            if byte < 0x80:
+                break
+
+            shift += 7
+
+        return result
+
+    def _text(self):
+        """Read a text value without tag."""
+
+        return self._read(self._varint()).decode('utf-8')
+
+    def _rtype(self, name):
+        """Resolve a record type name."""
+
+        result = self.rtypes.get(name)
+
+        if result is None and self.imports:
+            modname, _, qualname = name.partition(':')
+
+            try:
+                result = import_module(modname)
+
+                for attr in qualname.split('.'):
+                    result = getattr(result, attr)
+
+            except (ImportError, AttributeError):
+                result = None
+
+            if not (isinstance(result, type) and issubclass(result, Record)):
+                result = None
+
+        if result is None:
+            raise RecordDecoder.Error('Unknown record type {0}'.format(name))
+
+        return result
+
+    def _value(self):
+        """Read a tagged value."""
+
+        tag = self._read(1)
+
+        while tag == _TYPE:  # record type description
+            rtype = self._rtype(self._text())
+            names = [self._text() for _ in range(self._varint())]
+            self._types.append((rtype, names))
+
+            tag = self._read(1)
+
+        if tag == _NONE:
+            result = None
+
+        elif tag == _TRUE:
+            result = True
+
+        elif tag == _FALSE:
+            result = False
+
+        elif tag == _INT:
+            result = self._varint()
+            result = -((result + 1) >> 1) if result & 1 else result >> 1
+
+        elif tag == _FLOAT:
+            result = _DOUBLE.unpack(self._read(_DOUBLE.size))[0]
+
+        elif tag == _TEXT:
+            result = self._text()
+
+        elif tag == _BYTES:
+            result = self._read(self._varint())
+
+        elif tag == _RECORD:
+            rtype, names = self._types[self._varint()]
+
+            data = {}
+
+            # referenced before its values in case of cycle
+            result = _rebuild(rtype, data)
+            self._refs.append(result)
+
+            for _ in range(self._varint()):
+                field = self._varint()
+
+                name = self._text() if field == 0 else names[field - 1]
+
+                data[name] = self._value()
+
+            unloaded = [self._text() for _ in range(self._varint())]
+
+            if unloaded:
+                result._unloaded = set(unloaded)
+
+        elif tag == _REF:
+            result = self._refs[self._varint()]
+
+        elif tag == _DICT:
+            result = {}
+
+            for _ in range(self._varint()):
+                key = self._value()
+                result[key] = self._value()
+
+        elif tag in (_LIST, _TUPLE, _SET, _FROZENSET):
+            result = [self._value() for _ in range(self._varint())]
+
+            if tag == _TUPLE:
+                result = tuple(result)
+
+            elif tag == _SET:
+                result = set(result)
+
+            elif tag == _FROZENSET:
+                result = frozenset(result)
+
+        elif tag == _PICKLE:
+            if not self.unpickle:
+                raise RecordDecoder.Error('Pickled values are not allowed')
+
+            result = pickle.loads(self._read(self._varint()))
+
+        else:
+            raise RecordDecoder.Error('Wrong value tag {0}'.format(tag))
+
+        return result
+
+
+def dumps(records):
+    """Encode records in one batch.
+
+    :param list records: records to encode.
+    :rtype: bytes"""
+
+    stream = BytesIO()
+
+    RecordEncoder(stream).write(records)
+
+    return stream.getvalue()
+
+
+def loads(data, rtypes=None, imports=False, unpickle=False):
+    """Decode records of all batches of encoded data.
+
+    :param bytes data: encoded records.
+    :param list rtypes: record types to decode.
+    :param bool imports: if True (default False), import record types which
+        are not given. For trusted data only.
+    :param bool unpickle: if True (default False), unpickle values which are
+        not natively encoded. For trusted data only.
+    :rtype: list"""
+
+    result = []
+
+    decoder = RecordDecoder(
+        BytesIO(data), rtypes=rtypes, imports=imports, unpickle=unpickle
+    )
+
+    for records in decoder:
+        result += records
+
+    return result
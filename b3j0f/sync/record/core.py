@@ -30,30 +30,220 @@ __all__ = ['Record']
 
 from inspect import getmembers
 
-from six import add_metaclass, string_types
+from six import (
+    add_metaclass, binary_type, integer_types, iteritems, string_types,
+    text_type
+)
 
-from copy import deepcopy
+from copy import copy, deepcopy
+
+from threading import Lock
 
 from b3j0f.utils.iterable import hashiter
 
 from .field import Field
+from .intern import KEYS
+from .membership import POOL, RecordStores
+
+#: record dirty state locks, shared by records with the same id stripe.
+_LOCKS = tuple(Lock() for _ in range(64))
+
+_PENDING = object()  #: missing pending lazy value.
+
+#: types of values which are not copied by raw.
+_ATOMICTYPES = frozenset(
+    (type(None), bool, float, complex, binary_type, text_type) +
+    integer_types + string_types
+)
+
+
+def _recordlock(record):
+    """Get the lock of the dirty state of a record.
+
+    Locks are only held during updates of record dictionaries.
+
+    :rtype: Lock"""
+
+    return _LOCKS[(id(record) >> 4) % len(_LOCKS)]
+
+
+def _rebuild(rtype, data, state=None, unloaded=None, olddata=None):
+    """Rebuild a record from its data without checking fields.
+
+    :param type rtype: record type.
+    :param dict data: record data.
+    :param dict state: record type instance attributes if any.
+    :param list unloaded: names of fields unloaded by a projection if any.
+    :param dict olddata: commited values of dirty fields if any. Default is
+        None (the record is commited).
+    :rtype: Record"""
+
+    result = rtype.__new__(rtype)
+
+    result._data = data
+    result._olddata = olddata or {}
+    result._unloaded = set(unloaded) if unloaded else None
+    result._stores = POOL.intern(None)
+
+    if state:
+        result.__dict__.update(state)
+
+    return result
+
+
+def _raw(record, dirty):
+    """Convert a record to a dictionary where nested records are raw.
+
+    Records nested in dictionaries, lists and tuples are converted too, and
+    converted containers keep their type. Values are walked iteratively and
+    converted values are memoized by id, so shared values are converted once
+    and cycles are preserved without hashing records. Other values are deep
+    copied.
+
+    :param Record record: record to convert.
+    :param bool dirty: if True, get dirty values.
+    :rtype: dict
+    """
+
+    result = [None]
+    memo = {}  # converted values by source id
+    keep = []  # memoized sources, alive while their ids are used
+    fixups = {}  # slots to fill by id of tuples in conversion
+    copies = {}  # deepcopy memo of other values
+    stack = []  # frames of values in conversion
+
+    def enter(value, parent, key):
+        """Set the conversion of a value in parent[key], or push its frame
+        if it contains values to convert."""
+
+        vtype = type(value)
+
+        if vtype in _ATOMICTYPES:
+            parent[key] = value
+
+        elif id(value) in memo:
+            converted = memo[id(value)]
+
+            if converted is _PENDING:  # cycle through a tuple
+                parent[key] = None
+                fixups[id(value)].append((parent, key))
+
+            else:
+                parent[key] = converted
+
+        else:
+            output = None
+
+            if isinstance(value, Record):
+                data = dict(value._data)
+
+                if not dirty:
+                    data.update(value._olddata)
+
+                output = memo[id(value)] = {}
+                items = iteritems(data)
+
+            elif vtype is dict or isinstance(value, dict):
+                if vtype is dict:
+                    output = {}
+
+                else:  # keep the subclass and its attributes
+                    output = copy(value)
+                    output.clear()
+
+                memo[id(value)] = output
+                items = iter(list(iteritems(value)))
+
+            elif vtype is list or vtype is tuple or isinstance(
+                    value, (list, tuple)
+            ):
+                items = tuple(value)
+                output = [None] * len(items)
+
+                if vtype is not list and isinstance(value, list):
+                    subclass = copy(value)  # keep the subclass and attributes
+                    subclass[:] = output
+                    output = subclass
+
+                items = enumerate(items)
+
+                if isinstance(value, list):
+                    memo[id(value)] = output
+
+                else:
+                    memo[id(value)] = _PENDING
+                    fixups[id(value)] = []
+
+            else:
+                parent[key] = deepcopy(value, copies)
+
+            if output is not None:
+                keep.append(value)
+                stack.append((value, output, items, parent, key))
+
+    enter(record, result, 0)
+
+    while stack:
+        frame = stack[-1]
+        value, output, items, parent, key = frame
+
+        for name, item in items:
+            if type(name) not in _ATOMICTYPES and isinstance(output, dict):
+                name = deepcopy(name, copies)
+
+            enter(item, output, name)
+
+            if stack[-1] is not frame:  # convert the item first
+                break
+
+        else:
+            stack.pop()
+
+            if isinstance(value, tuple):
+                output = memo[id(value)] = _tuple(type(value), output)
+
+                for fparent, fkey in fixups.pop(id(value)):
+                    fparent[fkey] = output
+
+            parent[key] = output
+
+    return result[0]
+
+
+def _tuple(ttype, items):
+    """Build a tuple of a tuple type, named or not.
+
+    :param type ttype: tuple type.
+    :param list items: tuple items.
+    :rtype: tuple"""
+
+    if ttype is tuple:
+        result = tuple(items)
+
+    elif hasattr(ttype, '_fields'):  # named tuple
+        result = ttype(*items)
+
+    else:
+        result = ttype(items)
+
+    return result
 
 
 class _MetaRecord(type):
     """Apply field descriptors on record field values and ensure records are
     commited at the end of their initialization."""
 
-    def __call__(cls, *args, **kwargs):
+    _version = 0  #: incremented each time a field is set/deleted on a type.
 
-        for name, member in getmembers(cls):
+    def __call__(cls, *args, **kwargs):
 
-            if isinstance(member, Field):
+        for name, member in cls.getfields().items():
 
-                value = kwargs.get(name)
+            value = kwargs.get(name)
 
-                value = member.getvalue(value=value, name=name)
+            value = member.getvalue(value=value, name=name)
 
-                kwargs[name] = value
+            kwargs[name] = value
 
         result = type.__call__(cls, *args, **kwargs)
 
@@ -61,6 +251,57 @@ class _MetaRecord(type):
 
         return result
 
+    def __setattr__(cls, key, value):
+
+        if isinstance(value, Field) or isinstance(
+                getattr(cls, key, None), Field
+        ):
+            _MetaRecord._version += 1
+
+        super(_MetaRecord, cls).__setattr__(key, value)
+
+    def __delattr__(cls, key):
+
+        if isinstance(getattr(cls, key, None), Field):
+            _MetaRecord._version += 1
+
+        super(_MetaRecord, cls).__delattr__(key)
+
+    def _getschema(cls):
+        """Get cached fields and identifier names of this record type."""
+
+        result = cls.__dict__.get('_schemacache')
+
+        if result is None or result[0] != _MetaRecord._version:
+            fields = dict(
+                (name, member) for name, member in getmembers(cls)
+                if isinstance(member, Field)
+            )
+            identifiers = tuple(
+                sorted(name for name in fields if fields[name].identifier)
+            )
+            # key layout copied by lazy records
+            template = dict.fromkeys(KEYS.intern(name) for name in fields)
+            result = (_MetaRecord._version, fields, identifiers, template)
+            type.__setattr__(cls, '_schemacache', result)
+
+        return result
+
+    def getfields(cls):
+        """Get fields of this record type.
+
+        :return: fields by name.
+        :rtype: dict"""
+
+        return cls._getschema()[1]
+
+    def getidentifiers(cls):
+        """Get identifier field names of this record type.
+
+        :rtype: tuple"""
+
+        return cls._getschema()[2]
+
 
 @add_metaclass(_MetaRecord)
 class Record(object):
@@ -78,12 +319,17 @@ class Record(object):
     The property ``isdirty`` is True if the record is modified from its creation
     or last commit.
 
-    The copy method is the implementation of the prototype design pattern."""
+    The copy method is the implementation of the prototype design pattern.
+
+    Records can be shared among threads. Changes of a value and of its dirty
+    state are atomic, commit and cancel take the dirty state atomically, and
+    store memberships are immutable interned sets. A value changed during a
+    commit leaves the record dirty."""
 
     class Error(Exception):
         """Handle record errors."""
 
-    __slots__ = ('_stores', '_data', '_olddata')
+    __slots__ = ('_stores', '_values', '_olddata', '_lazy', '_unloaded')
 
     def __init__(self, _stores=None, **data):
         """
@@ -95,7 +341,8 @@ class Record(object):
 
         self._data = data
         self._olddata = {}
-        self._stores = set() if _stores is None else set(_stores)
+        self._unloaded = None
+        self._stores = POOL.intern(_stores)
 
     def __setattr__(self, key, value):
 
@@ -113,32 +360,176 @@ class Record(object):
             if isinstance(fielddesc, Field):
                 value = fielddesc.getvalue(value, name=key)
 
-            oldvalue = self._data.get(key)
+            data = self._data
+            oldvalue = data.get(key)
+
+            if self._unloaded:  # the field is loaded by the assignment
+                self._unloaded.discard(key)
 
             if oldvalue != value:
 
-                self._data[key] = value
-                self._olddata.setdefault(key, oldvalue)
+                with _recordlock(self):
+                    data[key] = value
+                    self._olddata.setdefault(key, oldvalue)
 
     def __getattribute__(self, key):
 
         supergetattribute = super(Record, self).__getattribute__
 
-        return supergetattribute('_data').get(key, supergetattribute(key))
+        values = supergetattribute('_values')
+
+        if key in values:
+            result = values[key]
+
+        else:
+            result = supergetattribute(key)
+
+            if isinstance(result, Field):  # field value of a lazy record
+                lazy = supergetattribute('_lazy')
+
+                if lazy is not None and key in lazy[1]:
+                    result = supergetattribute('_decode')(key)
+
+        return result
 
     def __getattr__(self, key):
         """Try to redirect input attribute name to self values."""
 
         result = None
 
-        try:
-            result = self._data[key]
+        lazy = None if key[0] == '_' else self._lazy
+
+        if lazy is not None and key in lazy[1]:
+            result = self._decode(key)
+
+        else:
+            try:
+                result = self._data[key]
+
+            except KeyError:
+                raise AttributeError('No field {0}'.format(key))
+
+        return result
+
+    @classmethod
+    def lazy(cls, data, stores=None, decode=None, fields=None):
+        """Create a record which decodes and checks values on access.
+
+        The record constructor is not called. All values are decoded when the
+        record is modified, copied, converted to raw, hashed or commited.
+
+        If fields are given, the record is partial: other fields are None and
+        unloaded until they are assigned.
+
+        Data keys are shared among records: field names come from a key layout
+        of the record type, and other keys are interned.
+
+        :param dict data: store data by name.
+        :param list stores: record stores.
+        :param decode: function(name, value) which decodes a store value.
+            Default is None (store values are record values).
+        :param list fields: names of loaded values. Identifiers are always
+            loaded. Default is None (all values are loaded).
+        :rtype: Record"""
 
-        except KeyError:
-            raise AttributeError('No field {0}'.format(key))
+        result = cls.__new__(cls)
+
+        values = {}
+        unloaded = None
+        _, names, _, template = cls._getschema()
+        intern = KEYS.intern
+
+        if fields is None:
+            pending = template.copy()
+            pending.update(
+                (key if key in template else intern(key), value)
+                for key, value in iteritems(data)
+            )
+
+        else:
+            fields = set(fields).union(cls.getidentifiers())
+            unloaded = set(names).difference(fields)
+            values = dict.fromkeys(unloaded)
+
+            pending = dict.fromkeys(fields.intersection(names))
+            pending.update(
+                (name, data[name]) for name in fields if name in data
+            )
+
+        result._values = values
+        result._olddata = {}
+        result._unloaded = unloaded
+        result._stores = POOL.intern(stores)
+        result._lazy = (decode, pending) if pending else None
 
         return result
 
+    @property
+    def _data(self):
+        """Get data values. Pending lazy values are decoded.
+
+        :rtype: dict"""
+
+        lazy = self._lazy
+
+        if lazy is not None:
+            for key in list(lazy[1]):
+                self._decode(key)
+
+        return self._values
+
+    @_data.setter
+    def _data(self, value):
+        """Change of data values."""
+
+        self._values = value
+        self._lazy = None
+
+    def _decode(self, key):
+        """Decode and check a pending lazy value.
+
+        :param str key: value name.
+        :return: decoded value."""
+
+        lazy = self._lazy
+
+        result = _PENDING if lazy is None else lazy[1].get(key, _PENDING)
+
+        if result is _PENDING:  # decoded by another thread
+            result = self._values[key]
+
+        else:
+            decode, pending = lazy
+
+            if decode is not None:
+                result = decode(key, result)
+
+            field = self.__class__.getfields().get(key)
+
+            if field is not None:
+                result = field.getvalue(result, name=key)
+
+            with _recordlock(self):
+                if key in pending:
+                    self._values[key] = result
+                    del pending[key]
+
+                    if not pending:
+                        self._lazy = None
+
+                else:
+                    result = self._values[key]
+
+        return result
+
+    @property
+    def unloaded(self):
+        """Get names of fields which are not loaded by a projection.
+
+        :rtype: frozenset"""
+
+        return frozenset(self._unloaded or ())
+
     @property
     def isdirty(self):
         """True if values are updated from the last commit.
@@ -147,11 +538,43 @@ class Record(object):
 
         return not not self._olddata
 
+    @property
+    def identity(self):
+        """Get this record identity.
+
+        An identity is made of the record type and values of identifier fields.
+        If the record type has no identifier field, the identity relies on the
+        last commited content of this record.
+
+        :rtype: tuple"""
+
+        cls = self.__class__
+        identifiers = cls.getidentifiers()
+
+        if identifiers:
+            if self._lazy is None:
+                data = self._values
+                values = tuple(data.get(name) for name in identifiers)
+
+            else:  # decode only identifiers
+                values = tuple(getattr(self, name) for name in identifiers)
+
+            result = (cls, values)
+
+        else:
+            result = (cls, hash(self))
+
+        return result
+
     @property
     def stores(self):
-        """get this stores."""
+        """Get this stores.
+
+        Stores are weakly referenced, and memberships are shared among records.
+
+        :rtype: RecordStores"""
 
-        return self._stores
+        return RecordStores(self)
 
     @stores.setter
     def stores(self, value):
@@ -159,19 +582,22 @@ class Record(object):
 
         :param list stores: stores to use."""
 
-        self._stores = value
+        self._stores = POOL.intern(value)
 
     def cancel(self):
         """Cancel modifications."""
 
-        self._data.update(self._olddata)
-        for key in list(self._data):
-            val = self._data[key]
+        data = self._data
 
-            if val is None:
-                del self._data[key]
+        with _recordlock(self):
+            olddata, self._olddata = self._olddata, {}
 
-        self._olddata.clear()
+            data.update(olddata)
+            for key in list(data):
+                val = data[key]
+
+                if val is None:
+                    del data[key]
 
     def commit(self, stores=None):
         """Apply new values on stores.
@@ -179,15 +605,28 @@ class Record(object):
         :param set stores: stores to add to this record stores. Default this
             stores."""
 
+        selfstores = RecordStores(self)
+
         if stores is None:
-            stores = self._stores
+            stores = selfstores
 
-        for store in list(stores):
-            store.update(records=[self], upsert=True)
+        olddata = None
+
+        if self._olddata:  # take the dirty state
+            with _recordlock(self):
+                olddata, self._olddata = self._olddata, {}
+
+        try:
+            for store in list(stores):
+                store.update(records=[self], upsert=True)
 
-            self._stores.add(store)
+                selfstores.add(store)
 
-        self._olddata.clear()
+        except Exception:
+            if olddata:  # restore the dirty state with oldest values
+                with _recordlock(self):
+                    self._olddata.update(olddata)
+            raise
 
     def delete(self, stores=None):
         """Remove this record from stores.
@@ -195,8 +634,10 @@ class Record(object):
         :param list stores: stores where to delete this record. This stores by
             default."""
 
+        selfstores = RecordStores(self)
+
         if stores is None:
-            stores = self._stores
+            stores = selfstores
 
         for store in list(stores):
             try:
@@ -206,11 +647,7 @@ class Record(object):
                 pass
 
             else:
-                try:
-                    self._stores.remove(store)
-
-                except KeyError:
-                    pass
+                selfstores.discard(store)
 
     def copy(self, data=None, stores=None):
         """Copy this record with input data values.
@@ -226,7 +663,12 @@ class Record(object):
         if data is not None:
             _data.update(deepcopy(data))
 
-        return self.__class__(_stores=stores, **deepcopy(_data))
+        result = self.__class__(_stores=stores, **deepcopy(dict(_data)))
+
+        if self._unloaded:
+            result._unloaded = self._unloaded.difference(data or ())
+
+        return result
 
     def __deepcopy__(self, memo):
 
@@ -236,12 +678,21 @@ class Record(object):
 
         return self.copy(data=memo)
 
-    def raw(self, dirty=True, store=None, _raws=None):
+    def __reduce__(self):
+
+        return _rebuild, (
+            self.__class__, self._data, getattr(self, '__dict__', None),
+            sorted(self._unloaded) if self._unloaded else None,
+            dict(self._olddata) or None
+        )
+
+    def raw(self, dirty=True, store=None):
         """Get raw data value.
 
+        Records nested in values, dictionaries, lists and tuples are converted
+        to raw values. Shared and cyclic references are preserved.
+
         :param bool dirty: if True (default) get dirty values in raw.
-        :param dict _raws: private parameter used to save rawed records in a
-            recursive call.
         :param Store store: store from where get the raw if given.
         :return: specific store data if store is not None, otherwise a
             dictionary with public values."""
@@ -249,20 +700,7 @@ class Record(object):
         result = None
 
         if store is None:
-            result = deepcopy(self._data)
-
-            if not dirty:
-                result.update(deepcopy(self._olddata))
-
-            for name in result.keys():  # convert inner records to raw
-                value = result[name]
-                if isinstance(value, Record):
-                    if _raws is None:
-                        _raws = {}
-                    value = _raws[value] = _raws.setdefault(
-                        value, value.raw(dirty=dirty, _raws=_raws)
-                    )
-                    result[name] = value
+            result = _raw(self, dirty=dirty)
 
         else:
             result = store.record2data(dirty=dirty, record=self)
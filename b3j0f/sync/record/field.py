@@ -28,6 +28,10 @@
 
 __all__ = ['Field']
 
+from six import string_types
+
+from .intern import InternTable
+
 
 class Field(object):
     """Record field."""
@@ -35,7 +39,7 @@ class Field(object):
     def __init__(
             self,
             ftype=object, default=None, description=None, identifier=False,
-            unique=False, length=None, key=False,
+            unique=False, length=None, key=False, intern=False,
             *args, **kwargs
     ):
         """
@@ -47,11 +51,16 @@ class Field(object):
         :param bool unique: is field value unique among record of same types.
         :param int length: value length in case of variable size type.
         :param bool key: field key.
+        :param bool intern: if True, string values are interned in order to
+            be shared among records. Dedicated to low cardinality fields such
+            as status or type names.
         """
 
         super(Field, self).__init__(*args, **kwargs)
 
         self.ftype = ftype
+        self.intern = intern
+        self._interned = InternTable() if intern else None
         self.default = None
         self.default = self.getvalue(default)
         self.description = description
@@ -78,4 +87,7 @@ class Field(object):
                 )
             )
 
+        if self._interned is not None and isinstance(result, string_types):
+            result = self._interned.intern(result)
+
         return result
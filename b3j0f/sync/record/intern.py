@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------------------------
+# The MIT License (MIT)
+#
+# Copyright (c) 2014 Jonathan Labéjof <jonathan.labejof@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# --------------------------------------------------------------------
+
+"""Value interning module.
+
+Records decoded from a same store repeat the same data keys and, for low
+cardinality fields, the same string values. Interned values are shared by all
+records instead of being allocated per record."""
+
+__all__ = ['InternTable', 'KEYS']
+
+
+class InternTable(object):
+    """Bounded table of interned hashable values.
+
+    Once the table is full, new values are not interned anymore, so that high
+    cardinality values do not grow the table indefinitely."""
+
+    DEFAULT_SIZE = 4096  #: default maximal number of interned values.
+
+    def __init__(self, size=DEFAULT_SIZE, *args, **kwargs):
+        """
+        :param int size: maximal number of interned values.
+        """
+
+        super(InternTable, self).__init__(*args, **kwargs)
+
+        self.size = size
+
+        self._values = {}
+
+    def __len__(self):
+
+        return len(self._values)
+
+    def __contains__(self, value):
+
+        return value in self._values
+
+    def intern(self, value):
+        """Get the interned value equal to input value.
+
+        :param value: hashable value to intern.
+        :return: interned value, or input value if the table is full."""
+
+        values = self._values
+
+        result = values.get(value)
+
+        if result is None:
+            # setdefault is atomic, a concurrent insertion wins
+            result = values.setdefault(value, value) \
+                if len(values) < self.size else value
+
+        return result
+
+    def clear(self):
+        """Clear interned values."""
+
+        self._values = {}
+
+
+KEYS = InternTable()  #: record data keys shared by all record types.
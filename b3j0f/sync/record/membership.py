@@ -0,0 +1,297 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------------------------
+# The MIT License (MIT)
+#
+# Copyright (c) 2014 Jonathan Labéjof <jonathan.labejof@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# --------------------------------------------------------------------
+
+"""Record store membership definition module.
+
+Record stores are not saved in a set per record. Each store is weakly
+registered in a pool with a small integer index, and records share interned
+frozensets of store indices. Records of a same store therefore share the same
+membership object, and stores are not kept alive by their records."""
+
+__all__ = ['StorePool', 'RecordStores']
+
+try:
+    from collections.abc import MutableSet
+
+except ImportError:
+    from collections import MutableSet
+
+from threading import RLock
+
+from weakref import ref
+
+
+class StorePool(object):
+    """Weak registry of stores which interns record store memberships."""
+
+    EMPTY = frozenset()  #: empty membership.
+
+    def __init__(self, *args, **kwargs):
+
+        super(StorePool, self).__init__(*args, **kwargs)
+
+        self._lock = RLock()
+        self._refs = {}  # store references by index
+        self._indices = {}  # store indices by store id
+        self._nextindex = 0  # indices are never reused
+        self._memberships = {StorePool.EMPTY: StorePool.EMPTY}  # interned
+        self._transitions = {}  # memberships by (membership, index, add)
+        self._dead = []  # indices of dead stores to purge
+
+    def __len__(self):
+
+        return len(self._refs)
+
+    def index(self, store, create=True):
+        """Get input store index.
+
+        :param store: store to index.
+        :param bool create: if True (default), register the store if needed.
+        :return: store index or None if store is not registered and create is
+            False.
+        :rtype: int"""
+
+        result = self._indices.get(id(store))
+
+        # the id of a dead store not yet purged can be reused
+        if result is not None and self.store(result) is not store:
+            result = None
+
+        if result is None and create:
+            with self._lock:
+                self._purge()
+
+                result = self._indices.get(id(store))
+
+                if result is None or self.store(result) is not store:
+                    result = self._nextindex
+                    self._nextindex += 1
+
+                    try:
+                        storeref = ref(store, self._releaser(result, id(store)))
+
+                    except TypeError:  # store is not weakly referenceable
+                        storeref = lambda store=store: store
+
+                    self._refs[result] = storeref
+                    self._indices[id(store)] = result
+
+        return result
+
+    def _releaser(self, index, storeid):
+        """Get a weak reference callback which releases a dead store."""
+
+        def release(_, pool=ref(self)):
+            """Release a dead store."""
+
+            pool = pool()
+            if pool is not None:
+                pool._dead.append((index, storeid))
+
+        return release
+
+    def _purge(self):
+        """Purge dead stores from indices and interned memberships."""
+
+        dead = self._dead
+
+        while dead:
+            index, storeid = dead.pop()
+
+            self._refs.pop(index, None)
+
+            if self._indices.get(storeid) == index:
+                del self._indices[storeid]
+
+            for membership in list(self._memberships):
+                if index in membership:
+                    del self._memberships[membership]
+
+            for key in list(self._transitions):
+                if index in key[0] or key[1] == index:
+                    del self._transitions[key]
+
+    def store(self, index):
+        """Get the store registered with input index.
+
+        :param int index: store index.
+        :return: store or None if the store is dead."""
+
+        storeref = self._refs.get(index)
+
+        return None if storeref is None else storeref()
+
+    def intern(self, stores=None):
+        """Get the interned membership of input stores.
+
+        :param stores: stores to intern.
+        :rtype: frozenset"""
+
+        result = StorePool.EMPTY
+
+        if stores:
+            membership = frozenset(self.index(store) for store in stores)
+
+            with self._lock:
+                self._purge()
+                result = self._memberships.setdefault(membership, membership)
+
+        return result
+
+    def transit(self, membership, index, add=True):
+        """Get the interned membership of input membership with/without the
+        store of input index.
+
+        :param frozenset membership: membership to change.
+        :param int index: store index to add or remove.
+        :param bool add: if True (default), add the store. Otherwise remove it.
+        :rtype: frozenset"""
+
+        key = (membership, index, add)
+
+        result = self._transitions.get(key)
+
+        if result is None:
+            with self._lock:
+                self._purge()
+
+                refs = self._refs
+                result = frozenset(item for item in membership if item in refs)
+
+                if add:
+                    result = result | frozenset((index,))
+
+                else:
+                    result = result - frozenset((index,))
+
+                result = self._memberships.setdefault(result, result)
+                self._transitions[key] = result
+
+        return result
+
+    def stores(self, membership):
+        """Get alive stores of input membership.
+
+        :param frozenset membership: membership to resolve.
+        :rtype: list"""
+
+        result = []
+
+        for index in membership:
+            store = self.store(index)
+
+            if store is not None:
+                result.append(store)
+
+        return result
+
+    def bind(self, records, store, getter, setter, add=True):
+        """Add (or remove) a store to memberships of many records.
+
+        :param list records: records to update.
+        :param store: store to add or remove.
+        :param getter: record membership getter.
+        :param setter: record membership setter.
+        :param bool add: if True (default), add the store. Otherwise remove it.
+        """
+
+        index = self.index(store, create=add)
+
+        if index is not None:
+            transitions = {}  # local transition cache
+
+            with self._lock:
+                for record in records:
+                    membership = getter(record)
+
+                    newmembership = transitions.get(membership)
+
+                    if newmembership is None:
+                        newmembership = transitions[membership] = self.transit(
+                            membership=membership, index=index, add=add
+                        )
+
+                    setter(record, newmembership)
+
+
+POOL = StorePool()  #: default store pool.
+
+
+class RecordStores(MutableSet):
+    """Set view of record stores."""
+
+    __slots__ = ('_record',)
+
+    def __init__(self, record):
+        """
+        :param Record record: record of which stores are viewed.
+        """
+
+        super(RecordStores, self).__init__()
+
+        self._record = record
+
+    def __contains__(self, store):
+
+        index = POOL.index(store, create=False)
+
+        return (
+            index is not None and index in self._record._stores and
+            POOL.store(index) is store
+        )
+
+    def __iter__(self):
+
+        return iter(POOL.stores(self._record._stores))
+
+    def __len__(self):
+
+        return len(POOL.stores(self._record._stores))
+
+    def add(self, store):
+
+        record = self._record
+
+        with POOL._lock:
+            record._stores = POOL.transit(
+                membership=record._stores, index=POOL.index(store)
+            )
+
+    def discard(self, store):
+
+        index = POOL.index(store, create=False)
+
+        if index is not None:
+            record = self._record
+
+            with POOL._lock:
+                record._stores = POOL.transit(
+                    membership=record._stores, index=index, add=False
+                )
+
+    def __repr__(self):
+
+        return '{0}({1})'.format(self.__class__.__name__, list(self))
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------------------------
+# The MIT License (MIT)
+#
+# Copyright (c) 2014 Jonathan Labéjof <jonathan.labejof@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# --------------------------------------------------------------------
+
+from unittest import main
+
+from array import array
+
+from b3j0f.utils.ut import UTCase
+
+from ..batch import RecordBatch, column
+from ..core import Record
+from ..field import Field
+
+
+class BatchRecord(Record):
+
+    id = Field(ftype=int, identifier=True)
+    value = Field(ftype=float)
+    name = Field()
+
+
+class ColumnTest(UTCase):
+
+    def test_int(self):
+
+        result = column([1, 2], int)
+
+        self.assertIsInstance(result, array)
+        self.assertEqual(list(result), [1, 2])
+
+    def test_float(self):
+
+        self.assertIsInstance(column([1.5], float), array)
+
+    def test_fallback(self):
+
+        self.assertEqual(column([1, None], int), [1, None])
+        self.assertEqual(column([2 ** 80], int), [2 ** 80])
+        self.assertEqual(column(['a'], str), ['a'])
+        self.assertEqual(column((value for value in [True]), bool), [True])
+
+
+class RecordBatchTest(UTCase):
+
+    def setUp(self):
+
+        self.batch = RecordBatch(
+            rtype=BatchRecord,
+            columns={
+                'id': [1, 2, 3], 'value': [1., 2., 3.],
+                'name': ['a', None, 'c']
+            }
+        )
+
+    def test_columns(self):
+
+        self.assertEqual(len(self.batch), 3)
+        self.assertEqual(sorted(self.batch.names), ['id', 'name', 'value'])
+        self.assertIsInstance(self.batch.column('id'), array)
+        self.assertIsInstance(self.batch.column('value'), array)
+        self.assertEqual(self.batch.column('name'), ['a', None, 'c'])
+
+    def test_lazy(self):
+
+        self.assertIsNone(self.batch._records)
+
+        self.assertEqual(
+            self.batch.row(1), {'id': 2, 'value': 2., 'name': None}
+        )
+        self.assertIsNone(self.batch._records)
+
+        record = self.batch[1]
+
+        self.assertIsInstance(record, BatchRecord)
+        self.assertEqual(record.id, 2)
+        self.assertIs(self.batch[1], record)
+        self.assertEqual(self.batch._records, [None, record, None])
+
+        self.assertEqual(
+            [record.id for record in self.batch], [1, 2, 3]
+        )
+
+    def test_slice(self):
+
+        batch = self.batch[1:]
+
+        self.assertIsInstance(batch, RecordBatch)
+        self.assertEqual(len(batch), 2)
+        self.assertIsInstance(batch.column('id'), array)
+        self.assertEqual(batch[0].name, None)
+        self.assertEqual(batch[-1].id, 3)
+
+    def test_fromrecords(self):
+
+        records = [BatchRecord(id=i, extra=i) for i in range(3)]
+
+        batch = RecordBatch.fromrecords(rtype=BatchRecord, records=records)
+
+        self.assertEqual(batch.records(), records)
+        self.assertEqual(batch.column('extra'), [0, 1, 2])
+
+    def test_identities(self):
+
+        self.assertEqual(
+            self.batch.identities(),
+            [(BatchRecord, (1,)), (BatchRecord, (2,)), (BatchRecord, (3,))]
+        )
+
+        self.assertEqual(
+            self.batch.identities(),
+            [record.identity for record in self.batch]
+        )
+
+    def test_empty(self):
+
+        batch = RecordBatch(rtype=BatchRecord)
+
+        self.assertEqual(len(batch), 0)
+        self.assertEqual(batch.records(), [])
+        self.assertEqual(len(batch[1:]), 0)
+
+
+if __name__ == '__main__':
+    main()
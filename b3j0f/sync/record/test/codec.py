@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------------------------
+# The MIT License (MIT)
+#
+# Copyright (c) 2014 Jonathan Labéjof <jonathan.labejof@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# --------------------------------------------------------------------
+
+from unittest import main
+
+from io import BytesIO
+
+from b3j0f.utils.ut import UTCase
+
+from six import int2byte
+
+from ..codec import RecordEncoder, RecordDecoder, dumps, loads, typename
+from ..core import Record
+from ..field import Field
+
+from .core import MyRecord
+
+
+class CodecRecord(Record):
+
+    id = Field(ftype=int, identifier=True)
+    name = Field()
+    child = Field()
+
+
+RTYPES = [CodecRecord, MyRecord]  #: decoded record types.
+
+
+class CodecTest(UTCase):
+
+    def test_values(self):
+
+        values = [
+            None, True, False, 0, 1, -1, 127, 128, -2 ** 70, 2 ** 70, 1.5,
+            u'text é', b'\x00bytes', [1, [2]], (1, (2,)), {1: {'a': 2}},
+            set([1, 2]), frozenset([3]), complex(1, 2)
+        ]
+
+        record = MyRecord(id=1, values=values)
+
+        data = dumps([record])
+
+        # pickled values are refused by default
+        self.assertRaises(RecordDecoder.Error, loads, data, rtypes=RTYPES)
+
+        decoded = loads(data, rtypes=RTYPES, unpickle=True)[0]
+
+        self.assertEqual(decoded.values, values)
+        self.assertEqual(decoded.raw(), record.raw())
+
+    def test_fields(self):
+
+        record = CodecRecord(id=1, name='one', extra=2)
+
+        decoded = loads(dumps([record]), rtypes=RTYPES)[0]
+
+        self.assertIsInstance(decoded, CodecRecord)
+        self.assertEqual(decoded.identity, record.identity)
+        self.assertEqual(decoded.raw(), record.raw())
+        self.assertFalse(decoded.isdirty)
+
+    def test_references(self):
+
+        child = CodecRecord(id=2)
+        records = [
+            CodecRecord(id=1, child=child), child, CodecRecord(id=3, child=child)
+        ]
+        records.append(records[0])
+
+        decoded = loads(dumps(records), rtypes=RTYPES)
+
+        self.assertEqual(len(decoded), 4)
+        self.assertIs(decoded[0].child, decoded[1])
+        self.assertIs(decoded[2].child, decoded[1])
+        self.assertIs(decoded[3], decoded[0])
+        self.assertEqual(decoded[1].id, 2)
+
+    def test_cycle(self):
+
+        record = CodecRecord(id=1)
+        record.child = record
+
+        decoded = loads(dumps([record]), rtypes=RTYPES)[0]
+
+        self.assertIs(decoded.child, decoded)
+
+    def test_unloaded(self):
+
+        record = MyRecord.lazy(data={'id': 1, 'one': 2}, fields=['one'])
+
+        decoded = loads(
+            dumps([record, MyRecord()]), rtypes=RTYPES
+        )
+
+        self.assertEqual(decoded[0].unloaded, frozenset(['two']))
+        self.assertFalse(decoded[1].unloaded)
+
+    def test_stream(self):
+
+        stream = BytesIO()
+        encoder = RecordEncoder(stream)
+
+        batches = [
+            [CodecRecord(id=i) for i in range(3)],
+            [CodecRecord(id=3, name='three'), MyRecord(id=4)],
+            []
+        ]
+
+        for records in batches:
+            encoder.write(records)
+
+        stream.seek(0)
+
+        decoded = list(RecordDecoder(stream, rtypes=RTYPES))
+
+        self.assertEqual(len(decoded), 3)
+
+        for records, decrecords in zip(batches, decoded):
+            self.assertEqual(
+                [record.raw() for record in decrecords],
+                [record.raw() for record in records]
+            )
+
+    def test_compact(self):
+
+        records = [CodecRecord(id=i, name='value') for i in range(100)]
+
+        data = dumps(records)
+
+        # field names are not repeated per record
+        self.assertEqual(data.count(b'name'), 1)
+
+    def test_rtypes(self):
+
+        class LocalRecord(Record):
+
+            id = Field()
+
+        data = dumps([LocalRecord(id=1)])
+
+        self.assertRaises(RecordDecoder.Error, loads, data)
+
+        decoded = loads(data, rtypes=[LocalRecord])
+
+        self.assertIsInstance(decoded[0], LocalRecord)
+        self.assertEqual(decoded[0].id, 1)
+
+    def test_imports(self):
+
+        data = dumps([CodecRecord(id=1)])
+
+        # record types are not imported by default
+        self.assertRaises(RecordDecoder.Error, loads, data)
+
+        decoded = loads(data, imports=True)
+
+        self.assertIsInstance(decoded[0], CodecRecord)
+
+        # imported names must be record types
+        name = typename(CodecRecord).encode('utf-8')
+        other = b'os:system'
+        data = data.replace(
+            int2byte(len(name)) + name, int2byte(len(other)) + other
+        )
+
+        self.assertRaises(RecordDecoder.Error, loads, data, imports=True)
+
+    def test_errors(self):
+
+        self.assertRaises(RecordDecoder.Error, loads, b'wrong')
+
+        data = dumps([CodecRecord(id=1)])
+
+        self.assertRaises(
+            RecordDecoder.Error, loads, data[:-1], rtypes=RTYPES
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -35,6 +35,10 @@ from ..field import Field
 
 from random import random
 
+from collections import OrderedDict, defaultdict, namedtuple
+
+from six.moves.cPickle import dumps, loads
+
 
 class MyRecord(Record):
 
@@ -162,7 +166,8 @@ class RecordTest(UTCase):
 
     def test_copy(self):
 
-        self.myrecord.stores.add(MyStore())
+        store = MyStore()  # stores are weakly referenced by records
+        self.myrecord.stores.add(store)
 
         copy = self.myrecord.copy()
 
@@ -172,7 +177,7 @@ class RecordTest(UTCase):
         self.assertTrue(self.myrecord.stores)
         self.assertFalse(copy.stores)
 
-        copy = self.myrecord.copy(stores=[MyStore()])
+        copy = self.myrecord.copy(stores=[store])
 
         self.assertTrue(copy.stores)
 
@@ -202,6 +207,122 @@ class RecordTest(UTCase):
         self.assertNotEqual(raw, data)
         self.assertEqual(raw['two'], 5)
 
+    def test_raw_nested(self):
+
+        child = Record(value=1)
+        record = Record(
+            child=child, children=[child, (child, {'child': child})]
+        )
+
+        raw = record.raw()
+
+        self.assertEqual(raw['child'], {'value': 1})
+        self.assertIs(raw['children'][0], raw['child'])  # shared
+        self.assertIs(raw['children'][1][0], raw['child'])
+        self.assertIs(raw['children'][1][1]['child'], raw['child'])
+
+        child.value = 2
+        self.assertEqual(record.raw(dirty=False)['child'], {'value': 1})
+
+    def test_raw_cycle(self):
+
+        first, second = Record(), Record()
+        values = []
+
+        first.second = second
+        second.first = first
+        second.values = values
+        values.append((values,))
+
+        raw = first.raw()
+
+        self.assertIs(raw['second']['first'], raw)
+        self.assertIs(raw['second']['values'][0][0], raw['second']['values'])
+
+    def test_raw_subclasses(self):
+
+        class MyList(list):
+            pass
+
+        class MyTuple(tuple):
+            pass
+
+        Pair = namedtuple('Pair', ['first', 'second'])
+
+        child = Record(value=1)
+        ordered = OrderedDict([('b', child), ('a', 2)])
+        default = defaultdict(list, child=[child])
+        mylist = MyList([child])
+        mylist.name = 'mylist'
+
+        record = Record(
+            ordered=ordered, default=default, mylist=mylist,
+            mytuple=MyTuple([child]), pair=Pair(child, 2)
+        )
+        ordered['self'] = ordered
+
+        raw = record.raw()
+        rawchild = {'value': 1}
+
+        self.assertIsInstance(raw['ordered'], OrderedDict)
+        self.assertEqual(list(raw['ordered']), ['b', 'a', 'self'])
+        self.assertEqual(raw['ordered']['b'], rawchild)
+        self.assertIs(raw['ordered']['self'], raw['ordered'])
+
+        self.assertIsInstance(raw['default'], defaultdict)
+        self.assertIs(raw['default'].default_factory, list)
+        self.assertEqual(raw['default']['child'], [rawchild])
+
+        self.assertIsInstance(raw['mylist'], MyList)
+        self.assertEqual(raw['mylist'], [rawchild])
+        self.assertEqual(raw['mylist'].name, 'mylist')
+
+        self.assertIsInstance(raw['mytuple'], MyTuple)
+        self.assertEqual(raw['mytuple'], (rawchild,))
+
+        self.assertEqual(raw['pair'], Pair(rawchild, 2))
+        self.assertIs(raw['pair'].first, raw['ordered']['b'])
+
+        # sources are not modified
+        self.assertIs(ordered['b'], child)
+        self.assertIs(mylist[0], child)
+
+    def test_raw_deep(self):
+
+        record = Record(value=0)
+
+        for value in range(1, 5000):
+            record = Record.lazy(data={'value': value, 'child': record})
+
+        raw = record.raw()
+
+        for value in range(4999, -1, -1):
+            self.assertEqual(raw['value'], value)
+            raw = raw.get('child')
+
+    def test_identity(self):
+
+        class IdRecord(Record):
+
+            uid = Field(identifier=True)
+
+        self.assertEqual(IdRecord.getidentifiers(), ('uid',))
+        self.assertEqual(set(IdRecord.getfields()), set(['uid']))
+
+        record = IdRecord(uid=1)
+        self.assertEqual(record.identity, (IdRecord, (1,)))
+
+        record.a = 1
+        self.assertEqual(record.identity, (IdRecord, (1,)))
+
+        self.assertEqual(self.myrecord.identity, (MyRecord, hash(self.myrecord)))
+
+        MyRecord.three = Field()
+        self.assertIn('three', MyRecord.getfields())
+
+        del MyRecord.three
+        self.assertNotIn('three', MyRecord.getfields())
+
     def test_eq(self):
 
         myrecord1 = MyRecord(id=1)
@@ -214,6 +335,99 @@ class RecordTest(UTCase):
         myrecord1.cancel()
         self.assertEqual(myrecord1, myrecord2)
 
+    def test_pickle(self):
+
+        record = MyRecord(id=1, a=[1, 2])
+        record.a = 3  # not commited
+
+        copy = loads(dumps(record))
+
+        self.assertIsNot(copy, record)
+        self.assertEqual(copy.raw(), record.raw())
+        self.assertEqual(copy.raw(dirty=False), record.raw(dirty=False))
+        self.assertTrue(copy.isdirty)
+        self.assertFalse(copy.stores)
+
+        copy.cancel()
+        self.assertEqual(copy.a, [1, 2])
+
+        record.commit()
+        self.assertFalse(loads(dumps(record)).isdirty)
+
+    def test_lazy(self):
+
+        class IdRecord(Record):
+
+            uid = Field(identifier=True)
+            one = Field(ftype=int, default=1)
+
+        decoded = []
+
+        def decode(name, value):
+            decoded.append(name)
+            return value
+
+        record = IdRecord.lazy(
+            data={'uid': 1, 'one': 'a', 'two': 2}, decode=decode
+        )
+
+        self.assertEqual(record.identity, (IdRecord, (1,)))
+        self.assertEqual(decoded, ['uid'])
+
+        self.assertEqual(record.two, 2)
+        self.assertEqual(decoded, ['uid', 'two'])
+        self.assertRaises(TypeError, getattr, record, 'one')
+        self.assertRaises(TypeError, record.raw)  # value is still pending
+
+    def test_lazy_keys(self):
+
+        records = [
+            MyRecord.lazy(
+                data={''.join(['tw', 'o']): 3, ''.join(['x', 'y']): 4}
+            ) for _ in range(2)
+        ]
+
+        for name in ('two', 'xy'):
+            keys = [
+                [key for key in record.raw() if key == name][0]
+                for record in records
+            ]
+            self.assertIs(keys[0], keys[1])
+
+    def test_lazy_materialize(self):
+
+        record = MyRecord.lazy(data={'id': 1, 'two': 3})
+
+        self.assertEqual(record.one, 1)  # default value
+        self.assertEqual(record, MyRecord(id=1, two=3))
+        self.assertFalse(record.isdirty)
+
+        record.two = 4
+        self.assertTrue(record.isdirty)
+        self.assertEqual(record.raw(), {'id': 1, 'one': 1, 'two': 4})
+
+        record.cancel()
+        self.assertEqual(record.two, 3)
+
+    def test_partial(self):
+
+        record = MyRecord.lazy(data={'id': 1, 'one': 2, 'two': 3}, fields=['one'])
+
+        self.assertEqual(record.unloaded, frozenset(['two']))
+        self.assertEqual(record.raw(), {'one': 2, 'two': None})
+
+        copy = record.copy()
+        self.assertEqual(copy.unloaded, frozenset(['two']))
+        self.assertFalse(record.copy(data={'two': 4}).unloaded)
+
+        copy = loads(dumps(record))
+        self.assertEqual(copy.unloaded, frozenset(['two']))
+
+        record.two = 4
+        self.assertFalse(record.unloaded)
+        self.assertFalse(MyRecord().unloaded)
+        self.assertFalse(loads(dumps(record)).unloaded)
+
 
 if __name__ == '__main__':
     main()
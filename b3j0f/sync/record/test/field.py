@@ -79,6 +79,19 @@ class FieldTest(UTCase):
 
         self.assertRaises(TypeError, Field, ftype=int, default='')
 
+    def test_intern(self):
+
+        field = Field(intern=True)
+
+        value = field.getvalue(''.join(['a', 'b']))
+
+        self.assertIs(field.getvalue(''.join(['a', 'b'])), value)
+        self.assertEqual(field.getvalue(1), 1)
+        self.assertIsNot(
+            Field().getvalue(''.join(['a', 'b'])),
+            Field().getvalue(''.join(['a', 'b']))
+        )
+
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------------------------
+# The MIT License (MIT)
+#
+# Copyright (c) 2014 Jonathan Labéjof <jonathan.labejof@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# --------------------------------------------------------------------
+
+"""record.intern UTs"""
+
+from unittest import main
+
+from b3j0f.utils.ut import UTCase
+
+from ..intern import InternTable
+
+
+class InternTableTest(UTCase):
+
+    def test_intern(self):
+
+        table = InternTable()
+
+        value = ''.join(['a', 'b'])
+        other = ''.join(['a', 'b'])
+
+        self.assertIs(table.intern(value), value)
+        self.assertIs(table.intern(other), value)
+        self.assertEqual(len(table), 1)
+        self.assertIn('ab', table)
+
+    def test_size(self):
+
+        table = InternTable(size=1)
+
+        table.intern('a')
+        value = ''.join(['b', 'c'])
+
+        self.assertIs(table.intern(value), value)
+        self.assertNotIn(value, table)
+
+    def test_clear(self):
+
+        table = InternTable()
+        table.intern('a')
+        table.clear()
+
+        self.assertEqual(len(table), 0)
+
+
+if __name__ == '__main__':
+    main()
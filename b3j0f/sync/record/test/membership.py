@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------------------------
+# The MIT License (MIT)
+#
+# Copyright (c) 2014 Jonathan Labéjof <jonathan.labejof@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# --------------------------------------------------------------------
+
+"""record.membership UTs"""
+
+from unittest import main
+
+from gc import collect
+
+from weakref import ref
+
+from b3j0f.utils.ut import UTCase
+
+from ..membership import StorePool, POOL
+
+from .core import MyRecord, MyStore
+
+
+class StorePoolTest(UTCase):
+
+    def setUp(self):
+
+        self.pool = StorePool()
+
+    def test_intern(self):
+
+        store0, store1 = MyStore(), MyStore()
+
+        membership = self.pool.intern([store0, store1])
+
+        self.assertIs(membership, self.pool.intern([store1, store0]))
+        self.assertIs(self.pool.intern(), StorePool.EMPTY)
+        self.assertEqual(
+            set(self.pool.stores(membership)), set([store0, store1])
+        )
+
+    def test_transit(self):
+
+        store = MyStore()
+        index = self.pool.index(store)
+
+        membership = self.pool.transit(StorePool.EMPTY, index)
+
+        self.assertIs(membership, self.pool.intern([store]))
+        self.assertIs(
+            self.pool.transit(membership, index, add=False), StorePool.EMPTY
+        )
+
+    def test_weak(self):
+
+        store = MyStore()
+        membership = self.pool.intern([store])
+
+        self.assertEqual(len(self.pool), 1)
+
+        storeref = ref(store)
+        del store
+        collect()
+
+        self.assertIsNone(storeref())
+        self.assertEqual(self.pool.stores(membership), [])
+
+        self.pool.intern([MyStore()])  # purge dead stores
+
+        self.assertNotIn(membership, self.pool._memberships)
+
+
+class RecordStoresTest(UTCase):
+
+    def test_shared(self):
+
+        store = MyStore()
+
+        records = [MyRecord() for _ in range(5)]
+
+        for record in records:
+            record.stores.add(store)
+
+        for record in records:
+            self.assertIs(record._stores, records[0]._stores)
+            self.assertIn(store, record.stores)
+
+    def test_bind(self):
+
+        store = MyStore()
+
+        records = [MyRecord() for _ in range(5)]
+
+        getter = MyRecord._stores.__get__
+        setter = MyRecord._stores.__set__
+
+        POOL.bind(records=records, store=store, getter=getter, setter=setter)
+
+        for record in records:
+            self.assertEqual(list(record.stores), [store])
+
+        POOL.bind(
+            records=records, store=store, getter=getter, setter=setter,
+            add=False
+        )
+
+        for record in records:
+            self.assertFalse(record.stores)
+
+    def test_weak(self):
+
+        record = MyRecord()
+        store = MyStore()
+
+        record.stores.add(store)
+
+        storeref = ref(store)
+        del store
+        collect()
+
+        self.assertIsNone(storeref())
+        self.assertFalse(record.stores)
+
+    def test_discard(self):
+
+        record = MyRecord()
+        store = MyStore()
+
+        record.stores.discard(store)
+        record.stores.add(store)
+        record.stores.discard(store)
+
+        self.assertNotIn(store, record.stores)
+        self.assertEqual(len(record.stores), 0)
+
+    def test_setter(self):
+
+        record = MyRecord()
+        stores = [MyStore(), MyStore()]
+
+        record.stores = stores
+
+        self.assertEqual(set(record.stores), set(stores))
+
+
+if __name__ == '__main__':
+    main()
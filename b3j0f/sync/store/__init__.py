@@ -27,4 +27,20 @@
 """b3j0f.sync.store package."""
 
 from .core import Store
+from .buffer import StoreBuffer
+from .tombstone import TombstoneLog
+from .stats import CountStats
+from .pool import ConnectionPool
+from .retry import RetryPolicy, CircuitBreaker
+from .throttle import TokenBucket, Throttle
+from .cache import CachedStore, LRUCache
+from .jsonl import JSONLStore, JSONLAccessor
+from .instrument import HistogramCollector, Measure, Observer
+from .report import SyncReport
+from .plan import SyncPlan
+from .spill import SpillBuffer
+from .pagesize import PageSizer
+from .conflict import (
+    ConflictPolicy, LastWriterWins, SourcePriority, FieldMerge
+)
 from .registry import StoreRegistry
@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------------------------
+# The MIT License (MIT)
+#
+# Copyright (c) 2014 Jonathan Labéjof <jonathan.labejof@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# --------------------------------------------------------------------
+
+"""Store write buffer definition module."""
+
+__all__ = ['StoreBuffer']
+
+from collections import OrderedDict
+
+from threading import Lock
+
+from time import time
+
+
+class StoreBuffer(object):
+    """Coalesce store write operations in order to execute them in bulk.
+
+    Pending operations are indexed by record identity in order to collapse
+    repeated writes of a same record and to cancel an add followed by a remove.
+
+    Buffered updates are upserts, and buffered operations are visible in the
+    store only once flushed.
+
+    The buffer is flushed when it contains ``size`` pending operations, when its
+    oldest pending operation is older than ``age`` seconds, or explicitly with
+    the flush method. The age is checked at each buffered operation, and not
+    in background: a last pending operation is executed only by an explicit
+    flush, or when the store is closed.
+
+    Producers can share a buffer: operations are coalesced under a lock, and
+    flushes execute pending operations out of the lock."""
+
+    DEFAULT_SIZE = 1000  #: default maximal number of pending operations.
+
+    #: resulting command of an old pending command followed by a new one.
+    COALESCE = {
+        ('add', 'add'): 'add',
+        ('add', 'update'): 'add',
+        ('add', 'remove'): None,
+        ('update', 'add'): 'update',
+        ('update', 'update'): 'update',
+        ('update', 'remove'): 'remove',
+        ('remove', 'add'): 'update',
+        ('remove', 'update'): 'update',
+        ('remove', 'remove'): 'remove'
+    }
+
+    def __init__(self, store, size=DEFAULT_SIZE, age=None, *args, **kwargs):
+        """
+        :param Store store: store where execute pending operations.
+        :param int size: maximal number of pending operations. Default is
+            DEFAULT_SIZE.
+        :param float age: maximal age in seconds of pending operations. Default
+            is None (no age limit).
+        """
+
+        super(StoreBuffer, self).__init__(*args, **kwargs)
+
+        self.store = store
+        self.size = size
+        self.age = age
+
+        self._pending = OrderedDict()  # pending [cmd, record] by identity.
+        self._identities = {}  # record identities by record id.
+        self._since = None  # first pending operation timestamp.
+        self._lock = Lock()
+
+    def __len__(self):
+
+        return len(self._pending)
+
+    def add(self, records):
+        """Buffer records to add.
+
+        :param list records: records to add.
+        :return: flush result if the buffer has been flushed, otherwise None.
+        """
+
+        return self._push(cmd='add', records=records)
+
+    def update(self, records):
+        """Buffer records to upsert.
+
+        :param list records: records to upsert.
+        :return: flush result if the buffer has been flushed, otherwise None.
+        """
+
+        return self._push(cmd='update', records=records)
+
+    def remove(self, records):
+        """Buffer records to remove.
+
+        :param list records: records to remove.
+        :return: flush result if the buffer has been flushed, otherwise None.
+        """
+
+        return self._push(cmd='remove', records=records)
+
+    def _push(self, cmd, records):
+        """Coalesce input command on records with pending operations.
+
+        :param str cmd: command name (add, update or remove).
+        :param list records: records on which apply the command.
+        :return: flush result if the buffer has been flushed, otherwise None.
+        """
+
+        result = None
+
+        identities = [record.identity for record in records]
+
+        with self._lock:
+            pending = self._pending
+            recordids = self._identities
+
+            if self._since is None:
+                self._since = time()
+
+            for record, identity in zip(records, identities):
+                # the record content may have been commited since it was
+                # buffered
+                oldidentity = recordids.get(id(record))
+                if oldidentity is not None and oldidentity != identity:
+                    if oldidentity in pending:
+                        pending[identity] = pending.pop(oldidentity)
+
+                operation = pending.get(identity)
+
+                if operation is None:
+                    pending[identity] = [cmd, record]
+                    recordids[id(record)] = identity
+
+                else:
+                    newcmd = StoreBuffer.COALESCE[(operation[0], cmd)]
+
+                    if newcmd is None:
+                        del pending[identity]
+                        recordids.pop(id(record), None)
+
+                    else:
+                        operation[:] = [newcmd, record]
+                        recordids[id(record)] = identity
+
+            full = len(pending) >= self.size or (
+                self.age is not None and time() - self._since >= self.age
+            )
+
+            if not (full or pending):
+                self._since = None
+
+        if full:
+            result = self.flush()
+
+        return result
+
+    def flush(self):
+        """Execute pending operations grouped by command.
+
+        Store operations are executed in bulk. If a bulk operation fails,
+        records which are not failures of the store error succeeded, and failed
+        records are executed again one by one in order to identify failures.
+
+        :return: records with succeeded operations and failures such as
+            (record, error) tuples.
+        :rtype: tuple"""
+
+        with self._lock:
+            pending = self._pending
+
+            self._pending = OrderedDict()
+            self._identities = {}
+            self._since = None
+
+        recordsbycmd = {'add': [], 'update': [], 'remove': []}
+
+        for cmd, record in pending.values():
+            recordsbycmd[cmd].append(record)
+
+        succeeded, failures = [], []
+
+        for cmd in ('add', 'update', 'remove'):
+            records = recordsbycmd[cmd]
+
+            if records:
+                try:
+                    self._execute(cmd=cmd, records=records)
+
+                except self.store.Error as ex:
+                    if ex.failures:  # do not write succeeded records twice
+                        failed = set(id(record) for record, _ in ex.failures)
+
+                        succeeded += [
+                            record for record in records
+                            if id(record) not in failed
+                        ]
+                        records = [
+                            record for record in records
+                            if id(record) in failed
+                        ]
+
+                    if len(records) == 1:
+                        failures.append((records[0], ex))
+
+                    else:
+                        for record in records:
+                            try:
+                                self._execute(cmd=cmd, records=[record])
+
+                            except self.store.Error as ex:
+                                failures.append((record, ex))
+
+                            else:
+                                succeeded.append(record)
+
+                else:
+                    succeeded += records
+
+        return succeeded, failures
+
+    def _execute(self, cmd, records):
+        """Execute a store command on input records."""
+
+        store = self.store
+
+        if cmd == 'add':
+            store.add(records=records)
+
+        elif cmd == 'update':
+            store.update(records=records, upsert=True)
+
+        else:
+            store.remove(records=records)
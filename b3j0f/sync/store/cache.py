@@ -0,0 +1,423 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------------------------
+# The MIT License (MIT)
+#
+# Copyright (c) 2014 Jonathan Labéjof <jonathan.labejof@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# --------------------------------------------------------------------
+
+"""Cached store definition module."""
+
+__all__ = ['LRUCache', 'CachedStore']
+
+from collections import OrderedDict
+
+from threading import Lock
+
+from time import time
+
+from .core import Store
+
+
+class LRUCache(object):
+    """Bounded cache which discards least recently used items first.
+
+    Items can expire after a time to live. Methods are thread-safe."""
+
+    DEFAULT_SIZE = 10000  #: default maximal number of items.
+
+    def __init__(self, size=DEFAULT_SIZE, ttl=None, *args, **kwargs):
+        """
+        :param int size: maximal number of items. Default is DEFAULT_SIZE.
+        :param float ttl: item time to live in seconds. Default is None (no
+            expiration).
+        """
+
+        super(LRUCache, self).__init__(*args, **kwargs)
+
+        self.size = size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+        self._items = OrderedDict()  # (value, timestamp) by key.
+        self._lock = Lock()
+
+    def __len__(self):
+
+        return len(self._items)
+
+    def __contains__(self, key):
+
+        return self.get(key, _MISSING) is not _MISSING
+
+    def keys(self):
+        """Get cached keys.
+
+        :rtype: list"""
+
+        with self._lock:
+            result = list(self._items)
+
+        return result
+
+    def get(self, key, default=None):
+        """Get a cached value and update hit/miss counters.
+
+        :param key: item key.
+        :param default: value to return if key is not cached or expired.
+        """
+
+        result = default
+
+        with self._lock:
+            item = self._items.pop(key, None)
+
+            if item is None or (
+                    self.ttl is not None and time() - item[1] > self.ttl
+            ):
+                self.misses += 1
+
+            else:
+                self._items[key] = item  # move item at the end of the lru list
+                self.hits += 1
+                result = item[0]
+
+        return result
+
+    def set(self, key, value):
+        """Cache a value.
+
+        :param key: item key.
+        :param value: item value.
+        """
+
+        items = self._items
+
+        with self._lock:
+            items.pop(key, None)
+            items[key] = (value, time())
+
+            while len(items) > self.size:
+                items.popitem(last=False)
+
+    def pop(self, key, default=None):
+        """Remove a cached value.
+
+        :param key: item key.
+        :param default: value to return if key is not cached.
+        :return: cached value or default."""
+
+        with self._lock:
+            item = self._items.pop(key, None)
+
+        return default if item is None else item[0]
+
+    def clear(self):
+        """Remove all items."""
+
+        with self._lock:
+            self._items.clear()
+
+    @property
+    def stats(self):
+        """Get cache statistics.
+
+        :return: hits, misses and size.
+        :rtype: dict"""
+
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self)}
+
+
+_MISSING = object()  #: missing cache value.
+_ABSENT = object()  #: cached value of a record which does not exist.
+
+
+def _normalize(value):
+    """Get a hashable value from input value in order to compare filters."""
+
+    result = value
+
+    if isinstance(value, dict):
+        result = tuple(
+            sorted((key, _normalize(value[key])) for key in value)
+        )
+
+    elif isinstance(value, (list, tuple)):
+        result = tuple(_normalize(item) for item in value)
+
+    elif isinstance(value, (set, frozenset)):
+        result = frozenset(_normalize(item) for item in value)
+
+    else:
+        try:
+            hash(value)
+
+        except TypeError:
+            result = repr(value)
+
+    return result
+
+
+def _related(rtype, rtypes):
+    """True if a record type is, inherits from or is inherited by one of
+    input record types."""
+
+    result = False
+
+    for other in rtypes:
+        result = rtype is other or (
+            isinstance(rtype, type) and isinstance(other, type) and
+            (issubclass(rtype, other) or issubclass(other, rtype))
+        )
+
+        if result:
+            break
+
+    return result
+
+
+class CachedStore(Store):
+    """Store with read-through/write-through caches.
+
+    A first cache contains records by identity. It is fed by the get method and
+    by membership tests, and is invalidated by writes of the same records. A
+    failing get is cached as a missing record.
+
+    A second cache contains find results by record types, filter, sort, skip
+    and limit. An entry is invalidated by any write of its record types, of
+    their parent types or of their sub types.
+
+    Caches contain copies of read records, and each cache hit gets new copies,
+    so that local changes of read records are not visible to other readers.
+
+    Cached stores can be shared among threads. A value read before a
+    concurrent write is not cached once the write invalidated the caches."""
+
+    def __init__(
+            self, cachesize=LRUCache.DEFAULT_SIZE, cachettl=None,
+            *args, **kwargs
+    ):
+        """
+        :param int cachesize: maximal number of cached records and find
+            results. Default is LRUCache.DEFAULT_SIZE.
+        :param float cachettl: cached item time to live in seconds. Default is
+            None (no expiration).
+        """
+
+        super(CachedStore, self).__init__(*args, **kwargs)
+
+        self._getcache = LRUCache(size=cachesize, ttl=cachettl)
+        self._findcache = LRUCache(size=cachesize, ttl=cachettl)
+        self._cacheversion = 0  # incremented by invalidations
+        self._cachelock = Lock()
+
+    @property
+    def cachestats(self):
+        """Get cache statistics.
+
+        :return: hits, misses and size of get and find caches.
+        :rtype: dict"""
+
+        return {'get': self._getcache.stats, 'find': self._findcache.stats}
+
+    def clearcache(self):
+        """Clear caches."""
+
+        with self._cachelock:
+            self._cacheversion += 1
+            self._getcache.clear()
+            self._findcache.clear()
+
+    def _cache(self, cache, key, value, version):
+        """Cache a value read at a cache version, unless caches were
+        invalidated meanwhile."""
+
+        with self._cachelock:
+            if self._cacheversion == version:
+                cache.set(key, value)
+
+    def _execute(self, cmd, **kwargs):
+
+        if cmd == 'get':
+            result = self._cachedget(**kwargs)
+
+        elif cmd == 'find' and kwargs.get('records') is None:
+            result = self._cachedfind(**kwargs)
+
+        else:
+            if kwargs.get('records') is not None:  # iterated twice
+                kwargs['records'] = list(kwargs['records'])
+
+            try:
+                result = super(CachedStore, self)._execute(cmd=cmd, **kwargs)
+
+            finally:  # records can be partially written
+                if cmd in ('add', 'update', 'remove'):
+                    self._invalidate(
+                        records=kwargs.get('records'),
+                        rtypes=kwargs.get('rtypes')
+                    )
+
+        return result
+
+    def _executebatch(self, cmd, rtype, params):
+
+        result = super(CachedStore, self)._executebatch(
+            cmd=cmd, rtype=rtype, params=params
+        )
+
+        if cmd != 'find_batch':
+            self._invalidate(rtypes=[rtype])
+
+        return result
+
+    def _cachedget(self, record, **kwargs):
+        """Get a record from the cache or from accessors.
+
+        Projected records are not cached."""
+
+        if kwargs.get('fields') is not None:
+            result = super(CachedStore, self)._execute(
+                cmd='get', record=record, **kwargs
+            )
+
+        else:
+            identity = record.identity
+
+            result = self._getcache.get(identity, _MISSING)
+
+            if result is _MISSING:
+                result = self._fetch(record=record, identity=identity)
+
+            elif result is _ABSENT:
+                raise Store.Error('No record {0}.'.format(record))
+
+            else:
+                result = self._copy([result])[0]
+
+        return result
+
+    def _fetch(self, record, identity, **kwargs):
+        """Get a record from accessors and cache the result."""
+
+        version = self._cacheversion
+
+        try:
+            result = super(CachedStore, self)._execute(
+                cmd='get', record=record, **kwargs
+            )
+
+        except Store.Error:
+            self._cache(self._getcache, identity, _ABSENT, version)
+            raise
+
+        else:
+            cached = result if result is None else self._copy([result])[0]
+            self._cache(self._getcache, identity, cached, version)
+
+        return result
+
+    def _cachedfind(self, rtypes=None, **kwargs):
+        """Find records from the cache or from accessors."""
+
+        if rtypes is None:
+            rtypes = self.rtypes
+
+        key = (
+            tuple(rtypes),
+            tuple((name, _normalize(kwargs[name])) for name in sorted(kwargs))
+        )
+
+        result = self._findcache.get(key)
+
+        if result is None:
+            version = self._cacheversion
+
+            result = super(CachedStore, self)._execute(
+                cmd='find', rtypes=rtypes, **kwargs
+            )
+            self._cache(self._findcache, key, self._copy(result), version)
+
+        else:
+            result = self._copy(result)
+
+        return result
+
+    def _copy(self, records):
+        """Copy records registered to this store.
+
+        :param list records: records to copy.
+        :rtype: list"""
+
+        result = [record.copy() for record in records]
+
+        self._register(records=result)
+
+        return result
+
+    def _invalidate(self, records=None, rtypes=None):
+        """Invalidate cached items related to written records.
+
+        :param list records: written records.
+        :param list rtypes: written record types if records are not given.
+        """
+
+        getcache, findcache = self._getcache, self._findcache
+
+        if records is None:
+            identities = None
+            rtypes = set(self.rtypes if rtypes is None else rtypes)
+
+        else:
+            identities = [record.identity for record in records]
+            rtypes = set(record.__class__ for record in records)
+
+        with self._cachelock:
+            self._cacheversion += 1
+
+            if identities is None:
+                for identity in getcache.keys():
+                    if _related(identity[0], rtypes):
+                        getcache.pop(identity)
+
+            else:
+                for identity in identities:
+                    getcache.pop(identity)
+
+            for key in findcache.keys():
+                if any(_related(rtype, rtypes) for rtype in key[0]):
+                    findcache.pop(key)
+
+    def __contains__(self, other):
+
+        identity = other.identity
+
+        cached = self._getcache.get(identity, _MISSING)
+
+        if cached is _MISSING:
+            try:
+                cached = self._fetch(record=other, identity=identity)
+
+            except Store.Error:
+                cached = _ABSENT
+
+        return cached is not _ABSENT and cached is not None
@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------------------------
+# The MIT License (MIT)
+#
+# Copyright (c) 2014 Jonathan Labéjof <jonathan.labejof@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# --------------------------------------------------------------------
+
+"""Conflict resolution policies of multi-master synchronizations.
+
+A policy chooses the record to write in all targets among versions of a same
+record (same identity) read from several sources."""
+
+__all__ = [
+    'ConflictPolicy', 'LastWriterWins', 'SourcePriority', 'FieldMerge'
+]
+
+
+class ConflictPolicy(object):
+    """Conflict resolution policy.
+
+    Versions are lists of (store, record) in reading order. The default
+    policy keeps the first read version."""
+
+    def order(self, versions):
+        """Order versions by preference.
+
+        :param list versions: (store, record) of a same record identity.
+        :rtype: list"""
+
+        return list(versions)
+
+    def resolve(self, versions):
+        """Resolve a conflict between versions of a record.
+
+        :param list versions: (store, record) of a same record identity.
+        :return: record to keep.
+        :rtype: Record"""
+
+        return self.order(versions)[0][1]
+
+
+class LastWriterWins(ConflictPolicy):
+    """Keep the version with the greatest value of a version field.
+
+    Records without value are the oldest ones. Reading order solves ties."""
+
+    DEFAULT_FIELD = 'version'  #: default version field name.
+
+    def __init__(self, field=DEFAULT_FIELD, *args, **kwargs):
+        """
+        :param str field: version field name.
+        """
+
+        super(LastWriterWins, self).__init__(*args, **kwargs)
+
+        self.field = field
+
+    def order(self, versions):
+
+        field = self.field
+
+        def key(version):
+            """Get the sort key of a version."""
+
+            value = getattr(version[1], field, None)
+
+            return (value is not None, value)
+
+        return sorted(versions, key=key, reverse=True)
+
+
+class SourcePriority(ConflictPolicy):
+    """Keep the version of the source with the highest priority.
+
+    Sources which are not prioritized come last, in reading order."""
+
+    def __init__(self, stores, *args, **kwargs):
+        """
+        :param list stores: stores by decreasing priority.
+        """
+
+        super(SourcePriority, self).__init__(*args, **kwargs)
+
+        self.stores = stores
+
+    def order(self, versions):
+
+        stores = self.stores
+        last = len(stores)
+
+        def key(version):
+            """Get the sort key of a version."""
+
+            result = last
+
+            for index, store in enumerate(stores):
+                if store is version[0]:
+                    result = index
+                    break
+
+            return result
+
+        return sorted(versions, key=key)
+
+
+class FieldMerge(ConflictPolicy):
+    """Merge versions field per field.
+
+    A field value is the one of the preferred version where it is not None.
+    Preferences come from a fallback policy."""
+
+    def __init__(self, fallback=None, *args, **kwargs):
+        """
+        :param ConflictPolicy fallback: policy ordering versions. Default
+            keeps reading order.
+        """
+
+        super(FieldMerge, self).__init__(*args, **kwargs)
+
+        self.fallback = ConflictPolicy() if fallback is None else fallback
+
+    def order(self, versions):
+
+        return self.fallback.order(versions)
+
+    def resolve(self, versions):
+
+        versions = self.order(versions)
+
+        result = versions[0][1]
+
+        if len(versions) > 1:
+            data = dict(result._data)
+
+            for _, record in versions[1:]:
+                for name, value in record._data.items():
+                    if value is not None and data.get(name) is None:
+                        data[name] = value
+
+            if data != result._data:
+                result = result.__class__(**data)
+
+        return result
@@ -29,28 +29,313 @@
 __all__ = ['Store']
 
 from ..record.core import Record
+from ..record.batch import RecordBatch
+from ..accessor.core import Accessor
 from ..accessor.registry import AccessorRegistry
 
-from six import reraise
+from .buffer import StoreBuffer
+from .tombstone import TombstoneLog
+from .stats import CountStats
+from .pool import ConnectionPool
+from .retry import CircuitBreaker, RetryPolicy
+from .throttle import Throttle
+from .instrument import Observable
 
+from collections import OrderedDict
 
-class Store(Record):
+from functools import partial
+
+from six import get_unbound_function, reraise
+
+from threading import Lock, local
+
+from timeit import default_timer as timer
+
+from ..record.membership import POOL
+
+_STORESSLOT = Record.__dict__['_stores']  #: fast record membership accessor.
+_UNLOADEDSLOT = Record.__dict__['_unloaded']  #: fast projection accessor.
+
+
+class Store(Observable, Record):
     """Store records.
 
     A Store can be a database or a github account for example.
 
     Beceause it is mainly an interface, results are sorted by store in order
-    to identify which real store corresponds to results."""
+    to identify which real store corresponds to results.
+
+    Observers are notified with a measure per accessor call.
+
+    Accessors which implement Accessor.connect get connections from a pool
+    per accessor. A connection is borrowed per accessor call, and accessors
+    get it with Store.connection. Pools are closed with Store.close, or at
+    the end of a with statement.
+
+    Accessor calls can be throttled with a maximal rate and a maximal number
+    of concurrent calls. Throttling waits are reported in measures, and apply
+    to all threads using the store, such as parallel registry writers.
+
+    Stores can be shared among threads if their accessors are thread-safe.
+    Accessor registries are replaced instead of modified, record memberships
+    are immutable interned sets, and tombstones, count estimates and write
+    buffers are guarded by their own locks."""
 
     class Error(Exception):
-        """Handle Store errors."""
+        """Handle Store errors.
+
+        Errors of commands on several accessors are raised once all accessors
+        are called."""
+
+        failures = ()  #: (record, error) of failed records.
+        result = None  #: partial command result.
 
-    def __init__(self, accessors=None, *args, **kwargs):
+    #: commands of which accessor results are aligned with input records.
+    _ALIGNEDCMDS = ('add', 'update', 'remove')
+
+    def __init__(
+            self, accessors=None, buffersize=None, bufferage=None,
+            retention=None, poolsize=ConnectionPool.DEFAULT_SIZE,
+            pooltimeout=None, retry=None, breaker=None, rate=None,
+            burst=None, maxinflight=None, *args, **kwargs
+    ):
+        """
+        :param list accessors: accessors to register.
+        :param int buffersize: if given, buffer write operations of in-place
+            operators and flush them when buffersize operations are pending.
+        :param float bufferage: if given, buffer write operations of in-place
+            operators and flush them when the oldest one is older than
+            bufferage seconds. The age is checked only when an operation is
+            buffered, so that a last pending operation waits for flush or
+            close.
+        :param float retention: if given, log removed records during
+            retention seconds in order to propagate deletions.
+        :param int poolsize: maximal number of connections per accessor.
+        :param float pooltimeout: maximal time in seconds to wait for a
+            connection. Default is None (no limit).
+        :param RetryPolicy retry: policy which retries accessor calls failing
+            with transient errors.
+        :param CircuitBreaker breaker: breaker which refuses accessor calls
+            after consecutive transient errors.
+        :param float rate: maximal number of accessor calls per second.
+            Default is None (no limit).
+        :param int burst: maximal number of accessor calls at once over the
+            rate. Default is max(1, rate).
+        :param int maxinflight: maximal number of concurrent accessor calls.
+            Default is None (no limit).
+        :param list observers: observers of accessor calls.
+        """
 
         super(Store, self).__init__(*args, **kwargs)
 
         self._accreg = AccessorRegistry(accessors=accessors)
 
+        if buffersize is None and bufferage is None:
+            self._buffer = None
+
+        else:
+            self._buffer = StoreBuffer(
+                store=self, age=bufferage,
+                size=StoreBuffer.DEFAULT_SIZE if buffersize is None
+                else buffersize
+            )
+
+        self._tombstones = None if retention is None else TombstoneLog(
+            retention=retention
+        )
+
+        self._stats = CountStats()
+
+        self._poolsize = poolsize
+        self._pooltimeout = pooltimeout
+        self._pools = {}  # connection pool or False by accessor id
+        self._poollock = Lock()
+        self._local = local()  # thread connections by accessor id
+
+        self._retry = retry
+        self._breaker = breaker
+
+        self._throttle = None if rate is None and maxinflight is None \
+            else Throttle(rate=rate, burst=burst, maxinflight=maxinflight)
+
+    def __enter__(self):
+
+        return self.open()
+
+    def __exit__(self, *args):
+
+        self.close()
+
+    def open(self):
+        """Create connection pools of accessors.
+
+        Pools are also created at their first use.
+
+        :return: self.
+        :rtype: Store"""
+
+        for accessor in self.accessors:
+            self._pool(accessor)
+
+        return self
+
+    def close(self):
+        """Flush buffered write operations and close connection pools.
+
+        Borrowed connections are closed once released.
+
+        :raises: Store.Error if buffered operations fail. Its failures and
+            result are failures and succeeded records of the flush."""
+
+        try:
+            succeeded, failures = self.flush()
+
+        finally:
+            with self._poollock:
+                pools, self._pools = self._pools, {}
+
+            for pool in pools.values():
+                if pool:
+                    pool.close()
+
+        if failures:
+            ex = Store.Error(
+                'Failed to flush {0} buffered operations.'.format(
+                    len(failures)
+                )
+            )
+            ex.failures = failures
+            ex.result = succeeded
+
+            raise ex
+
+    @property
+    def throttle(self):
+        """Get the throttle of accessor calls if any.
+
+        :rtype: Throttle"""
+
+        return self._throttle
+
+    @property
+    def pools(self):
+        """Get connection pools by accessor.
+
+        :rtype: dict"""
+
+        pools = self._pools
+
+        return dict(
+            (accessor, pools[id(accessor)]) for accessor in self.accessors
+            if pools.get(id(accessor))
+        )
+
+    def connection(self, accessor):
+        """Get the connection borrowed by the current thread for an
+        accessor.
+
+        :param Accessor accessor: accessor which calls this method.
+        :return: connection or None if no connection is borrowed."""
+
+        return getattr(self._local, 'connections', {}).get(id(accessor))
+
+    def _pool(self, accessor):
+        """Get the connection pool of an accessor.
+
+        :rtype: ConnectionPool
+        :return: None if the accessor does not implement Accessor.connect."""
+
+        key = id(accessor)
+
+        result = self._pools.get(key)
+
+        if result is None:
+            with self._poollock:
+                result = self._pools.get(key)
+
+                if result is None:
+                    connect = get_unbound_function(accessor.__class__.connect)
+
+                    if connect is get_unbound_function(Accessor.connect):
+                        result = False
+
+                    else:
+                        result = ConnectionPool(
+                            connect=partial(accessor.connect, self),
+                            disconnect=partial(accessor.disconnect, self),
+                            check=partial(accessor.check, self),
+                            size=self._poolsize, timeout=self._pooltimeout
+                        )
+
+                    self._pools[key] = result
+
+        return result or None
+
+    def _borrow(self, accessor):
+        """Borrow a connection for the current thread if needed.
+
+        :return: pool of the borrowed connection, or None if no connection is
+            borrowed.
+        :rtype: ConnectionPool"""
+
+        result = self._pool(accessor)
+
+        if result is not None:
+            local = self._local
+
+            connections = getattr(local, 'connections', None)
+
+            if connections is None:
+                connections = local.connections = {}
+
+            key = id(accessor)
+
+            if key in connections:  # reentrant call
+                result = None
+
+            else:
+                connections[key] = result.acquire()
+
+        return result
+
+    @property
+    def buffer(self):
+        """Get the write buffer used by in-place operators.
+
+        :rtype: StoreBuffer"""
+
+        return self._buffer
+
+    def flush(self):
+        """Execute buffered write operations.
+
+        :return: records with succeeded operations and failures such as
+            (record, error) tuples.
+        :rtype: tuple"""
+
+        result = [], []
+
+        if self._buffer is not None:
+            result = self._buffer.flush()
+
+        return result
+
+    @property
+    def tombstones(self):
+        """Get the log of removed records.
+
+        :rtype: TombstoneLog"""
+
+        return self._tombstones
+
+    @property
+    def stats(self):
+        """Get estimated numbers of records by record type.
+
+        :rtype: CountStats"""
+
+        return self._stats
+
     @property
     def rtypes(self):
         """Get all record types registered by accessors.
@@ -70,7 +355,13 @@ class Store(Record):
 
         :rtype: list"""
 
-        return list(self._accreg.values())
+        result = []
+
+        for accessor in self._accreg.values():  # accessors without duplicates
+            if all(accessor is not item for item in result):
+                result.append(accessor)
+
+        return result
 
     @accessors.setter
     def accessors(self, value):
@@ -78,8 +369,8 @@ class Store(Record):
 
         :param list value: accessors to register in this store."""
 
-        self._accreg.clear()
-        self._accreg.register(accessors=value)
+        # replace the registry in order to never expose a partial one
+        self._accreg = AccessorRegistry(accessors=value)
 
     def record2data(self, record, dirty=True):
         """Get a specific store data from a record.
@@ -101,79 +392,377 @@ class Store(Record):
         return self._execute(cmd='data2record', rtype=rtype, data=data)
 
 
+    def _getaccessor(self, rtype):
+        """Get the accessor of input record type.
+
+        :param rtype: record type.
+        :rtype: Accessor
+        :raises: Store.Error if no accessor is registered for rtype."""
+
+        result = self._accreg.get(rtype)
+
+        if result is None:
+            raise Store.Error('No accessor registered for {0}.'.format(rtype))
+
+        return result
+
     def _execute(self, cmd, **kwargs):
-        """Get kwargs by accessor.
+        """Execute a command on accessors.
+
+        Records are grouped by class in one pass, and classes are resolved to
+        accessors. Accessors are called in order of first appearance of their
+        records. If accessor results of add, update or remove are aligned with
+        their input records, the result respects the input records order.
 
         :param str cmd: command name to execute on accessors.
-        :param bool multi: flag for multi result or not.
         :return: accessor command result(s)."""
 
-        result = []
+        counting = cmd == 'count'
 
-        acckwargs = {}
+        result = 0 if counting else []
 
-        multi = 'records' in kwargs or 'rtypes' in kwargs
+        acckwargs = OrderedDict()  # command parameters by accessor.
 
-        if multi:
-            if 'records' in kwargs:
-                records = kwargs.pop('records')
+        hasrtypes = 'rtypes' in kwargs
+        multi = hasrtypes or 'records' in kwargs
 
-                if records is not None:
-                    for record in records:
-                        accessor = self._accreg.get(record.__class__)
-                        params = acckwargs.setdefault(accessor, {})
-                        params.setdefault('records', []).append(record)
+        records = kwargs.pop('records', None)
+        rtypes = kwargs.pop('rtypes', None)
 
-            if 'rtypes' in kwargs:
-                rtypes = kwargs.pop('rtypes')
+        if records is not None:  # iterated several times
+            records = list(records)
 
+        indices = None  # record indices by accessor in case of many accessors
+
+        if multi:
+            if records is not None:
+                indices = self._group(records=records, acckwargs=acckwargs)
+
+                if hasrtypes and rtypes is None:  # use types of records
+                    for params in acckwargs.values():
+                        params['rtypes'] = list(set(
+                            record.__class__ for record in params['records']
+                        ))
+
+            if hasrtypes and (rtypes is not None or records is None):
                 if rtypes is None:
                     rtypes = self.rtypes
 
                 for rtype in rtypes:
-                    accessor = self._accreg.get(rtype)
-                    params = acckwargs.setdefault(accessor, {})
+                    accessor = self._getaccessor(rtype)
+                    params = acckwargs.get(accessor)
+
+                    if params is None:
+                        params = acckwargs[accessor] = {}
+
                     params.setdefault('rtypes', []).append(rtype)
 
         else:
             if 'record' in kwargs:
                 record = kwargs['record']
-                accessor = self._accreg.get(record.__class__)
+                accessor = self._getaccessor(record.__class__)
                 acckwargs[accessor] = {'record': record}
 
-
             if 'rtype' in kwargs:
                 rtype = kwargs['rtype']
-                accessor = self._accreg.get(rtype)
+                accessor = self._getaccessor(rtype)
                 acckwargs[accessor] = {}
 
-        rstorecmd = cmd if cmd == 'remove' else 'add'  # record store command
+        remove = cmd == 'remove'
+        ordered = indices is not None and cmd in Store._ALIGNEDCMDS
+        aligned = True  # true if accessor results are aligned with records
+        accresults = []  # (accessor records indices, accessor result)
+        error = None  # first accessor error
+        failures = []  # (record, error) of failed records
 
         for accessor in acckwargs:
             params = acckwargs[accessor]
             params.update(kwargs)
 
             try:
-                accres = getattr(accessor, cmd)(store=self, **params)
+                accres = self._call(accessor=accessor, cmd=cmd, params=params)
 
-            except Exception as ex:
-                reraise(Store.Error, Store.Error(ex))
+            except Store.Error as ex:
+                if not multi:
+                    raise
+
+                error = error or ex
+                accres = self._failed(
+                    records=params.get('records'), error=ex, failures=failures
+                )
+
+                if counting or accres is None:
+                    continue
+
+            if counting:
+                result += accres
+
+            elif multi:
+                self._register(records=accres, remove=remove)
+
+                if ordered:
+                    accindices = indices[accessor]
+                    aligned = aligned and len(accindices) == len(accres)
+                    accresults.append((accindices, accres))
+
+                else:
+                    result += accres
+
+            else:
+                result = accres
+                if isinstance(accres, Record):
+                    self._register(records=[accres], remove=remove)
+
+        if accresults:
+            if aligned:  # respect the input order
+                result = [None] * len(records)
+
+                for accindices, accres in accresults:
+                    for index, accrecord in zip(accindices, accres):
+                        result[index] = accrecord
 
             else:
-                if multi:
+                for _, accres in accresults:
                     result += accres
 
-                    for record in accres:
-                        if isinstance(record, Record):
-                            getattr(record.stores, rstorecmd)(self)
+        if error is not None:
+            ex = Store.Error(*error.args)
+            ex.failures = failures
+            ex.result = result
 
-                else:
-                    result = accres
-                    if isinstance(accres, Record):
-                        getattr(accres.stores, rstorecmd)(self)
+            raise ex
+
+        return result
+
+    def _failed(self, records, error, failures):
+        """Get succeeded records of a failed accessor call.
+
+        Accessors can raise errors with a ``failures`` list of (record, error)
+        in order to identify failed records. Otherwise, all records failed.
+
+        :param list records: records of the accessor call.
+        :param Store.Error error: accessor call error.
+        :param list failures: (record, error) list to complete.
+        :return: succeeded records, or None if the call has no records.
+        :rtype: list"""
+
+        result = None
+
+        if records is not None:
+            cause = error.args[0] if error.args else None
+            accfailures = getattr(cause, 'failures', None)
+
+            if accfailures is None:
+                accfailures = [(record, cause) for record in records]
+
+            failures += accfailures
+
+            failed = set(id(record) for record, _ in accfailures)
+            result = [record for record in records if id(record) not in failed]
+
+        return result
+
+    def _call(self, accessor, cmd, params):
+        """Call an accessor command and notify observers.
+
+        :param Accessor accessor: accessor to call.
+        :param str cmd: accessor command name.
+        :param dict params: command parameters.
+        :return: command result.
+        :raises: Store.Error in case of error."""
+
+        observers = self._observers
+
+        if observers:
+            start = timer()
+
+        retry, breaker = self._retry, self._breaker
+
+        waits = []  # throttling waits of attempts
+        invoke = self._invoke if self._throttle is None \
+            else partial(self._throttled, waits=waits)
+
+        try:
+            if breaker is not None:
+                breaker.allow()
+
+            if retry is None:
+                result = invoke(accessor=accessor, cmd=cmd, params=params)
+
+            else:
+                result = retry.call(
+                    invoke, accessor=accessor, cmd=cmd, params=params
+                )
+
+        except Exception as ex:
+            if breaker is not None and not isinstance(
+                    ex, CircuitBreaker.Error
+            ):
+                if self._transient(ex):
+                    breaker.failure()
+
+                else:  # the backend answered
+                    breaker.success()
+
+            if observers:
+                self._notify(
+                    cmd=cmd, start=start, accessor=accessor, error=ex,
+                    count=len(params.get('records') or ()) or None,
+                    wait=sum(waits)
+                )
+
+            reraise(Store.Error, Store.Error(ex))
+
+        if breaker is not None:
+            breaker.success()
+
+        if observers:
+            if 'records' in params:
+                count = len(params['records'])
+
+            elif 'batch' in params:
+                count = len(params['batch'])
+
+            elif isinstance(result, (list, RecordBatch)):
+                count = len(result)
+
+            else:
+                count = 1 if isinstance(result, Record) else None
+
+            self._notify(
+                cmd=cmd, start=start, accessor=accessor, count=count,
+                nbytes=accessor.bytesize(
+                    store=self, cmd=cmd, params=params, result=result
+                ), wait=sum(waits)
+            )
+
+        return result
+
+    def _throttled(self, accessor, cmd, params, waits):
+        """Call an accessor command once the throttle allows it.
+
+        Each attempt of a retried command is throttled.
+
+        :param list waits: list where append the throttling wait.
+        :return: command result."""
+
+        throttle = self._throttle
+
+        waits.append(throttle.acquire())
+
+        try:
+            result = self._invoke(accessor=accessor, cmd=cmd, params=params)
+
+        finally:
+            throttle.release()
+
+        return result
+
+    def _invoke(self, accessor, cmd, params):
+        """Call an accessor command with a borrowed connection if needed.
+
+        The connection is discarded in case of transient error.
+
+        :return: command result."""
+
+        pool = self._borrow(accessor)
+
+        if pool is None:
+            result = getattr(accessor, cmd)(store=self, **params)
+
+        else:
+            discard = False
+
+            try:
+                result = getattr(accessor, cmd)(store=self, **params)
+
+            except Exception as ex:
+                discard = self._transient(ex)
+                raise
+
+            finally:
+                pool.release(
+                    self._local.connections.pop(id(accessor)), discard=discard
+                )
+
+        return result
+
+    def _transient(self, error):
+        """True if an accessor error is transient according to the retry
+        policy, or to default transient errors."""
+
+        retry = self._retry
+
+        return isinstance(error, RetryPolicy.TRANSIENT) if retry is None \
+            else retry.transient(error)
+
+    def _group(self, records, acckwargs):
+        """Group records by accessor.
+
+        :param list records: records to group. Must be a list.
+        :param OrderedDict acckwargs: accessor parameters to fill with records.
+        :return: record indices by accessor if records are bound to many
+            accessors. Otherwise None.
+        :rtype: dict"""
+
+        result = None
+
+        byclass = OrderedDict()  # record indices by record class
+
+        for index, record in enumerate(records):
+            cls = type(record)  # avoid the record attribute lookup
+
+            try:
+                byclass[cls].append(index)
+
+            except KeyError:
+                byclass[cls] = [index]
+
+        byaccessor = OrderedDict()  # record indices by accessor
+
+        for cls in byclass:
+            accessor = self._getaccessor(cls)
+
+            if accessor in byaccessor:
+                byaccessor[accessor] += byclass[cls]
+
+            else:
+                byaccessor[accessor] = byclass[cls]
+
+        if len(byaccessor) == 1:  # common case without copy
+            for accessor in byaccessor:
+                acckwargs[accessor] = {'records': list(records)}
+
+        elif byaccessor:
+            result = {}
+
+            for accessor in byaccessor:
+                accindices = byaccessor[accessor]
+
+                if len(accindices) > 1:
+                    accindices.sort()
+
+                result[accessor] = accindices
+                acckwargs[accessor] = {
+                    'records': [records[index] for index in accindices]
+                }
 
         return result
 
+    def _register(self, records, remove=False):
+        """Register this store in stores of input records in bulk.
+
+        :param list records: records where register this store. Non-record
+            items are ignored.
+        :param bool remove: if True (default False), unregister this store.
+        """
+
+        POOL.bind(
+            records=[record for record in records if isinstance(record, Record)],
+            store=self, add=not remove,
+            getter=_STORESSLOT.__get__, setter=_STORESSLOT.__set__
+        )
+
     def add(self, records):
         """Add records and register this in stores of records.
 
@@ -182,9 +771,14 @@ class Store(Record):
         :param list records: records to add. Must be same type.
         :return: added records.
         :rtype: list
-        :raises: Store.Error in case of error."""
+        :raises: Store.Error in case of error. Its result contains added
+            records and its failures failed records."""
 
-        return self._execute(cmd='add', records=records)
+        records = list(records)  # checked before being written
+
+        self._checkloaded(records)
+
+        return self._write(cmd='add', records=records)
 
     def update(self, records, upsert=False, override=False):
         """Update records in this store and register this in stores of records.
@@ -196,26 +790,189 @@ class Store(Record):
             update are different in this store.
         :return: updated records.
         :rtype: list
-        :raises: Store.Error in case of error."""
+        :raises: Store.Error in case of error. Its result contains updated
+            records and its failures failed records."""
+
+        records = list(records)  # checked before being written
+
+        self._checkloaded(records)
 
         if not override:  # update records which are differents
-            frecords = self.find(records=records)
-            records = list(set(records) - set(frecords))
+            frecords = set(self.find(records=records))
+            records = [record for record in records if record not in frecords]
+
+        return self._write(cmd='update', records=records, upsert=upsert)
+
+    def _write(self, cmd, **kwargs):
+        """Execute a write command and track written records, even if the
+        command partially fails.
+
+        :param str cmd: add, update or remove.
+        :return: written records.
+        :rtype: list"""
+
+        try:
+            result = self._execute(cmd=cmd, **kwargs)
+
+        except Store.Error as ex:
+            if ex.result:
+                self._track(
+                    cmd=cmd, records=ex.result, upsert=kwargs.get('upsert')
+                )
+
+            raise
+
+        self._track(cmd=cmd, records=result, upsert=kwargs.get('upsert'))
+
+        return result
+
+    def _track(self, cmd, records, upsert=False):
+        """Update tombstones and count estimates with written records."""
+
+        records = [record for record in records if isinstance(record, Record)]
+
+        if cmd == 'remove':
+            if self._tombstones is not None:
+                self._tombstones.bury(records)
+
+            self._stats.add(records=records, sign=-1)
 
-        return self._execute(cmd='update', records=records, upsert=upsert)
+        else:
+            if self._tombstones is not None:
+                self._tombstones.unbury(records)
+
+            if cmd == 'add':
+                self._stats.add(records=records)
+
+            elif upsert and records:  # unknown number of added records
+                self._stats.discard(
+                    set(record.__class__ for record in records)
+                )
+
+    def _checkloaded(self, records):
+        """Raise an error if a record or a record batch is partially loaded
+        by a projection.
+
+        :param list records: records or record batches to write.
+        :raises: Store.Error if a record has unloaded fields."""
+
+        getunloaded = _UNLOADEDSLOT.__get__
+
+        for record in records:
+            if isinstance(record, Record):
+                unloaded = getunloaded(record)
+
+            elif isinstance(record, RecordBatch):
+                unloaded = record.unloaded
+
+            else:
+                unloaded = None
+
+            if unloaded:
+                raise Store.Error(
+                    'Unloaded fields {0} of {1}.'.format(
+                        sorted(record.unloaded), record
+                    )
+                )
+
+    def _executebatch(self, cmd, rtype, params):
+        """Execute a batch command on the accessor of a record type.
+
+        :param str cmd: accessor command name.
+        :param type rtype: record type.
+        :param dict params: accessor command parameters.
+        :return: accessor command result."""
+
+        return self._call(
+            accessor=self._getaccessor(rtype), cmd=cmd, params=params
+        )
+
+    def add_batch(self, batch):
+        """Add a record batch.
+
+        Records of the batch are not bound to this store.
+
+        :param RecordBatch batch: records to add.
+        :return: number of added records.
+        :rtype: int
+        :raises: Store.Error in case of error."""
+
+        self._checkloaded([batch])
+
+        result = self._executebatch(
+            cmd='add_batch', rtype=batch.rtype, params={'batch': batch}
+        )
+
+        if self._tombstones is not None:
+            self._tombstones.unbury(identities=batch.identities())
+
+        self._stats.add(rtype=batch.rtype, count=result)
+
+        return result
+
+    def update_batch(self, batch, upsert=False):
+        """Update a record batch without checking differences.
+
+        Records of the batch are not bound to this store.
+
+        :param RecordBatch batch: records to update.
+        :param bool upsert: if True (False by default), add records which do
+            not exist.
+        :return: number of updated records.
+        :rtype: int
+        :raises: Store.Error in case of error."""
+
+        self._checkloaded([batch])
+
+        result = self._executebatch(
+            cmd='update_batch', rtype=batch.rtype,
+            params={'batch': batch, 'upsert': upsert}
+        )
+
+        if self._tombstones is not None:
+            self._tombstones.unbury(identities=batch.identities())
+
+        if upsert and result:
+            self._stats.discard([batch.rtype])
+
+        return result
+
+    def find_batch(self, rtype, data=None, limit=None, skip=None, sort=None):
+        """Find records of a type in a batch.
+
+        Records are built when items of the batch are got.
 
-    def get(self, record):
+        :param type rtype: record type.
+        :param dict data: record data to filter. Default None.
+        :param int limit: maximal number of records to retrieve.
+        :param int skip: number of elements to avoid.
+        :param list sort: data field name to sort.
+        :rtype: RecordBatch
+        :raises: Store.Error in case of error."""
+
+        return self._executebatch(
+            cmd='find_batch', rtype=rtype,
+            params={
+                'rtype': rtype, 'data': data, 'limit': limit, 'skip': skip,
+                'sort': sort
+            }
+        )
+
+    def get(self, record, fields=None):
         """Get input record from this store.
 
         The found record matches with input record identifier and not all field
         values. The identifier depends on the store.
 
         :param Record record: record to get from this store.
+        :param list fields: field names to load. Default is all fields.
         :return: corresponding record.
         :rtype: Record
         :raises: Store.Error in case of error."""
 
-        return self._execute(cmd='get', record=record)
+        kwargs = {} if fields is None else {'fields': fields}
+
+        return self._execute(cmd='get', record=record, **kwargs)
 
     def __getitem__(self, key):
 
@@ -224,13 +981,70 @@ class Store(Record):
     def count(self, rtypes=None, data=None):
         """Get number of data in a store.
 
+        Counts are computed by accessors. The count of one record type without
+        filter refreshes its estimate.
+
         :param list rtype: record types. Default is self.rtypes
         :param dict data: data content to filter.
         :rtype: int."""
 
-        return self._execute(cmd='count', rtypes=rtypes, data=data)
+        result = self._execute(cmd='count', rtypes=rtypes, data=data)
+
+        if data is None and rtypes is not None and len(rtypes) == 1:
+            self._stats.set(rtype=rtypes[0], count=result)
+
+        return result
+
+    def estimate_count(self, rtypes=None, maxage=None, count=True):
+        """Get an estimated number of records without scanning them.
+
+        Estimates are maintained with records added and removed by this store.
+        Unknown or too old estimates are refreshed with accessor estimates,
+        or accessor counts.
+
+        :param list rtypes: record types. Default is self.rtypes.
+        :param float maxage: maximal age in seconds of estimates. Default is
+            None (no age limit).
+        :param bool count: if True (default), count records of types which
+            have no estimate.
+        :return: estimated count or None if a record type has no estimate.
+        :rtype: int
+        :raises: Store.Error in case of error."""
+
+        result = 0
+
+        stats = self._stats
+
+        for rtype in (self.rtypes if rtypes is None else rtypes):
+            estimate = stats.get(rtype=rtype, maxage=maxage)
 
-    def find(self, rtypes=None, records=None, data=None, limit=None, skip=None, sort=None):
+            if estimate is None:
+                params = {'rtypes': [rtype]}
+                accessor = self._getaccessor(rtype)
+
+                estimate = self._call(
+                    accessor=accessor, cmd='estimate', params=params
+                )
+
+                if estimate is None and count:
+                    estimate = self._call(
+                        accessor=accessor, cmd='count', params=params
+                    )
+
+                if estimate is None:
+                    result = None
+                    break
+
+                stats.set(rtype=rtype, count=estimate)
+
+            result += estimate
+
+        return result
+
+    def find(
+            self, rtypes=None, records=None, data=None,
+            limit=None, skip=None, sort=None, fields=None
+    ):
         """Find records related to type and data and register this to result
         stores.
 
@@ -240,15 +1054,19 @@ class Store(Record):
         :param int limit: maximal number of documents to retrieve.
         :param int skip: number of elements to avoid.
         :param list sort: data field name to sort.
+        :param list fields: field names to load. Found records are partial and
+            can not be written. Default is all fields.
         :return: records of input type and field values.
         :rtype: list
         :raises: Store.Error in case of error.
         """
 
+        kwargs = {} if fields is None else {'fields': fields}
+
         return self._execute(
             cmd='find',
             rtypes=rtypes, records=records, data=data,
-            limit=limit, skip=skip, sort=sort
+            limit=limit, skip=skip, sort=sort, **kwargs
         )
 
     def remove(self, records=None, rtypes=None, data=None):
@@ -257,15 +1075,15 @@ class Store(Record):
         :param list records: records to remove.
         :param list rtypes: record types to remove.
         :param dict data: date value to filter.
+        :return: removed records.
+        :rtype: list
+        :raises: Store.Error in case of error. Its result contains removed
+            records and its failures failed records."""
 
-        :raises: Store.Error in case of error."""
-
-        result = self._execute(
+        return self._write(
             cmd='remove', records=records, rtypes=rtypes, data=data
         )
 
-        return result
-
     def __delitem__(self, record):
 
         self.remove(records=[record])
@@ -281,7 +1099,11 @@ class Store(Record):
         if isinstance(records, Record):
             records = [records]
 
-        self.add(records=records)
+        if self._buffer is None:
+            self.add(records=records)
+
+        else:
+            self._buffer.add(records=records)
 
         return self
 
@@ -294,7 +1116,11 @@ class Store(Record):
         if isinstance(records, Record):
             records = [records]
 
-        self.update(records=records, upsert=True)
+        if self._buffer is None:
+            self.update(records=records, upsert=True)
+
+        else:
+            self._buffer.update(records=records)
 
         return self
 
@@ -307,7 +1133,11 @@ class Store(Record):
         if isinstance(records, Record):
             records = [records]
 
-        self.remove(records=records)
+        if self._buffer is None:
+            self.remove(records=records)
+
+        else:
+            self._buffer.remove(records=records)
 
         return self
 
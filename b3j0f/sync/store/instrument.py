@@ -0,0 +1,290 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------------------------
+# The MIT License (MIT)
+#
+# Copyright (c) 2014 Jonathan Labéjof <jonathan.labejof@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# --------------------------------------------------------------------
+
+"""Store instrumentation definition module.
+
+Stores notify their observers with a measure per accessor call, and store
+registries with a measure per store call (without accessor). Without
+observers, the overhead is one test per call."""
+
+__all__ = ['Measure', 'Observer', 'Observable', 'HistogramCollector']
+
+from threading import Lock
+
+from timeit import default_timer as timer
+
+
+class Measure(object):
+    """Measure of a store or accessor call."""
+
+    __slots__ = (
+        'source', 'accessor', 'cmd', 'duration', 'count', 'nbytes', 'error',
+        'wait'
+    )
+
+    def __init__(
+            self, source, accessor, cmd, duration,
+            count=None, nbytes=None, error=None, wait=0.
+    ):
+        """
+        :param source: measured store.
+        :param Accessor accessor: called accessor if any.
+        :param str cmd: command name.
+        :param float duration: call duration in seconds.
+        :param int count: number of processed records if known.
+        :param int nbytes: number of exchanged bytes if known.
+        :param Exception error: call error if any.
+        :param float wait: part of the duration spent in throttling.
+        """
+
+        super(Measure, self).__init__()
+
+        self.source = source
+        self.accessor = accessor
+        self.cmd = cmd
+        self.duration = duration
+        self.count = count
+        self.nbytes = nbytes
+        self.error = error
+        self.wait = wait
+
+
+class Observer(object):
+    """Receive measures of observed stores and store registries."""
+
+    def notify(self, measure):
+        """Receive a measure.
+
+        Executed in the thread of the measured call, it must not raise.
+
+        :param Measure measure: measure to process."""
+
+        raise NotImplementedError()
+
+
+class Observable(object):
+    """Mixin of objects which notify measures to observers."""
+
+    __slots__ = ()
+
+    def __init__(self, observers=None, *args, **kwargs):
+        """
+        :param list observers: observers to notify.
+        """
+
+        super(Observable, self).__init__(*args, **kwargs)
+
+        self._observers = [] if observers is None else list(observers)
+
+    @property
+    def observers(self):
+        """Get observers.
+
+        :rtype: list"""
+
+        return self._observers
+
+    @observers.setter
+    def observers(self, value):
+        """Change of observers.
+
+        :param list value: new observers."""
+
+        self._observers = list(value)
+
+    def _notify(
+            self, cmd, start, source=None, accessor=None, count=None,
+            nbytes=None, error=None, wait=0.
+    ):
+        """Notify observers with a new measure.
+
+        :param str cmd: command name.
+        :param float start: call start timer value.
+        :param source: measured store. Default is self.
+        """
+
+        measure = Measure(
+            source=self if source is None else source, accessor=accessor,
+            cmd=cmd, duration=timer() - start, count=count, nbytes=nbytes,
+            error=error, wait=wait
+        )
+
+        for observer in self._observers:
+            observer.notify(measure)
+
+
+class _Histogram(object):
+    """Measure statistics of a (source, accessor, cmd)."""
+
+    def __init__(self, source, accessor, cmd, buckets):
+
+        super(_Histogram, self).__init__()
+
+        self.source = source
+        self.accessor = accessor
+        self.cmd = cmd
+        self.calls = 0
+        self.errors = 0
+        self.records = 0
+        self.nbytes = 0
+        self.total = 0.
+        self.throttled = 0
+        self.wait = 0.
+        self.min = None
+        self.max = None
+        self.buckets = [0] * buckets
+
+    def add(self, measure):
+        """Add a measure."""
+
+        duration = measure.duration
+
+        self.calls += 1
+        self.total += duration
+
+        if measure.error is not None:
+            self.errors += 1
+
+        if measure.count:
+            self.records += measure.count
+
+        if measure.nbytes:
+            self.nbytes += measure.nbytes
+
+        if measure.wait:
+            self.throttled += 1
+            self.wait += measure.wait
+
+        if self.min is None or duration < self.min:
+            self.min = duration
+
+        if self.max is None or duration > self.max:
+            self.max = duration
+
+        buckets = self.buckets
+        index = min(int(duration * 1e6).bit_length(), len(buckets) - 1)
+        buckets[index] += 1
+
+    def percentile(self, percent):
+        """Get the upper bound in seconds of a duration percentile."""
+
+        result = None
+
+        rank = self.calls * percent / 100.
+        total = 0
+
+        for index, count in enumerate(self.buckets):
+            total += count
+
+            if count and total >= rank:
+                result = min((1 << index) * 1e-6, self.max)
+                break
+
+        return result
+
+    def summary(self):
+        """Get a summary dictionary."""
+
+        return {
+            'source': self.source,
+            'accessor': self.accessor,
+            'cmd': self.cmd,
+            'calls': self.calls,
+            'errors': self.errors,
+            'records': self.records,
+            'bytes': self.nbytes,
+            'total': self.total,
+            'throttled': self.throttled,
+            'wait': self.wait,
+            'min': self.min,
+            'max': self.max,
+            'mean': self.total / self.calls if self.calls else None,
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'p99': self.percentile(99),
+            'buckets': list(self.buckets)
+        }
+
+
+class HistogramCollector(Observer):
+    """In-process collector of measure statistics by (source, accessor, cmd).
+
+    Durations are counted in power of two buckets of microseconds, so that
+    percentiles are upper bounds within a factor of two."""
+
+    BUCKETS = 32  #: number of histogram buckets.
+
+    def __init__(self, buckets=BUCKETS, *args, **kwargs):
+        """
+        :param int buckets: number of histogram buckets.
+        """
+
+        super(HistogramCollector, self).__init__(*args, **kwargs)
+
+        self.buckets = buckets
+
+        self._histograms = {}  # histograms by source, accessor and cmd ids.
+        self._lock = Lock()
+
+    def notify(self, measure):
+
+        key = (id(measure.source), id(measure.accessor), measure.cmd)
+
+        with self._lock:
+            histogram = self._histograms.get(key)
+
+            if histogram is None:
+                histogram = self._histograms[key] = _Histogram(
+                    source=measure.source, accessor=measure.accessor,
+                    cmd=measure.cmd, buckets=self.buckets
+                )
+
+            histogram.add(measure)
+
+    def stats(self, source=None, cmd=None):
+        """Get statistics.
+
+        :param source: source to select. Default all.
+        :param str cmd: command name to select. Default all.
+        :return: statistics with source, accessor, cmd, calls, errors, records,
+            bytes, total, throttled, wait, min, max, mean, p50, p90, p99 and
+            buckets.
+        :rtype: list"""
+
+        with self._lock:
+            histograms = list(self._histograms.values())
+
+        return [
+            histogram.summary() for histogram in histograms
+            if (source is None or histogram.source is source) and
+            (cmd is None or histogram.cmd == cmd)
+        ]
+
+    def reset(self):
+        """Remove all statistics."""
+
+        with self._lock:
+            self._histograms.clear()
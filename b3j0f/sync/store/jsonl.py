@@ -0,0 +1,594 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------------------------
+# The MIT License (MIT)
+#
+# Copyright (c) 2014 Jonathan Labéjof <jonathan.labejof@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# --------------------------------------------------------------------
+
+"""JSON Lines file store definition module.
+
+Records are appended to a file as JSON objects, one per line, with their type
+name. A removed record is a line with a removal flag. An index of the last
+line of each record identity is built at opening, and lines are decoded from
+a memory map of the file on demand.
+
+The file is compacted in a background thread when obsolete lines exceed a
+ratio of all lines."""
+
+__all__ = ['JSONLStore', 'JSONLAccessor']
+
+from json import dumps, loads
+
+from mmap import mmap, ACCESS_READ
+
+from collections import OrderedDict
+
+from threading import RLock, Thread
+
+import os
+
+from ..accessor.core import Accessor
+from ..record.batch import RecordBatch
+from ..record.codec import typename
+
+from .core import Store
+
+_replace = getattr(os, 'replace', os.rename)
+
+
+class JSONLAccessor(Accessor):
+    """Accessor of records stored by a JSONLStore.
+
+    Record types are given at instanciation."""
+
+    TYPEKEY = '_rtype'  #: line key of record type names.
+    REMOVEDKEY = '_removed'  #: line key of the removal flag.
+
+    def __init__(self, rtypes=None, *args, **kwargs):
+        """
+        :param list rtypes: accessed record types.
+        """
+
+        super(JSONLAccessor, self).__init__(*args, **kwargs)
+
+        self.__rtypes__ = list(rtypes or ())
+
+    def record2data(self, store, record, dirty=True):
+
+        result = record.raw(dirty=dirty)
+        result[JSONLAccessor.TYPEKEY] = typename(record.__class__)
+
+        return result
+
+    def data2record(self, store, rtype, data=None):
+
+        data = {} if data is None else dict(data)
+
+        data.pop(JSONLAccessor.TYPEKEY, None)
+
+        return rtype.lazy(data=data)
+
+    def add(self, store, records):
+
+        store._append(
+            lines=[
+                self._line(rtype=record.__class__, data=record.raw())
+                for record in records
+            ]
+        )
+
+        return records
+
+    def update(self, store, records, upsert=False):
+
+        if not upsert:
+            self._check(
+                store=store, identities=[record.identity for record in records]
+            )
+
+        return self.add(store=store, records=records)
+
+    def add_batch(self, store, batch):
+
+        rtype = batch.rtype
+
+        store._append(
+            lines=[self._line(rtype=rtype, data=row) for row in batch.rows()]
+        )
+
+        return len(batch)
+
+    def update_batch(self, store, batch, upsert=False):
+
+        if not upsert:
+            self._check(store=store, identities=batch.identities())
+
+        return self.add_batch(store=store, batch=batch)
+
+    def get(self, store, record, fields=None):
+
+        try:
+            result = store._load(store._index[record.identity], fields=fields)
+
+        except KeyError:
+            raise Accessor.Error('Record {0} does not exist'.format(record))
+
+        return result
+
+    def count(self, store, rtypes, data=None):
+
+        return len(self._find(store=store, rtypes=rtypes, data=data))
+
+    def estimate(self, store, rtypes):
+
+        return self.count(store=store, rtypes=rtypes)
+
+    def find(
+        self, store, rtypes, records=None, data=None,
+        limit=None, skip=None, sort=None, fields=None
+    ):
+
+        return [
+            rtype.lazy(data=rdata, fields=fields)
+            for rtype, rdata in self._find(
+                store=store, rtypes=rtypes, records=records, data=data,
+                limit=limit, skip=skip, sort=sort, decode=True
+            )
+        ]
+
+    def find_batch(
+            self, store, rtype, data=None, limit=None, skip=None, sort=None
+    ):
+
+        rows = [
+            rdata for _rtype, rdata in self._find(
+                store=store, rtypes=[rtype], data=data,
+                limit=limit, skip=skip, sort=sort, decode=True
+            )
+            if _rtype is rtype
+        ]
+
+        return RecordBatch.fromrows(rtype=rtype, rows=rows, stores=[store])
+
+    def remove(self, store, rtypes, records=None, data=None):
+
+        if records is None:
+            result = self.find(store=store, rtypes=rtypes, data=data)
+
+        else:
+            result = records
+
+        store._append(
+            lines=[
+                self._line(
+                    rtype=record.__class__, data=record.raw(), removed=True
+                )
+                for record in result
+            ]
+        )
+
+        return result
+
+    def _check(self, store, identities):
+        """Raise an error if a record identity is not indexed."""
+
+        index = store._index
+
+        for identity in identities:
+            if identity not in index:
+                raise Accessor.Error(
+                    'Record {0} does not exist'.format(identity)
+                )
+
+    def _line(self, rtype, data, removed=False):
+        """Encode record data in a line.
+
+        :param type rtype: record type.
+        :param dict data: record data.
+        :param bool removed: removal flag.
+        :rtype: bytes"""
+
+        data = dict(data)
+        data[JSONLAccessor.TYPEKEY] = typename(rtype)
+
+        if removed:
+            data[JSONLAccessor.REMOVEDKEY] = True
+
+        try:
+            result = dumps(data, separators=(',', ':'), sort_keys=True)
+
+        except TypeError as ex:
+            raise Accessor.Error(ex)
+
+        return (result + '\n').encode('utf-8')
+
+    def _find(
+            self, store, rtypes, records=None, data=None,
+            limit=None, skip=None, sort=None, decode=False
+    ):
+        """Get index entries which match input parameters.
+
+        Lines are decoded before skip and limit only if data or sort are
+        given.
+
+        :param bool decode: if True, get (record type, record data) instead
+            of index entries.
+        :rtype: list"""
+
+        rtypes = tuple(rtypes)
+        index = store._index
+
+        if records is None:
+            result = [
+                entry for identity, entry in index.items()
+                if issubclass(identity[0], rtypes)
+            ]
+
+        else:
+            result = []
+
+            for record in records:
+                entry = index.get(record.identity)
+
+                if entry is not None and isinstance(record, rtypes):
+                    result.append(entry)
+
+        decoded = data or sort
+
+        if decoded:
+            names = store._rtypes()
+            result = [store._loaddata(entry, names) for entry in result]
+
+        if data:
+            result = [
+                item for item in result
+                if all(item[1].get(key) == data[key] for key in data)
+            ]
+
+        if sort:
+            for name in reversed(sort):
+                result.sort(key=lambda item: item[1].get(name))
+
+        if skip is not None:
+            result = result[skip:]
+
+        if limit is not None:
+            result = result[:limit]
+
+        if decode and not decoded:
+            names = store._rtypes()
+            result = [store._loaddata(entry, names) for entry in result]
+
+        return result
+
+
+class JSONLStore(Store):
+    """Store records in a JSON Lines file.
+
+    Store calls and compactions are serialized with a lock. Lines of unknown
+    record types are kept as is."""
+
+    DEFAULT_RATIO = 0.5  #: default ratio of obsolete lines before compaction.
+    DEFAULT_MINLINES = 1000  #: default minimal number of lines to compact.
+
+    def __init__(
+            self, path, rtypes=None, accessors=None,
+            ratio=DEFAULT_RATIO, minlines=DEFAULT_MINLINES, *args, **kwargs
+    ):
+        """
+        :param str path: file path. Created if it does not exist.
+        :param list rtypes: record types. A JSONLAccessor is created for them
+            if accessors are not given.
+        :param list accessors: JSONLAccessor instances.
+        :param float ratio: ratio of obsolete lines which triggers a
+            compaction. None disables automatic compactions.
+        :param int minlines: minimal number of lines before compaction.
+        """
+
+        if accessors is None:
+            accessors = [JSONLAccessor(rtypes=rtypes)]
+
+        super(JSONLStore, self).__init__(accessors=accessors, *args, **kwargs)
+
+        self._path = path
+        self._ratio = ratio
+        self._minlines = minlines
+
+        self._lock = RLock()
+        self._index = OrderedDict()  # (offset, size) by record identity
+        self._foreign = []  # (offset, size) of lines of unknown types
+        self._lines = 0  # number of lines
+        self._size = 0  # file size
+        self._file = None
+        self._map = None
+        self._compactor = None
+
+        with self._lock:
+            self._open()
+
+    @property
+    def path(self):
+        """Get the file path.
+
+        :rtype: str"""
+
+        return self._path
+
+    def _execute(self, cmd, **kwargs):
+
+        with self._lock:
+            result = super(JSONLStore, self)._execute(cmd=cmd, **kwargs)
+
+        return result
+
+    def _executebatch(self, cmd, rtype, params):
+
+        with self._lock:
+            result = super(JSONLStore, self)._executebatch(
+                cmd=cmd, rtype=rtype, params=params
+            )
+
+        return result
+
+    def open(self):
+        """Open the file again if it is closed."""
+
+        with self._lock:
+            if self._file is None:
+                self._index.clear()
+                del self._foreign[:]
+                self._lines = 0
+                self._open()
+
+        return super(JSONLStore, self).open()
+
+    def close(self):
+        """Wait for the running compaction and close the file."""
+
+        compactor = self._compactor
+
+        if compactor is not None:
+            compactor.join()
+
+        with self._lock:
+            self._close()
+
+        super(JSONLStore, self).close()
+
+    def compact(self):
+        """Rewrite the file with last lines of records.
+
+        Other store calls wait for the end of the compaction."""
+
+        with self._lock:
+            path = self._path
+            tmppath = '{0}.compact'.format(path)
+
+            index = OrderedDict()
+            foreign = []
+
+            with open(tmppath, 'wb') as tmpfile:
+                offset = 0
+
+                for entry in self._foreign:
+                    tmpfile.write(self._read(entry))
+                    foreign.append((offset, entry[1]))
+                    offset += entry[1]
+
+                for identity, entry in self._index.items():
+                    tmpfile.write(self._read(entry))
+                    index[identity] = offset, entry[1]
+                    offset += entry[1]
+
+                tmpfile.flush()
+                os.fsync(tmpfile.fileno())
+
+            self._close()
+
+            _replace(tmppath, path)
+
+            self._index = index
+            self._foreign = foreign
+            self._lines = len(index) + len(foreign)
+
+            self._file = open(path, 'a+b')
+            self._size = offset
+
+    def _open(self):
+        """Open the file and index its lines.
+
+        An incomplete last line left by an interrupted write is truncated, so
+        that next lines are not appended to it."""
+
+        self._file = open(self._path, 'a+b')
+        self._file.seek(0, os.SEEK_END)
+        self._size = self._file.tell()
+
+        if self._size:
+            mapped = self._remap()
+            find = mapped.find
+            rtypes = self._rtypes()
+
+            start = 0
+
+            while True:
+                stop = find(b'\n', start)
+
+                if stop < 0:  # end of file or incomplete last line
+                    break
+
+                stop += 1
+                self._indexline(
+                    line=mapped[start: stop], offset=start, rtypes=rtypes
+                )
+                start = stop
+
+            if start < self._size:
+                self._map.close()  # mapped pages beyond the new size
+                self._map = None
+
+                self._file.truncate(start)
+                self._size = start
+
+    def _close(self):
+        """Close the file and its memory map."""
+
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _remap(self):
+        """Map the whole file in memory.
+
+        :rtype: mmap"""
+
+        if self._map is not None:
+            self._map.close()
+
+        self._map = result = mmap(self._file.fileno(), 0, access=ACCESS_READ)
+
+        return result
+
+    def _read(self, entry):
+        """Read a line.
+
+        :param tuple entry: line offset and size.
+        :rtype: bytes"""
+
+        offset, size = entry
+        end = offset + size
+
+        mapped = self._map
+
+        if mapped is None or len(mapped) < end:  # the file grew
+            mapped = self._remap()
+
+        return mapped[offset: end]
+
+    def _rtypes(self):
+        """Get record types by type name.
+
+        :rtype: dict"""
+
+        return dict((typename(rtype), rtype) for rtype in self.rtypes)
+
+    def _indexline(self, line, offset, rtypes):
+        """Index a line."""
+
+        data = loads(line.decode('utf-8'))
+
+        rtype = rtypes.get(data.pop(JSONLAccessor.TYPEKEY, None))
+
+        if rtype is None:
+            self._foreign.append((offset, len(line)))
+
+        else:
+            removed = data.pop(JSONLAccessor.REMOVEDKEY, False)
+            identity = self._identity(rtype, data)
+
+            if removed:
+                self._index.pop(identity, None)
+
+            else:
+                self._index[identity] = offset, len(line)
+
+        self._lines += 1
+
+    @staticmethod
+    def _identity(rtype, data):
+        """Get the identity of a record from its type and data."""
+
+        identifiers = rtype.getidentifiers()
+
+        if identifiers:
+            result = (rtype, tuple(data.get(name) for name in identifiers))
+
+        else:
+            result = rtype(**data).identity
+
+        return result
+
+    def _append(self, lines):
+        """Append lines to the file and index them.
+
+        :param list lines: encoded lines."""
+
+        self._file.write(b''.join(lines))
+        self._file.flush()
+
+        offset = self._size
+        rtypes = self._rtypes()
+
+        for line in lines:
+            self._indexline(line=line, offset=offset, rtypes=rtypes)
+            offset += len(line)
+
+        self._size = offset
+
+        self._compactable()
+
+    def _loaddata(self, entry, rtypes=None):
+        """Decode the line of an index entry.
+
+        :param tuple entry: line offset and size.
+        :param dict rtypes: record types by type name.
+        :return: record type and record data.
+        :rtype: tuple"""
+
+        data = loads(self._read(entry).decode('utf-8'))
+
+        if rtypes is None:
+            rtypes = self._rtypes()
+
+        return rtypes[data.pop(JSONLAccessor.TYPEKEY)], data
+
+    def _load(self, entry, rtypes=None, fields=None):
+        """Decode the record of an index entry.
+
+        :param tuple entry: line offset and size.
+        :param dict rtypes: record types by type name.
+        :param list fields: names of fields to load. Default is all fields.
+        :rtype: Record"""
+
+        rtype, data = self._loaddata(entry, rtypes)
+
+        return rtype.lazy(data=data, fields=fields)
+
+    def _compactable(self):
+        """Start a compaction thread if obsolete lines exceed the ratio."""
+
+        ratio = self._ratio
+        lines = self._lines
+
+        if ratio is not None and lines >= self._minlines:
+            obsolete = lines - len(self._index) - len(self._foreign)
+
+            if obsolete > ratio * lines and (
+                    self._compactor is None or not self._compactor.is_alive()
+            ):
+                self._compactor = Thread(target=self.compact)
+                self._compactor.daemon = True
+                self._compactor.start()
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------------------------
+# The MIT License (MIT)
+#
+# Copyright (c) 2014 Jonathan Labéjof <jonathan.labejof@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# --------------------------------------------------------------------
+
+"""Adaptive synchronization page size definition module."""
+
+__all__ = ['PageSizer']
+
+
+class PageSizer(object):
+    """Adapt synchronization page sizes per source.
+
+    After each page, the size of the next page of the same source is computed
+    in order to spend about ``pagetime`` seconds per page (reading and
+    writing), and to keep a page under ``maxbytes`` bytes if accessors report
+    exchanged bytes. A size can not change by more than ``factor`` times per
+    page, and stays within ``mincount`` and ``maxcount``.
+
+    Sizes are kept between synchronizations."""
+
+    DEFAULT_COUNT = 5000  #: default first page size.
+    DEFAULT_MINCOUNT = 100  #: default minimal page size.
+    DEFAULT_MAXCOUNT = 100000  #: default maximal page size.
+    DEFAULT_PAGETIME = 1.  #: default target page time in seconds.
+    DEFAULT_FACTOR = 2.  #: default maximal change factor per page.
+
+    def __init__(
+            self, count=DEFAULT_COUNT, mincount=DEFAULT_MINCOUNT,
+            maxcount=DEFAULT_MAXCOUNT, pagetime=DEFAULT_PAGETIME,
+            maxbytes=None, factor=DEFAULT_FACTOR, *args, **kwargs
+    ):
+        """
+        :param int count: first page size.
+        :param int mincount: minimal page size.
+        :param int maxcount: maximal page size.
+        :param float pagetime: target page time in seconds.
+        :param int maxbytes: maximal page size in bytes. Default is None.
+        :param float factor: maximal change factor per page.
+        """
+
+        super(PageSizer, self).__init__(*args, **kwargs)
+
+        self.first = count
+        self.mincount = mincount
+        self.maxcount = maxcount
+        self.pagetime = pagetime
+        self.maxbytes = maxbytes
+        self.factor = factor
+
+        self._counts = {}  # page sizes by source id.
+
+    def count(self, source):
+        """Get the next page size of a source.
+
+        :param Store source: source to read.
+        :rtype: int"""
+
+        return self._counts.get(id(source), self.first)
+
+    def observe(self, source, count, records, duration, nbytes=None):
+        """Adapt the page size of a source from a synchronized page.
+
+        :param Store source: read source.
+        :param int count: requested page size.
+        :param int records: number of synchronized records.
+        :param float duration: page synchronization duration in seconds.
+        :param int nbytes: page size in bytes if known.
+        :return: next page size.
+        :rtype: int"""
+
+        result = count
+
+        if records:
+            newcount = count * self.factor
+
+            if duration > 0:
+                newcount = min(newcount, self.pagetime * records / duration)
+
+            if nbytes and self.maxbytes is not None:
+                newcount = min(newcount, self.maxbytes * records / nbytes)
+
+            newcount = max(newcount, count / self.factor)
+
+            result = int(min(max(newcount, self.mincount), self.maxcount))
+
+        self._counts[id(source)] = result
+
+        return result
+
+    def reset(self):
+        """Forget page sizes of sources."""
+
+        self._counts.clear()
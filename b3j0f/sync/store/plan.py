@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------------------------
+# The MIT License (MIT)
+#
+# Copyright (c) 2014 Jonathan Labéjof <jonathan.labejof@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# --------------------------------------------------------------------
+
+"""Synchronization plan definition module."""
+
+__all__ = ['SyncPlan', 'TargetPlan']
+
+from collections import OrderedDict
+
+
+class TargetPlan(object):
+    """Records to write in and to remove from a target.
+
+    Records are indexed by identity."""
+
+    def __init__(self, target, *args, **kwargs):
+        """
+        :param Store target: target to write.
+        """
+
+        super(TargetPlan, self).__init__(*args, **kwargs)
+
+        self.target = target
+        self.adds = OrderedDict()  #: records missing from the target.
+        self.updates = OrderedDict()  #: records different in the target.
+        self.deletes = OrderedDict()  #: records to remove from the target.
+
+    def __len__(self):
+
+        return len(self.adds) + len(self.updates) + len(self.deletes)
+
+    def _diff(self, identity, record, version):
+        """Plan the writing of a record.
+
+        :param identity: record identity.
+        :param Record record: record to synchronize.
+        :param Record version: record version in the target if exists.
+        """
+
+        self.adds.pop(identity, None)
+        self.updates.pop(identity, None)
+
+        if version is None:
+            self.adds[identity] = record
+
+        elif version != record:
+            self.updates[identity] = record
+
+
+class SyncPlan(object):
+    """Operations which a synchronization would execute.
+
+    A plan is computed by ``StoreRegistry.synchronize(plan=True)`` and
+    applied later without reading sources again."""
+
+    def __init__(self, registry, count, report, *args, **kwargs):
+        """
+        :param StoreRegistry registry: planning registry.
+        :param count: page size, or PageSizer.
+        :param SyncReport report: planning report.
+        """
+
+        super(SyncPlan, self).__init__(*args, **kwargs)
+
+        self.registry = registry
+        self.count = count
+        self.report = report
+        self.targets = []  #: target plans.
+
+    def __len__(self):
+
+        return sum(len(target) for target in self.targets)
+
+    def target(self, target):
+        """Get the plan of a target.
+
+        :param Store target: target.
+        :rtype: TargetPlan"""
+
+        for result in self.targets:
+            if result.target is target:
+                break
+
+        else:
+            result = TargetPlan(target=target)
+            self.targets.append(result)
+
+        return result
+
+    @property
+    def adds(self):
+        """Get the number of records to add."""
+
+        return sum(len(target.adds) for target in self.targets)
+
+    @property
+    def updates(self):
+        """Get the number of records to update."""
+
+        return sum(len(target.updates) for target in self.targets)
+
+    @property
+    def deletes(self):
+        """Get the number of records to remove."""
+
+        return sum(len(target.deletes) for target in self.targets)
+
+    def apply(self):
+        """Execute planned operations.
+
+        :return: synchronization report.
+        :rtype: SyncReport
+        :raises: StoreRegistry.Error in case of error."""
+
+        return self.registry._apply(plan=self)
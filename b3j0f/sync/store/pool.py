@@ -0,0 +1,234 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------------------------
+# The MIT License (MIT)
+#
+# Copyright (c) 2014 Jonathan Labéjof <jonathan.labejof@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# --------------------------------------------------------------------
+
+"""Bounded pool of store connections."""
+
+__all__ = ['ConnectionPool']
+
+from threading import Condition
+
+from time import time
+
+
+class ConnectionPool(object):
+    """Thread-safe pool of at most ``size`` connections.
+
+    Idle connections are reused in last released first order. A connection
+    is created only if no idle connection is available and less than size
+    connections exist, otherwise acquirers wait for a released connection.
+    """
+
+    DEFAULT_SIZE = 8  #: default maximal number of connections.
+
+    class Error(Exception):
+        """Handle pool errors such as acquisition timeouts."""
+
+    def __init__(
+            self, connect, disconnect=None, check=None, size=DEFAULT_SIZE,
+            timeout=None, *args, **kwargs
+    ):
+        """
+        :param connect: function without parameters which opens a connection.
+        :param disconnect: function(connection) which closes a connection.
+        :param check: function(connection) which returns False if an idle
+            connection is broken and must be discarded before reuse.
+        :param int size: maximal number of connections.
+        :param float timeout: default maximal time in seconds to wait for a
+            connection. Default is None (no limit).
+        """
+
+        super(ConnectionPool, self).__init__(*args, **kwargs)
+
+        self.size = size
+        self.timeout = timeout
+
+        self._connect = connect
+        self._disconnect = disconnect
+        self._check = check
+
+        self._idle = []  # idle connections
+        self._count = 0  # number of open connections
+        self._closed = False
+        self._condition = Condition()
+
+        self.created = 0  #: number of opened connections.
+        self.reused = 0  #: number of acquisitions of idle connections.
+        self.discarded = 0  #: number of broken connections.
+        self.waits = 0  #: number of acquisitions which waited.
+        self.waittime = 0.  #: total wait time in seconds.
+
+    def __enter__(self):
+
+        return self
+
+    def __exit__(self, *args):
+
+        self.close()
+
+    @property
+    def closed(self):
+        """True if this pool is closed."""
+
+        return self._closed
+
+    def acquire(self, timeout=None):
+        """Borrow a connection.
+
+        :param float timeout: maximal time to wait. Default is self.timeout.
+        :return: connection to release once used.
+        :raises: ConnectionPool.Error if the pool is closed or on timeout."""
+
+        result = None
+        create = False
+
+        if timeout is None:
+            timeout = self.timeout
+
+        condition = self._condition
+
+        with condition:
+            start = None
+
+            while result is None and not create:
+                if self._closed:
+                    raise ConnectionPool.Error('Pool is closed.')
+
+                if self._idle:
+                    result = self._idle.pop()
+
+                elif self._count < self.size:
+                    self._count += 1
+                    create = True
+
+                else:
+                    now = time()
+
+                    if start is None:
+                        start = now
+                        self.waits += 1
+
+                    elif timeout is not None and now - start >= timeout:
+                        self.waittime += now - start
+                        raise ConnectionPool.Error(
+                            'No connection available after {0}s.'.format(
+                                timeout
+                            )
+                        )
+
+                    condition.wait(
+                        None if timeout is None else timeout - (now - start)
+                    )
+
+            if start is not None:
+                self.waittime += time() - start
+
+        if create:
+            result = self._create()
+
+        elif self._check is not None and not self._check(result):
+            self._close(result, discarded=True)
+            result = self.acquire(timeout=timeout)
+
+        else:
+            with condition:
+                self.reused += 1
+
+        return result
+
+    def release(self, connection, discard=False):
+        """Give back a borrowed connection.
+
+        :param connection: connection to release.
+        :param bool discard: if True, close the connection instead of reusing
+            it, such as after a connection error."""
+
+        if discard or self._closed:
+            self._close(connection, discarded=discard)
+
+        else:
+            with self._condition:
+                self._idle.append(connection)
+                self._condition.notify()
+
+    def close(self):
+        """Close idle connections and connections once released."""
+
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._condition.notify_all()
+
+        for connection in idle:
+            self._close(connection)
+
+    @property
+    def stats(self):
+        """Get pool health statistics.
+
+        :return: connection counters.
+        :rtype: dict"""
+
+        with self._condition:
+            result = {
+                'size': self.size, 'open': self._count,
+                'idle': len(self._idle), 'busy': self._count - len(self._idle),
+                'created': self.created, 'reused': self.reused,
+                'discarded': self.discarded, 'waits': self.waits,
+                'waittime': self.waittime
+            }
+
+        return result
+
+    def _create(self):
+        """Open a new connection."""
+
+        try:
+            result = self._connect()
+
+        except Exception:
+            with self._condition:
+                self._count -= 1
+                self._condition.notify()
+            raise
+
+        with self._condition:
+            self.created += 1
+
+        return result
+
+    def _close(self, connection, discarded=False):
+        """Close a connection and free its place in the pool."""
+
+        with self._condition:
+            self._count -= 1
+
+            if discarded:
+                self.discarded += 1
+
+            self._condition.notify()
+
+        if self._disconnect is not None:
+            self._disconnect(connection)
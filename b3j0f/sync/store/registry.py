@@ -28,49 +28,125 @@
 
 __all__ = ['StoreRegistry']
 
+from collections import OrderedDict
+
 from ..record.core import Record
 
 from .core import Store
+from .instrument import Observable
+from .report import SyncReport
+from .pagesize import PageSizer
+from .plan import SyncPlan
+from .spill import SpillBuffer
 
 from six import reraise
 
+from sys import exc_info
+
+from threading import Thread
+
+from time import time
+
+from timeit import default_timer as timer
 
-class StoreRegistry(Record):
+
+class StoreRegistry(Observable, Record):
     """Manage stores.
 
     This class is used for synchronizing stores or for executing methods of CRUD
     on several stores.
+
+    Observers are notified with a measure per store call.
     """
 
     class Error(Exception):
         """handle synchronizer errors."""
 
+        results = None  #: results by store of partially failed writes.
+        failures = None  #: Store.Error by store of partially failed writes.
+
+    class Results(dict):
+        """Store function results by store.
+
+        Stores which fail to read are not raised, and are given with their
+        errors in failures."""
+
+        def __init__(self, *args, **kwargs):
+
+            super(StoreRegistry.Results, self).__init__(*args, **kwargs)
+
+            self.failures = {}  #: Store.Error by failed store.
+
+    #: write functions of which store failures are raised.
+    _WRITEFUNCS = ('add', 'update', 'remove')
+
     DEFAULT_COUNT = 5000  #: default synchronization count per step.
 
     def __init__(self, stores=None, count=DEFAULT_COUNT, *args, **kwargs):
         """
         :param list stores: stores to synchronize.
         :param int count: number of data to sync per iteration.
+        :param list observers: observers of store calls.
         """
 
         super(StoreRegistry, self).__init__(
             stores=stores, count=count, *args, **kwargs
         )
 
+        # (source, target, time) of last replayed tombstones by store ids
+        self._watermarks = {}
+        # (target, identities) of last removals replayed by target id
+        self._replayed = {}
+
     def synchronize(
             self,
             rtypes=None, data=None, sources=None, targets=None, count=None,
-            override=False
+            override=False, progress=None, policy=None, plan=False,
+            spill=None
     ):
         """Synchronize the source store with target stores.
 
+        Without conflict policy, records of sources are upserted into targets
+        source after source. With a conflict policy, all stores are read in
+        one merged pass, page per page, the policy chooses one version per
+        record identity and only targets with a different version are
+        written.
+
+        Records logged as removed by sources (see Store tombstones) are
+        removed from targets in bulk before, and are not upserted. Each
+        (source, target) pair replays only tombstones logged since its last
+        synchronization.
+
+        With a spill budget, each target is written by its own thread from a
+        SpillBuffer fed by the source reading, so that slow targets do not
+        block fast ones. Pages beyond the budget are spilled to disk.
+
+        With the plan flag, targets are not written. Records of each source
+        page are compared to target ones by identity and content, and
+        operations to execute are returned in a plan.
+
         :param list rtypes: record types to synchronize.
         :param dict data: matching data content to retrieve from the sources.
         :param list sources: stores from where get data. Default self stores.
         :param list targets: stores from where put data. Default self stores.
-        :param int count: number of data to synchronize iteratively.
+        :param count: number of data to synchronize iteratively, or a
+            PageSizer for adapting page sizes per source.
+        :type count: int or PageSizer
         :param bool override: if False, update only data which does not exist
-            in targets."""
+            in targets. Ignored with a conflict policy.
+        :param progress: callable executed after each page with report,
+            source and records keyword arguments.
+        :param ConflictPolicy policy: conflict resolution policy.
+        :param bool plan: if True (default False), return the plan of the
+            synchronization without writing targets.
+        :param int spill: maximal number of records in memory per source
+            when writing targets in parallel. Default is None (sequential
+            writing). Ignored with a conflict policy or a plan.
+        :return: synchronization report, or plan if plan is True. The plan
+            report is the planning report.
+        :rtype: SyncReport or SyncPlan
+        :raises: StoreRegistry.Error in case of error. The error report
+            attribute is the synchronization report."""
 
         if sources is None:
             sources = self.stores
@@ -88,31 +164,624 @@ class StoreRegistry(Record):
         if count is None:
             count = self.count
 
+        result = report = SyncReport()
+
+        if plan:
+            result = plan = SyncPlan(registry=self, count=count, report=report)
+
+        else:
+            plan = None
+
+        stores = list(sources)
+        stores += [
+            target for target in targets
+            if all(target is not source for source in sources)
+        ]
+
+        for store in stores:
+            store.observers.append(report)
+
+        try:
+            removed = self._syncremoved(
+                sources=sources, targets=targets, report=report, plan=plan
+            )
+
+            if policy is None:
+                for source in sources:
+                    if spill is None or plan is not None:
+                        self._syncsource(
+                            source=source, targets=targets, rtypes=rtypes,
+                            data=data, count=count, override=override,
+                            report=report, progress=progress,
+                            removed=removed, plan=plan
+                        )
+
+                    else:
+                        self._syncspill(
+                            source=source, targets=targets, rtypes=rtypes,
+                            data=data, count=count, override=override,
+                            report=report, progress=progress,
+                            removed=removed, spill=spill
+                        )
+
+            else:
+                self._syncmerge(
+                    sources=sources, targets=targets, stores=stores,
+                    rtypes=rtypes, data=data, count=count, policy=policy,
+                    report=report, progress=progress, removed=removed,
+                    plan=plan
+                )
+
+        finally:
+            for store in stores:
+                store.observers.remove(report)
+
+            report._stop()
+
+        return result
+
+    def _apply(self, plan):
+        """Execute operations of a synchronization plan.
+
+        :param SyncPlan plan: plan to apply.
+        :rtype: SyncReport"""
+
+        report = SyncReport()
+
+        count = plan.count
+        sizer = count if isinstance(count, PageSizer) else None
+
+        stores = [targetplan.target for targetplan in plan.targets]
+
+        for store in stores:
+            store.observers.append(report)
+
+        try:
+            for targetplan in plan.targets:
+                target = targetplan.target
+
+                if targetplan.deletes:
+                    self._remove(
+                        target=target,
+                        records=list(targetplan.deletes.values()),
+                        report=report
+                    )
+
+                records = list(targetplan.adds.values())
+                records += targetplan.updates.values()
+
+                if sizer is not None:
+                    count = sizer.count(target)
+
+                for skip in range(0, len(records), count):
+                    page = records[skip: skip + count]
+
+                    self._write(
+                        source=None, target=target, records=page,
+                        written=page, report=report
+                    )
+
+        finally:
+            for store in stores:
+                store.observers.remove(report)
+
+            report._stop()
+
+        return report
+
+    def _read(self, source, rtypes, data, count, report):
+        """Read records of a source page per page.
+
+        The page size is observed once the page is processed by the caller.
+
+        :return: record pages.
+        :rtype: generator"""
+
+        rtypes = [
+            rtype for rtype in rtypes if source._accreg.get(rtype) is not None
+        ]
+
+        sourcereport = report.source(source)
+
+        if rtypes and data is None:  # cheap total for progress callbacks
+            try:
+                sourcereport.total = source.estimate_count(
+                    rtypes=rtypes, count=False
+                )
+
+            except Store.Error:
+                pass
+
+        sizer = count if isinstance(count, PageSizer) else None
+
+        skip = 0
+
+        while rtypes:
+            if sizer is not None:
+                count = sizer.count(source)
+
+            report._current = sourcereport
+
+            pagestart = start = timer()
+            nbytes = sourcereport.nbytes
+
+            records = self._call(
+                store=source, func='find',
+                rtypes=rtypes, data=data, skip=skip, limit=count
+            )
+
+            if not records:
+                break
+
+            sourcereport._page(
+                records=records, count=count, duration=timer() - start
+            )
+
+            yield records
+
+            if sizer is not None:
+                sizer.observe(
+                    source=source, count=count, records=len(records),
+                    duration=timer() - pagestart,
+                    nbytes=sourcereport.nbytes - nbytes
+                )
+
+            skip += count
+
+    def _write(self, source, target, records, written, report):
+        """Update records in a target and report it.
+
+        :param Store source: source of records. None if records come from
+            several sources.
+        :param Store target: target where write records.
+        :param list records: synchronized records.
+        :param list written: records to write among records. If None, records
+            which are different in the target are written.
+        :raises: StoreRegistry.Error in case of error."""
+
+        targetreport = report._current = report.target(
+            source=source, target=target
+        )
+
+        start = timer()
+
+        try:
+            if written is None:
+                written = self._call(
+                    store=target, func='update',
+                    records=records, upsert=True, override=False
+                )
+
+            elif written:
+                written = self._call(
+                    store=target, func='update',
+                    records=written, upsert=True, override=True
+                )
+
+        except Store.Error as ex:
+            failed = [record for record, _ in ex.failures]
+
+            targetreport._page(
+                records=records, written=ex.result or [],
+                failed=failed or written or records, duration=timer() - start
+            )
+
+            error = StoreRegistry.Error(ex)
+            error.report = report
+
+            reraise(StoreRegistry.Error, error)
+
+        else:
+            targetreport._page(
+                records=records, written=written, duration=timer() - start
+            )
+
+    def _syncremoved(self, sources, targets, report, plan):
+        """Remove records logged as removed by sources from targets.
+
+        Each target is called in bulk, and record per record if the bulk call
+        fails, records absent from a target being ignored. With a plan, only
+        records found in targets are planned for removal.
+
+        Only tombstones logged since the last synchronization of a (source,
+        target) pair are replayed, but all tombstones prevent upserts.
+        Tombstones logged by replayed removals are not replayed again.
+
+        :return: removed records by identity.
+        :rtype: dict"""
+
+        result = OrderedDict()  # (source, record) by identity
+
+        now = time()  # next watermark, before reading tombstones
+        sources = [
+            source for source in sources if source.tombstones is not None
+        ]
+
         for source in sources:
+            for record in source.tombstones.records():
+                result.setdefault(record.identity, (source, record))
+
+        if result:
+            replayed = {}  # removals replayed in this pass by target id
+
+            for target in targets:
+                pairs = [source for source in sources if source is not target]
+                records = OrderedDict()  # records to remove by identity
+
+                for source in pairs:
+                    replicas = self._replicas(source)
+
+                    for record in source.tombstones.records(
+                            since=self._watermark(source, target)
+                    ):
+                        identity = record.identity
+
+                        if identity not in replicas and \
+                                target._accreg.get(record.__class__) \
+                                is not None:
+                            records.setdefault(identity, record)
+
+                if plan is None:
+                    if records:
+                        self._remove(
+                            target=target, records=list(records.values()),
+                            report=report
+                        )
+
+                    replayed[id(target)] = (target, set(records))
+
+                    for source in pairs:
+                        self._watermarks[(id(source), id(target))] = (
+                            source, target, now
+                        )
+
+                elif records:
+                    records = list(records.values())
+
+                    report._current = report.target(source=None, target=target)
+
+                    deletes = plan.target(target).deletes
+
+                    for record in self._call(
+                            store=target, func='find', records=records
+                    ):
+                        identity = record.identity
+
+                        if identity in result:
+                            deletes[identity] = record
+
+            self._replayed.update(replayed)
+
+        return result
+
+    def _watermark(self, source, target):
+        """Get the time of the last tombstone replay of a source in a
+        target.
+
+        :return: replay time, or None if tombstones were never replayed.
+        :rtype: float"""
+
+        watermark = self._watermarks.get((id(source), id(target)))
 
-            skip = 0
+        # store ids can be reused by new stores
+        return None if watermark is None or watermark[0] is not source or \
+            watermark[1] is not target else watermark[2]
 
+    def _replicas(self, store):
+        """Get identities of removals replayed in a store by the last
+        synchronization.
+
+        :rtype: set"""
+
+        replayed = self._replayed.get(id(store))
+
+        return set() if replayed is None or replayed[0] is not store \
+            else replayed[1]
+
+    def _remove(self, target, records, report):
+        """Remove records from a target and report it."""
+
+        targetreport = report._current = report.target(
+            source=None, target=target
+        )
+
+        start = timer()
+
+        try:
+            removed = self._call(store=target, func='remove', records=records)
+
+        except Store.Error:
+            removed = []
+
+            for record in records:
+                try:
+                    removed += self._call(
+                        store=target, func='remove', records=[record]
+                    )
+
+                except Store.Error:  # record absent from the target
+                    pass
+
+        targetreport._remove(records=removed, duration=timer() - start)
+
+    def _syncsource(
+            self, source, targets, rtypes, data, count, override, report,
+            progress, removed, plan
+    ):
+        """Synchronize records of a source with targets page per page."""
+
+        for records in self._read(
+                source=source, rtypes=rtypes, data=data, count=count,
+                report=report
+        ):
+            if removed:
+                records = [
+                    record for record in records
+                    if record.identity not in removed
+                ]
+
+            for target in targets:
+                if target is source or not records:
+                    continue
+
+                if plan is None:
+                    self._write(
+                        source=source, target=target, records=records,
+                        written=records if override else None, report=report
+                    )
+
+                else:
+                    self._plan(
+                        source=source, target=target, records=records,
+                        plan=plan, report=report
+                    )
+
+            if progress is not None:
+                progress(report=report, source=source, records=records)
+
+    def _syncspill(
+            self, source, targets, rtypes, data, count, override, report,
+            progress, removed, spill
+    ):
+        """Synchronize records of a source with targets written in parallel.
+        """
+
+        targets = [target for target in targets if target is not source]
+
+        for target in targets:  # create reports before threads
+            report.target(source=source, target=target)
+
+        buffer = SpillBuffer(consumers=len(targets), maxrecords=spill)
+        errors = []
+
+        threads = [
+            Thread(
+                target=self._spillwriter,
+                kwargs={
+                    'buffer': buffer, 'consumer': index, 'source': source,
+                    'target': target, 'override': override, 'report': report,
+                    'errors': errors
+                }
+            )
+            for index, target in enumerate(targets)
+        ]
+
+        for thread in threads:
+            thread.daemon = True
+            thread.start()
+
+        try:
+            for records in self._read(
+                    source=source, rtypes=rtypes, data=data, count=count,
+                    report=report
+            ):
+                if errors:
+                    break
+
+                if removed:
+                    records = [
+                        record for record in records
+                        if record.identity not in removed
+                    ]
+
+                if records and targets:
+                    buffer.put(records)
+
+                if progress is not None:
+                    progress(report=report, source=source, records=records)
+
+        finally:
+            buffer.close()
+
+            for thread in threads:
+                thread.join()
+
+            buffer.dispose()
+
+        if errors:  # raise the first writer error such as sequentially
+            reraise(*errors[0])
+
+    def _spillwriter(
+            self, buffer, consumer, source, target, override, report, errors
+    ):
+        """Write pages of a spill buffer in a target until it is closed.
+
+        Errors are appended to errors as exc_info tuples."""
+
+        try:
             while True:
-                records = source.find(
-                    rtypes=rtypes, data=data, skip=skip, limit=count
+                records = buffer.get(consumer)
+
+                if records is None:
+                    break
+
+                self._write(
+                    source=source, target=target, records=records,
+                    written=records if override else None, report=report
                 )
 
-                if records:
-                    for target in targets:
-                        try:
-                            target.update(
-                                records=records, upsert=True, override=override
-                            )
+        except Exception:
+            errors.append(exc_info())
+
+        finally:
+            buffer.release(consumer)
+
+    def _syncmerge(
+            self, sources, targets, stores, rtypes, data, count, policy,
+            report, progress, removed, plan
+    ):
+        """Synchronize stores in one merged pass with a conflict policy.
+
+        Sources are read page per page. Versions of page records are found by
+        identity in all other stores, resolved and written before reading the
+        next page, so that memory is bounded by the page size. A record read
+        in a source is skipped if an earlier source has a version of it,
+        since it was merged while reading that source.
+
+        :param list stores: sources, then targets which are not sources."""
+
+        sizer = count if isinstance(count, PageSizer) else None
+
+        for index, store in enumerate(sources):
+            for page in self._read(
+                    source=store, rtypes=rtypes, data=data, count=count,
+                    report=report
+            ):
+                versions = self._versions(
+                    store=store, stores=stores, records=page, data=data
+                )
+
+                records = []  # resolved records
+                divergents = [set() for _ in targets]  # record ids by target
+
+                for record in page:
+                    identity = record.identity
+
+                    if identity in removed:
+                        continue
+
+                    recversions = [
+                        (other, record) if other is store else
+                        (other, versions[oindex].get(identity))
+                        for oindex, other in enumerate(stores)
+                    ]
+
+                    if any(
+                            version is not None
+                            for _, version in recversions[:index]
+                    ):
+                        continue  # already merged with an earlier source
+
+                    recversions = [
+                        (other, version) for other, version in recversions
+                        if version is not None
+                    ]
+
+                    candidates = [
+                        version for version in recversions
+                        if any(version[0] is source for source in sources)
+                    ]
+
+                    resolved = policy.resolve(candidates)
+                    records.append(resolved)
 
-                        except Store.Error as ex:
-                            reraise(
-                                StoreRegistry.Error, StoreRegistry.Error(ex)
+                    for tindex, target in enumerate(targets):
+                        if target._accreg.get(resolved.__class__) is None:
+                            continue
+
+                        for other, version in recversions:
+                            if other is target:
+                                break
+
+                        else:
+                            version = None
+
+                        if plan is not None:
+                            plan.target(target)._diff(
+                                identity=identity, record=resolved,
+                                version=version
                             )
 
-                    skip += count
+                        elif version is None or version != resolved:
+                            divergents[tindex].add(id(resolved))
 
-                else:
-                    break
+                for tindex, target in enumerate(
+                        targets if plan is None else ()
+                ):
+                    if sizer is not None:
+                        count = sizer.count(target)
+
+                    divergent = divergents[tindex]
+
+                    for skip in range(0, len(records), count):
+                        chunk = records[skip: skip + count]
+
+                        self._write(
+                            source=None, target=target, records=chunk,
+                            written=[
+                                record for record in chunk
+                                if id(record) in divergent
+                            ],
+                            report=report
+                        )
+
+                if progress is not None:
+                    progress(report=report, source=store, records=page)
+
+    def _versions(self, store, stores, records, data):
+        """Find versions of records in other stores.
+
+        :param Store store: store where records were read.
+        :param list stores: stores where find versions.
+        :param list records: records to find by identity.
+        :param dict data: matching data content of versions.
+        :return: versions by identity per store, in stores order.
+        :rtype: list"""
+
+        result = []
+
+        for other in stores:
+            versions = {}
+            result.append(versions)
+
+            if other is store:
+                continue
+
+            found = [
+                record for record in records
+                if other._accreg.get(record.__class__) is not None
+            ]
+
+            if found:
+                for version in self._call(
+                        store=other, func='find', records=found, data=data
+                ):
+                    versions[version.identity] = version
+
+        return result
+
+    def _plan(self, source, target, records, plan, report):
+        """Plan the writing of records in a target.
+
+        Target records are found by input records in order to compare them
+        by identity and content."""
+
+        report._current = report.target(source=source, target=target)
+
+        versions = {}  # target versions by identity
+
+        for version in self._call(store=target, func='find', records=records):
+            versions[version.identity] = version
+
+        targetplan = plan.target(target)
+
+        for record in records:
+            identity = record.identity
+
+            targetplan._diff(
+                identity=identity, record=record,
+                version=versions.get(identity)
+            )
 
     def _execute(self, func, stores=None, *args, **kwargs):
         """
@@ -121,20 +790,68 @@ class StoreRegistry(Record):
             and targets.
         :param tuple args: func var arguments.
         :param dict kwargs: func keyword arguments.
-        :return: func result if not many. Otherwise, an array of func results.
+        :return: func results by store. Stores which fail to read are in
+            the result failures.
+        :rtype: StoreRegistry.Results
+        :raises: StoreRegistry.Error if a write function fails on a store,
+            once all stores are called.
         """
 
-        result = {}
+        result = StoreRegistry.Results()
+        failures = result.failures
 
         if stores is None:
             stores = self.stores
 
         for store in stores:
             try:
-                result[store] = getattr(store, func)(*args, **kwargs)
+                result[store] = self._call(store, func, *args, **kwargs)
 
-            except Store.Error:
-                continue
+            except Store.Error as ex:
+                failures[store] = ex
+
+                if ex.result:  # partial result
+                    result[store] = ex.result
+
+        if failures and func in StoreRegistry._WRITEFUNCS:
+            error = StoreRegistry.Error(
+                '{0} failed on {1} store(s): {2}'.format(
+                    func, len(failures), list(failures.values())[0]
+                )
+            )
+            error.results = dict(result)
+            error.failures = failures
+
+            raise error
+
+        return result
+
+    def _call(self, store, func, *args, **kwargs):
+        """Call a store function and notify observers.
+
+        :param Store store: store to call.
+        :param str func: store function name.
+        :return: function result."""
+
+        observers = self._observers
+
+        if observers:
+            start = timer()
+
+        try:
+            result = getattr(store, func)(*args, **kwargs)
+
+        except Exception as ex:
+            if observers:
+                self._notify(cmd=func, start=start, source=store, error=ex)
+
+            raise
+
+        if observers:
+            self._notify(
+                cmd=func, start=start, source=store,
+                count=len(result) if isinstance(result, list) else None
+            )
 
         return result
 
@@ -144,7 +861,8 @@ class StoreRegistry(Record):
         :param list records: records to add to the store.
         :param list stores: specific stores to use.
         :return: added records by store.
-        :rtype: dict"""
+        :rtype: dict
+        :raises: StoreRegistry.Error if a store fails."""
 
         return self._execute(func='add', records=records, stores=stores)
 
@@ -155,26 +873,32 @@ class StoreRegistry(Record):
         :param bool upsert: if True (default False), add record if not exist.
         :param list stores: specific stores to use.
         :return: updated records by store.
-        :rtype: dict"""
+        :rtype: dict
+        :raises: StoreRegistry.Error if a store fails."""
 
         return self._execute(
             func='update', upsert=upsert, records=records, stores=stores
         )
 
-    def get(self, record, stores=None):
+    def get(self, record, stores=None, fields=None):
         """Get a record from stores.
 
         :param Record record: record to get from the store.
         :param list stores: specific stores to use.
-        :return: record by store.
-        :rtype: dict"""
+        :param list fields: field names to load. Default is all fields.
+        :return: record by store, and failures of stores without the record.
+        :rtype: StoreRegistry.Results"""
+
+        kwargs = {} if fields is None else {'fields': fields}
 
-        return self._execute(func='get', record=record, stores=stores)
+        return self._execute(
+            func='get', record=record, stores=stores, **kwargs
+        )
 
     def find(
             self, stores=None,
             rtypes=None, records=None, data=None,
-            limit=None, skip=None, sort=None,
+            limit=None, skip=None, sort=None, fields=None
     ):
         """Find records from stores.
 
@@ -184,14 +908,17 @@ class StoreRegistry(Record):
         :param int limit: maximal number of records to retrieve.
         :param int skip: number of elements to avoid.
         :param list sort: data field name to sort.
+        :param list fields: field names to load. Default is all fields.
 
-        :return: records by store.
-        :rtype: dict"""
+        :return: records by store, and failures of stores which fail to read.
+        :rtype: StoreRegistry.Results"""
+
+        kwargs = {} if fields is None else {'fields': fields}
 
         return self._execute(
             func='find', stores=stores,
             rtypes=rtypes, records=records, data=data,
-            limit=limit, skip=skip, sort=sort
+            limit=limit, skip=skip, sort=sort, **kwargs
         )
 
     def remove(self, records=None, rtypes=None, data=None, stores=None):
@@ -203,6 +930,7 @@ class StoreRegistry(Record):
         :param list stores: specific stores to use.
         :return: removed records by store.
         :rtype: dict
+        :raises: StoreRegistry.Error if a store fails.
         """
 
         return self._execute(
@@ -0,0 +1,281 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------------------------
+# The MIT License (MIT)
+#
+# Copyright (c) 2014 Jonathan Labéjof <jonathan.labejof@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# --------------------------------------------------------------------
+
+"""Synchronization report definition module."""
+
+__all__ = ['SyncReport', 'SourceReport', 'TargetReport']
+
+from threading import local
+
+from timeit import default_timer as timer
+
+from .instrument import Observer
+
+
+class _PhaseReport(object):
+    """Common statistics of a synchronization phase."""
+
+    def __init__(self, *args, **kwargs):
+
+        super(_PhaseReport, self).__init__(*args, **kwargs)
+
+        self.nbytes = 0  #: exchanged bytes reported by accessors.
+        self.duration = 0.  #: time spent in store calls.
+        self.convert = 0.  #: time spent in record/data conversion.
+        self.throttle = 0.  #: time spent waiting for store throttles.
+        self.rtypes = {}  #: counters by record type.
+
+    def _count(self, records, name):
+        """Increment counters of input records by record type."""
+
+        rtypes = self.rtypes
+
+        for record in records:
+            counters = rtypes.get(record.__class__)
+
+            if counters is None:
+                counters = rtypes[record.__class__] = {}
+
+            counters[name] = counters.get(name, 0) + 1
+
+
+class SourceReport(_PhaseReport):
+    """Reading statistics of a source."""
+
+    def __init__(self, source, *args, **kwargs):
+        """
+        :param Store source: read store.
+        """
+
+        super(SourceReport, self).__init__(*args, **kwargs)
+
+        self.source = source
+        self.pages = 0  #: number of read pages.
+        self.read = 0  #: number of read records.
+        self.counts = []  #: requested page sizes.
+        self.total = None  #: estimated number of records to read if known.
+
+    def _page(self, records, duration, count=None):
+        """Add a read page."""
+
+        self.pages += 1
+        self.counts.append(count)
+        self.read += len(records)
+        self.duration += duration
+        self._count(records, 'read')
+
+
+class TargetReport(_PhaseReport):
+    """Writing statistics of records from a source to a target."""
+
+    def __init__(self, source, target, *args, **kwargs):
+        """
+        :param Store source: read store.
+        :param Store target: written store.
+        """
+
+        super(TargetReport, self).__init__(*args, **kwargs)
+
+        self.source = source
+        self.target = target
+        self.pages = 0  #: number of written pages.
+        self.written = 0  #: number of written records.
+        self.skipped = 0  #: number of unchanged records.
+        self.failed = 0  #: number of records which failed to be written.
+        self.removed = 0  #: number of removed records.
+
+    def _page(self, records, written, duration, failed=None):
+        """Add a written page.
+
+        :param list records: records to write.
+        :param list written: written records.
+        :param float duration: write duration.
+        :param list failed: records which failed to be written. Records
+            which are not written and not failed are skipped if no record
+            failed.
+        """
+
+        self.pages += 1
+        self.duration += duration
+
+        self.written += len(written)
+        self._count(written, 'written')
+
+        if failed:
+            self.failed += len(failed)
+            self._count(failed, 'failed')
+
+        else:
+            skipped = len(records) - len(written)
+
+            if skipped:
+                self.skipped += skipped
+
+                written = set(id(record) for record in written)
+                self._count(
+                    [record for record in records if id(record) not in written],
+                    'skipped'
+                )
+
+    def _remove(self, records, duration):
+        """Add removed records.
+
+        :param list records: removed records.
+        :param float duration: remove duration.
+        """
+
+        self.duration += duration
+        self.removed += len(records)
+        self._count(records, 'removed')
+
+
+class SyncReport(Observer):
+    """Synchronization report.
+
+    The report observes synchronized stores during the synchronization in
+    order to retrieve exchanged bytes and conversion time when accessors
+    report them. Measures are attributed to the phase of the thread which
+    calls stores, so targets written in parallel have their own measures."""
+
+    CONVERTCMDS = ('record2data', 'data2record')  #: conversion commands.
+
+    def __init__(self, *args, **kwargs):
+
+        super(SyncReport, self).__init__(*args, **kwargs)
+
+        self.start = timer()  #: synchronization start timer value.
+        self.duration = None  #: synchronization wall time.
+        self.sources = []  #: source reports.
+        self.targets = []  #: target reports.
+
+        self._local = local()  # phase report of the running store call
+
+    @property
+    def _current(self):
+        """Get the phase report of the running store call of the current
+        thread."""
+
+        return getattr(self._local, 'current', None)
+
+    @_current.setter
+    def _current(self, value):
+        """Change of the phase report of the current thread."""
+
+        self._local.current = value
+
+    def notify(self, measure):
+
+        current = self._current
+
+        if current is not None:
+            if measure.cmd in SyncReport.CONVERTCMDS:
+                current.convert += measure.duration
+
+            elif measure.nbytes:
+                current.nbytes += measure.nbytes
+
+            if measure.wait:
+                current.throttle += measure.wait
+
+    def source(self, source):
+        """Get the report of a source.
+
+        :param Store source: source.
+        :rtype: SourceReport"""
+
+        for result in self.sources:
+            if result.source is source:
+                break
+
+        else:
+            result = SourceReport(source=source)
+            self.sources.append(result)
+
+        return result
+
+    def target(self, source, target):
+        """Get the report of a target related to a source.
+
+        :param Store source: source.
+        :param Store target: target.
+        :rtype: TargetReport"""
+
+        for result in self.targets:
+            if result.source is source and result.target is target:
+                break
+
+        else:
+            result = TargetReport(source=source, target=target)
+            self.targets.append(result)
+
+        return result
+
+    def _stop(self):
+        """Stop the synchronization report."""
+
+        self.duration = timer() - self.start
+        self._current = None
+
+    @property
+    def read(self):
+        """Get the number of read records."""
+
+        return sum(report.read for report in self.sources)
+
+    @property
+    def written(self):
+        """Get the number of written records."""
+
+        return sum(report.written for report in self.targets)
+
+    @property
+    def removed(self):
+        """Get the number of removed records."""
+
+        return sum(report.removed for report in self.targets)
+
+    @property
+    def skipped(self):
+        """Get the number of unchanged records."""
+
+        return sum(report.skipped for report in self.targets)
+
+    @property
+    def failed(self):
+        """Get the number of records which failed to be written."""
+
+        return sum(report.failed for report in self.targets)
+
+    @property
+    def rps(self):
+        """Get the number of read records per second.
+
+        :rtype: float"""
+
+        duration = timer() - self.start if self.duration is None \
+            else self.duration
+
+        return self.read / duration if duration else None
@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------------------------
+# The MIT License (MIT)
+#
+# Copyright (c) 2014 Jonathan Labéjof <jonathan.labejof@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# --------------------------------------------------------------------
+
+"""Retry policy and circuit breaker of store calls."""
+
+__all__ = ['RetryPolicy', 'CircuitBreaker']
+
+from random import random
+
+from threading import Lock
+
+from time import sleep, time
+
+
+class RetryPolicy(object):
+    """Retry calls which fail with transient errors.
+
+    The nth retry waits ``delay * factor ** n`` seconds, at most ``maxdelay``
+    seconds, minus a random part of at most ``jitter`` of this value in order
+    to spread retries of concurrent callers."""
+
+    DEFAULT_RETRIES = 3  #: default maximal number of retries.
+    DEFAULT_DELAY = 0.1  #: default first retry delay in seconds.
+    DEFAULT_MAXDELAY = 10.  #: default maximal retry delay in seconds.
+    DEFAULT_FACTOR = 2.  #: default delay factor between two retries.
+    DEFAULT_JITTER = 0.5  #: default random part of delays.
+
+    #: default transient error types.
+    TRANSIENT = (EnvironmentError,)
+
+    def __init__(
+            self, retries=DEFAULT_RETRIES, delay=DEFAULT_DELAY,
+            maxdelay=DEFAULT_MAXDELAY, factor=DEFAULT_FACTOR,
+            jitter=DEFAULT_JITTER, transient=TRANSIENT, sleep=sleep,
+            *args, **kwargs
+    ):
+        """
+        :param int retries: maximal number of retries per call.
+        :param float delay: first retry delay in seconds.
+        :param float maxdelay: maximal retry delay in seconds.
+        :param float factor: delay factor between two retries.
+        :param float jitter: random part of delays between 0 and 1.
+        :param transient: transient error types, or function(error) which
+            returns True if an error is transient.
+        :param sleep: function(seconds) which waits between retries.
+        """
+
+        super(RetryPolicy, self).__init__(*args, **kwargs)
+
+        self.retries = retries
+        self.delay = delay
+        self.maxdelay = maxdelay
+        self.factor = factor
+        self.jitter = jitter
+        self.sleep = sleep
+
+        self._transient = transient
+
+        self.retried = 0  #: number of retried calls.
+
+    def transient(self, error):
+        """True if input error is transient.
+
+        :param Exception error: error to check.
+        :rtype: bool"""
+
+        transient = self._transient
+
+        if isinstance(transient, (type, tuple)):
+            result = isinstance(error, transient)
+
+        else:
+            result = transient(error)
+
+        return result
+
+    def delays(self):
+        """Get retry delays.
+
+        :return: at most self.retries delays in seconds.
+        :rtype: generator"""
+
+        delay = self.delay
+
+        for _ in range(self.retries):
+            value = min(delay, self.maxdelay)
+
+            yield value * (1. - self.jitter * random())
+
+            delay *= self.factor
+
+    def call(self, func, *args, **kwargs):
+        """Call a function until it succeeds or fails with a non transient
+        error or too many times.
+
+        :param func: function to call with next arguments.
+        :return: function result.
+        :raises: last function error."""
+
+        delays = self.delays()
+
+        while True:
+            try:
+                result = func(*args, **kwargs)
+
+            except Exception as ex:
+                delay = next(delays, None) if self.transient(ex) else None
+
+                if delay is None:
+                    raise
+
+                self.retried += 1
+                self.sleep(delay)
+
+            else:
+                break
+
+        return result
+
+
+class CircuitBreaker(object):
+    """Fail fast calls to a dead backend.
+
+    The circuit opens after ``threshold`` consecutive failures. While it is
+    open, calls are refused during ``reset`` seconds. Then one call at a time
+    is allowed (half open state) until one succeeds and closes the circuit,
+    or fails and opens it again."""
+
+    CLOSED = 'closed'  #: calls are allowed.
+    OPEN = 'open'  #: calls are refused.
+    HALFOPEN = 'halfopen'  #: one trial call is allowed.
+
+    DEFAULT_THRESHOLD = 5  #: default number of failures which opens.
+    DEFAULT_RESET = 30.  #: default open state duration in seconds.
+
+    class Error(Exception):
+        """Raised when a call is refused."""
+
+    def __init__(
+            self, threshold=DEFAULT_THRESHOLD, reset=DEFAULT_RESET,
+            *args, **kwargs
+    ):
+        """
+        :param int threshold: number of consecutive failures which opens the
+            circuit.
+        :param float reset: open state duration in seconds.
+        """
+
+        super(CircuitBreaker, self).__init__(*args, **kwargs)
+
+        self.threshold = threshold
+        self.reset = reset
+
+        self._failures = 0  # consecutive failures
+        self._opened = None  # open time
+        self._trial = False  # true while a trial call is running
+        self._lock = Lock()
+
+        self.refused = 0  #: number of refused calls.
+
+    @property
+    def state(self):
+        """Get the circuit state (CLOSED, OPEN or HALFOPEN).
+
+        :rtype: str"""
+
+        opened = self._opened
+
+        if opened is None:
+            result = CircuitBreaker.CLOSED
+
+        elif time() - opened < self.reset:
+            result = CircuitBreaker.OPEN
+
+        else:
+            result = CircuitBreaker.HALFOPEN
+
+        return result
+
+    def allow(self):
+        """Check if a call is allowed and reserve the trial call if the
+        circuit is half open.
+
+        :raises: CircuitBreaker.Error if the call is refused."""
+
+        with self._lock:
+            state = self.state
+
+            allowed = state == CircuitBreaker.CLOSED or (
+                state == CircuitBreaker.HALFOPEN and not self._trial
+            )
+
+            if allowed:
+                self._trial = state == CircuitBreaker.HALFOPEN
+
+            else:
+                self.refused += 1
+
+        if not allowed:
+            raise CircuitBreaker.Error(
+                'Circuit open after {0} failures.'.format(self._failures)
+            )
+
+    def success(self):
+        """Register a successful call and close the circuit."""
+
+        with self._lock:
+            self._failures = 0
+            self._opened = None
+            self._trial = False
+
+    def failure(self):
+        """Register a failed call and open the circuit if needed."""
+
+        with self._lock:
+            self._failures += 1
+
+            if self._trial or self._failures >= self.threshold:
+                self._opened = time()
+
+            self._trial = False
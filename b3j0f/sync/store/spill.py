@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------------------------
+# The MIT License (MIT)
+#
+# Copyright (c) 2014 Jonathan Labéjof <jonathan.labejof@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# --------------------------------------------------------------------
+
+"""Page buffer which spills pages to disk beyond a memory budget."""
+
+__all__ = ['SpillBuffer']
+
+from mmap import mmap, ACCESS_READ
+
+from tempfile import TemporaryFile
+
+from threading import Condition
+
+from ..record.codec import dumps, loads
+
+
+class SpillBuffer(object):
+    """Buffer record pages read once and consumed by several consumers.
+
+    Pages are kept in memory while they contain less than ``maxrecords``
+    records all together. Beyond, new pages are encoded in a temporary file
+    and decoded from a memory map of this file when consumers reach them.
+
+    A page is released once all consumers got it, so fast consumers are not
+    blocked by slow ones and producers never wait."""
+
+    DEFAULT_MAXRECORDS = 100000  #: default maximal records in memory.
+
+    def __init__(
+            self, consumers, maxrecords=DEFAULT_MAXRECORDS, *args, **kwargs
+    ):
+        """
+        :param int consumers: number of consumers.
+        :param int maxrecords: maximal number of records in memory.
+        """
+
+        super(SpillBuffer, self).__init__(*args, **kwargs)
+
+        self.maxrecords = maxrecords
+
+        self._pages = []  # records, (offset, size) or None once released
+        self._pending = []  # number of consumers waiting for each page
+        self._cursors = [0] * consumers  # next page index by consumer
+        self._done = [False] * consumers  # released consumers
+        self._records = 0  # number of records in memory
+        self._closed = False
+        self._condition = Condition()
+
+        self._file = None  # spill file
+        self._size = 0  # spill file size
+        self._map = None  # spill file memory map
+        self._rtypes = {}  # spilled record types
+
+        self.spilled = 0  #: number of spilled pages.
+
+    def put(self, records):
+        """Add a page of records.
+
+        :param list records: records to add."""
+
+        with self._condition:
+            if self._closed:
+                raise ValueError('Closed buffer')
+
+            consumers = self._done.count(False)
+
+            if not consumers:
+                page = None
+
+            elif self._records + len(records) <= self.maxrecords:
+                page = records
+                self._records += len(records)
+
+            else:
+                page = self._spill(records)
+
+            self._pages.append(page)
+            self._pending.append(consumers)
+
+            self._condition.notify_all()
+
+    def get(self, consumer, timeout=None):
+        """Get the next page of a consumer.
+
+        Wait until a page is put or the buffer is closed.
+
+        :param int consumer: consumer index.
+        :param float timeout: maximal waiting time in seconds.
+        :return: records, or None if the buffer is closed and all pages were
+            got by the consumer, or if the timeout expired.
+        :rtype: list"""
+
+        result = data = rtypes = None
+
+        with self._condition:
+            index = self._cursors[consumer]
+
+            while (
+                    index >= len(self._pages) and not self._closed and
+                    not self._done[consumer]
+            ):
+                if not self._condition.wait(timeout) and timeout is not None:
+                    break
+
+            if index < len(self._pages) and not self._done[consumer]:
+                page = self._pages[index]
+
+                if isinstance(page, tuple):
+                    data = self._read(page)
+                    rtypes = list(self._rtypes)
+
+                else:
+                    result = page
+
+                self._cursors[consumer] = index + 1
+                self._consume(index)
+
+        if data is not None:  # decode out of the lock, from a trusted file
+            result = loads(data, rtypes=rtypes, imports=True, unpickle=True)
+
+        return result
+
+    def release(self, consumer):
+        """Stop to keep pages for a consumer.
+
+        :param int consumer: consumer index."""
+
+        with self._condition:
+            if not self._done[consumer]:
+                self._done[consumer] = True
+
+                for index in range(self._cursors[consumer], len(self._pages)):
+                    self._consume(index)
+
+                self._condition.notify_all()
+
+    def close(self):
+        """Notify consumers that no more pages will be put."""
+
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    def dispose(self):
+        """Close the buffer and remove the spill file."""
+
+        self.close()
+
+        with self._condition:
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+            self._pages = []
+            self._pending = []
+            self._records = 0
+
+    def _consume(self, index):
+        """Decrement consumers waiting for a page and release it if needed."""
+
+        pending = self._pending[index] - 1
+        self._pending[index] = pending
+
+        if pending <= 0:
+            page = self._pages[index]
+
+            if isinstance(page, list):
+                self._records -= len(page)
+
+            self._pages[index] = None
+
+    def _spill(self, records):
+        """Write a page in the spill file.
+
+        :return: page offset and size in the spill file.
+        :rtype: tuple"""
+
+        if self._file is None:
+            self._file = TemporaryFile()
+
+        for record in records:
+            self._rtypes[record.__class__] = None
+
+        data = dumps(records)
+
+        self._file.seek(self._size)
+        self._file.write(data)
+
+        result = self._size, len(data)
+
+        self._size += len(data)
+        self.spilled += 1
+
+        return result
+
+    def _read(self, page):
+        """Read encoded records of a spilled page.
+
+        :rtype: bytes"""
+
+        offset, size = page
+
+        end = offset + size
+
+        if self._map is None or len(self._map) < end:  # remap grown file
+            if self._map is not None:
+                self._map.close()
+
+            self._file.flush()
+            self._map = mmap(self._file.fileno(), 0, access=ACCESS_READ)
+
+        return self._map[offset: end]
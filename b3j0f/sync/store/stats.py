@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------------------------
+# The MIT License (MIT)
+#
+# Copyright (c) 2014 Jonathan Labéjof <jonathan.labejof@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# --------------------------------------------------------------------
+
+"""Store cardinality statistics definition module."""
+
+__all__ = ['CountStats']
+
+from threading import Lock
+
+from time import time
+
+
+class CountStats(object):
+    """Estimate numbers of records by record type.
+
+    A count of a record type includes records of its sub types. Counts are
+    set from accessor counts or estimates, then maintained with added and
+    removed records. Counts of a record type are dropped when it is not
+    possible to know whether records were added, such as upserts. Methods
+    are thread-safe."""
+
+    def __init__(self, *args, **kwargs):
+
+        super(CountStats, self).__init__(*args, **kwargs)
+
+        self._counts = {}  # [count, refresh time] by record type.
+        self._lock = Lock()
+
+    def __len__(self):
+
+        return len(self._counts)
+
+    def __contains__(self, rtype):
+
+        return rtype in self._counts
+
+    def get(self, rtype, maxage=None):
+        """Get the estimated number of records of a type.
+
+        :param type rtype: record type.
+        :param float maxage: maximal age in seconds of the last refresh.
+            Default is None (no age limit).
+        :return: estimated count or None if unknown or too old.
+        :rtype: int"""
+
+        result = None
+
+        item = self._counts.get(rtype)
+
+        if item is not None and (maxage is None or time() - item[1] <= maxage):
+            result = item[0]
+
+        return result
+
+    def set(self, rtype, count):
+        """Refresh the count of a record type.
+
+        :param type rtype: record type.
+        :param int count: number of records."""
+
+        with self._lock:
+            self._counts[rtype] = [count, time()]
+
+    def add(self, records=None, rtype=None, count=None, sign=1):
+        """Update counts with added or removed records.
+
+        :param list records: added or removed records.
+        :param type rtype: record type of count records if records are not
+            given.
+        :param int count: number of rtype records.
+        :param int sign: 1 (default) for added records, -1 for removed ones.
+        """
+
+        counts = self._counts
+
+        if counts:
+            if records is None:
+                deltas = {rtype: count}
+
+            else:
+                deltas = {}
+                for record in records:
+                    cls = record.__class__
+                    deltas[cls] = deltas.get(cls, 0) + 1
+
+            with self._lock:
+                for cls, delta in deltas.items():
+                    for known, item in counts.items():
+                        if issubclass(cls, known):
+                            item[0] = max(0, item[0] + sign * delta)
+
+    def discard(self, rtypes):
+        """Drop counts of record types and their parent types.
+
+        :param list rtypes: record types."""
+
+        counts = self._counts
+
+        with self._lock:
+            for known in list(counts):
+                if any(issubclass(rtype, known) for rtype in rtypes):
+                    del counts[known]
+
+    def clear(self):
+        """Drop all counts."""
+
+        with self._lock:
+            self._counts.clear()
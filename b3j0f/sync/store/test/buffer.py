@@ -0,0 +1,266 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------------------------
+# The MIT License (MIT)
+#
+# Copyright (c) 2014 Jonathan Labéjof <jonathan.labejof@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# --------------------------------------------------------------------
+
+"""store.buffer UTs"""
+
+from unittest import main
+
+from b3j0f.utils.ut import UTCase
+
+from ..core import Store
+from ..buffer import StoreBuffer
+
+from .core import MyStore
+
+from ...record.core import Record
+from ...record.field import Field
+from ...accessor.test.core import MyAccessor
+from ...accessor.test.registry import MyRecord1
+
+
+class IdRecord(Record):
+
+    id = Field(ftype=int, identifier=True)
+
+
+class CountAccessor(MyAccessor):
+    """Accessor which counts calls by command."""
+
+    __rtypes__ = [IdRecord, MyRecord1]
+
+    def __init__(self, *args, **kwargs):
+
+        super(CountAccessor, self).__init__(*args, **kwargs)
+
+        self._calls = []
+
+    def add(self, store, records):
+
+        self._calls.append(('add', len(records)))
+
+        for record in records:
+            if record.id == -1:
+                raise Exception()
+
+        return super(CountAccessor, self).add(store=store, records=records)
+
+    def update(self, store, records, upsert=False):
+
+        self._calls.append(('update', len(records)))
+
+        return super(CountAccessor, self).update(
+            store=store, records=records, upsert=upsert
+        )
+
+    def remove(self, store, rtypes, records=None, data=None):
+
+        self._calls.append(('remove', len(records or ())))
+
+        return super(CountAccessor, self).remove(
+            store=store, rtypes=rtypes, records=records, data=data
+        )
+
+
+class StoreBufferTest(UTCase):
+
+    def setUp(self):
+
+        self.accessor = CountAccessor()
+        self.store = MyStore(accessors=[self.accessor], buffersize=10)
+
+    def test_nobuffer(self):
+
+        store = MyStore(accessors=[self.accessor])
+
+        self.assertIsNone(store.buffer)
+        self.assertEqual(store.flush(), ([], []))
+
+        store += IdRecord(id=1)
+
+        self.assertEqual(self.accessor._calls, [('add', 1)])
+
+    def test_add(self):
+
+        records = [IdRecord(id=i) for i in range(5)]
+
+        for record in records:
+            self.store += record
+
+        self.assertFalse(self.accessor._calls)
+        self.assertEqual(len(self.store.buffer), 5)
+
+        succeeded, failures = self.store.flush()
+
+        self.assertEqual(succeeded, records)
+        self.assertFalse(failures)
+        self.assertEqual(self.accessor._calls, [('add', 5)])
+        self.assertFalse(self.store.buffer)
+
+        for record in records:
+            self.assertIn(self.store, record.stores)
+
+    def test_coalesce_update(self):
+
+        record = IdRecord(id=1)
+
+        for i in range(5):
+            record.value = i
+            self.store |= record
+
+        self.assertEqual(len(self.store.buffer), 1)
+
+        self.store.flush()
+
+        self.assertEqual(self.accessor._calls, [('update', 1)])
+
+    def test_cancel(self):
+
+        record = IdRecord(id=1)
+
+        self.store += record
+        self.store -= record
+
+        self.assertFalse(self.store.buffer)
+        self.assertEqual(self.store.flush(), ([], []))
+        self.assertFalse(self.accessor._calls)
+
+    def test_remove_add(self):
+
+        record = IdRecord(id=1)
+        self.store.add(records=[record])
+
+        self.store -= record
+        record.value = 1
+        self.store += record
+
+        self.store.flush()
+
+        self.assertEqual(self.accessor._calls, [('add', 1), ('update', 1)])
+
+    def test_size(self):
+
+        for i in range(9):
+            self.store += IdRecord(id=i)
+
+        self.assertFalse(self.accessor._calls)
+
+        self.store += IdRecord(id=9)
+
+        self.assertEqual(self.accessor._calls, [('add', 10)])
+        self.assertFalse(self.store.buffer)
+
+    def test_age(self):
+
+        store = MyStore(accessors=[self.accessor], bufferage=0)
+
+        store += IdRecord(id=1)
+
+        self.assertEqual(self.accessor._calls, [('add', 1)])
+
+    def test_close(self):
+
+        record = IdRecord(id=1)
+
+        with self.store:
+            self.store += record
+
+            self.assertFalse(self.accessor._calls)
+
+        self.assertEqual(self.accessor._calls, [('add', 1)])
+        self.assertFalse(self.store.buffer)
+        self.assertIn(self.store, record.stores)
+
+    def test_close_failures(self):
+
+        records = [IdRecord(id=i) for i in (0, -1)]
+
+        self.store += records
+
+        error = None
+
+        try:
+            self.store.close()
+
+        except Store.Error as ex:
+            error = ex
+
+        self.assertIsNotNone(error)
+        self.assertEqual(
+            [failure[0] for failure in error.failures], records[1:]
+        )
+        self.assertEqual(error.result, records[:1])
+        self.assertFalse(self.store.buffer)
+
+    def test_failures(self):
+
+        records = [IdRecord(id=i) for i in (0, -1, 1)]
+
+        self.store += records
+
+        succeeded, failures = self.store.flush()
+
+        self.assertEqual(succeeded, [records[0], records[2]])
+        self.assertEqual(len(failures), 1)
+        self.assertIs(failures[0][0], records[1])
+        self.assertIsInstance(failures[0][1], Store.Error)
+
+    def test_partial_failures(self):
+
+        class IdAccessor(CountAccessor):
+            __rtypes__ = [IdRecord]
+
+        class OtherAccessor(CountAccessor):
+            __rtypes__ = [MyRecord1]
+
+        other = OtherAccessor()
+        store = MyStore(accessors=[IdAccessor(), other], buffersize=10)
+
+        records = [IdRecord(id=0), IdRecord(id=-1), MyRecord1()]
+
+        store += records
+
+        succeeded, failures = store.flush()
+
+        self.assertEqual(succeeded, [records[2], records[0]])
+        self.assertEqual([record for record, _ in failures], [records[1]])
+        self.assertEqual(other._calls, [('add', 1)])  # written once
+
+    def test_rtypes(self):
+
+        records = [MyRecord1(), IdRecord(id=1)]
+
+        buff = StoreBuffer(store=self.store)
+
+        self.assertIsNone(buff.add(records=records))
+
+        succeeded, _ = buff.flush()
+
+        self.assertEqual(succeeded, records)
+        self.assertEqual(self.accessor._calls, [('add', 2)])
+
+
+if __name__ == '__main__':
+    main()
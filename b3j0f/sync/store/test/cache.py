@@ -0,0 +1,281 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------------------------
+# The MIT License (MIT)
+#
+# Copyright (c) 2014 Jonathan Labéjof <jonathan.labejof@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# --------------------------------------------------------------------
+
+"""store.cache UTs"""
+
+from unittest import main
+
+from time import sleep
+
+from b3j0f.utils.ut import UTCase
+
+from ..core import Store
+from ..cache import CachedStore, LRUCache
+
+from .core import MyStore
+from .buffer import CountAccessor, IdRecord
+
+from ...accessor.test.registry import MyRecord1
+
+
+class MyCachedStore(CachedStore, MyStore):
+    pass
+
+
+class SubIdRecord(IdRecord):
+    pass
+
+
+class GetCountAccessor(CountAccessor):
+    """Accessor which counts get and find calls."""
+
+    def get(self, store, record):
+
+        self._calls.append(('get', 1))
+
+        return super(GetCountAccessor, self).get(store=store, record=record)
+
+    def find(self, store, rtypes, **kwargs):
+
+        self._calls.append(('find', len(rtypes)))
+
+        return super(GetCountAccessor, self).find(
+            store=store, rtypes=rtypes, **kwargs
+        )
+
+
+class CopyAccessor(GetCountAccessor):
+    """Accessor which gets copies of stored records, as remote stores do."""
+
+    def get(self, store, record):
+
+        return super(CopyAccessor, self).get(store=store, record=record).copy()
+
+    def find(self, store, rtypes, **kwargs):
+
+        return [
+            record.copy() for record in super(CopyAccessor, self).find(
+                store=store, rtypes=rtypes, **kwargs
+            )
+        ]
+
+
+class LRUCacheTest(UTCase):
+
+    def test_size(self):
+
+        cache = LRUCache(size=2)
+
+        cache.set(1, 1)
+        cache.set(2, 2)
+
+        self.assertEqual(cache.get(1), 1)
+
+        cache.set(3, 3)
+
+        self.assertEqual(cache.keys(), [1, 3])
+        self.assertIsNone(cache.get(2))
+        self.assertEqual(cache.stats, {'hits': 1, 'misses': 1, 'size': 2})
+
+    def test_ttl(self):
+
+        cache = LRUCache(ttl=0.01)
+
+        cache.set(1, 1)
+
+        self.assertIn(1, cache)
+
+        sleep(0.02)
+
+        self.assertNotIn(1, cache)
+
+    def test_pop(self):
+
+        cache = LRUCache()
+
+        cache.set(1, 1)
+
+        self.assertEqual(cache.pop(1), 1)
+        self.assertIsNone(cache.pop(1))
+        self.assertFalse(cache)
+
+
+class CachedStoreTest(UTCase):
+
+    def setUp(self):
+
+        self.accessor = GetCountAccessor()
+        self.store = MyCachedStore(accessors=[self.accessor])
+
+    def test_get(self):
+
+        record = IdRecord(id=1)
+        self.store.add(records=[record])
+
+        self.assertEqual(self.store.get(record), record)
+        self.assertEqual(self.store.get(record), record)
+
+        self.assertEqual(self.accessor._calls.count(('get', 1)), 1)
+        self.assertEqual(self.store.cachestats['get']['hits'], 1)
+        self.assertEqual(self.store.cachestats['get']['misses'], 1)
+
+    def test_copy(self):
+
+        store = MyCachedStore(accessors=[CopyAccessor()])
+
+        record = IdRecord(id=1, value=1)
+        store.add(records=[record])
+
+        # local changes of read records are not visible to other readers
+        for _ in range(2):
+            store.get(record).value = 2
+            store.find()[0].value = 3
+
+        cached = store.get(record)
+        self.assertEqual(cached.value, 1)
+        self.assertIsNot(cached, store.get(record))
+        self.assertIn(store, cached.stores)
+
+        found = store.find()
+        self.assertEqual(found[0].value, 1)
+        self.assertIsNot(found[0], store.find()[0])
+        self.assertIn(store, found[0].stores)
+
+        self.assertEqual(store.cachestats['get']['misses'], 1)
+        self.assertEqual(store.cachestats['find']['misses'], 1)
+
+    def test_contains(self):
+
+        record = IdRecord(id=1)
+
+        self.assertNotIn(record, self.store)
+        self.assertNotIn(record, self.store)
+        self.assertRaises(Store.Error, self.store.get, record)
+
+        self.assertEqual(self.accessor._calls, [('get', 1)])
+
+        self.store.add(records=[record])
+
+        self.assertIn(record, self.store)
+        self.assertIn(record, self.store)
+
+        self.assertEqual(self.accessor._calls.count(('get', 1)), 2)
+
+    def test_invalidate(self):
+
+        record = IdRecord(id=1)
+        self.store.add(records=[record])
+        self.store.get(record)
+
+        self.store.remove(records=[record])
+
+        self.assertNotIn(record, self.store)
+
+        self.store.add(records=[record])
+        self.store.remove(rtypes=[IdRecord])
+
+        self.assertNotIn(record, self.store)
+
+    def test_find(self):
+
+        records = [IdRecord(id=i) for i in range(3)]
+        self.store.add(records=records)
+
+        result = self.store.find(rtypes=[IdRecord], data={'id': 1})
+        self.assertEqual(result, [records[1]])
+
+        result = self.store.find(rtypes=[IdRecord], data={'id': 1})
+        self.assertEqual(result, [records[1]])
+
+        self.assertEqual(self.accessor._calls.count(('find', 1)), 1)
+        self.assertEqual(self.store.cachestats['find']['hits'], 1)
+
+        self.store.find(rtypes=[IdRecord], data={'id': 1}, limit=1)
+        self.assertEqual(self.accessor._calls.count(('find', 1)), 2)
+
+        # a write on another record type does not invalidate results
+        self.store.add(records=[MyRecord1()])
+        self.store.find(rtypes=[IdRecord], data={'id': 1})
+        self.assertEqual(self.accessor._calls.count(('find', 1)), 2)
+
+        self.store.add(records=[IdRecord(id=1, value=2)])
+        result = self.store.find(rtypes=[IdRecord], data={'id': 1})
+        self.assertEqual(len(result), 2)
+        self.assertEqual(self.accessor._calls.count(('find', 1)), 3)
+
+    def test_invalidate_subtype(self):
+
+        self.assertEqual(self.store.find(rtypes=[IdRecord]), [])
+
+        record = SubIdRecord(id=1)
+        self.store.add(records=(record for record in [record]))
+
+        self.assertEqual(self.store.find(rtypes=[IdRecord]), [record])
+        self.assertEqual(self.store.find(rtypes=[SubIdRecord]), [record])
+
+        self.store.remove(rtypes=[IdRecord])
+
+        self.assertEqual(self.store.find(rtypes=[SubIdRecord]), [])
+
+    def test_partial(self):
+
+        class IdAccessor(GetCountAccessor):
+            __rtypes__ = [IdRecord]
+
+        class BrokenAccessor(GetCountAccessor):
+            __rtypes__ = [MyRecord1]
+
+            def add(self, store, records):
+                raise IOError()
+
+        store = MyCachedStore(accessors=[IdAccessor(), BrokenAccessor()])
+
+        record = IdRecord(id=1)
+
+        self.assertNotIn(record, store)
+        self.assertEqual(store.find(rtypes=[IdRecord]), [])
+
+        self.assertRaises(
+            Store.Error, store.add, records=[record, MyRecord1()]
+        )
+
+        self.assertIn(record, store)
+        self.assertEqual(store.find(rtypes=[IdRecord]), [record])
+
+    def test_clearcache(self):
+
+        record = IdRecord(id=1)
+        self.store.add(records=[record])
+        self.store.get(record)
+
+        self.store.clearcache()
+        self.store.get(record)
+
+        self.assertEqual(self.accessor._calls.count(('get', 1)), 2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------------------------
+# The MIT License (MIT)
+#
+# Copyright (c) 2014 Jonathan Labéjof <jonathan.labejof@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# --------------------------------------------------------------------
+
+"""Concurrent store and record UTs."""
+
+from unittest import main
+
+from threading import Lock, Thread
+
+from b3j0f.utils.ut import UTCase
+
+from ..buffer import StoreBuffer
+
+from .cache import MyCachedStore
+from .conflict import IdentityAccessor, VersionRecord
+from .core import MyStore
+
+from ...accessor.registry import AccessorRegistry
+
+THREADS = 8  #: number of concurrent threads.
+ITERATIONS = 200  #: number of iterations per thread.
+
+
+class LockedAccessor(IdentityAccessor):
+    """Identity accessor with serialized calls."""
+
+    def __init__(self, *args, **kwargs):
+
+        super(LockedAccessor, self).__init__(*args, **kwargs)
+
+        self._lock = Lock()
+
+    def update(self, *args, **kwargs):
+
+        with self._lock:
+            return super(LockedAccessor, self).update(*args, **kwargs)
+
+    def find(self, *args, **kwargs):
+
+        with self._lock:
+            return super(LockedAccessor, self).find(*args, **kwargs)
+
+
+class ConcurrencyTest(UTCase):
+
+    def setUp(self):
+
+        self.store = MyStore(accessors=[LockedAccessor()])
+        self.errors = []
+
+    def _run(self, target):
+        """Run a target in THREADS threads with thread indices."""
+
+        def run(index):
+
+            try:
+                target(index)
+
+            except Exception as ex:
+                self.errors.append(ex)
+
+        threads = [
+            Thread(target=run, args=(index,)) for index in range(THREADS)
+        ]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.errors, [])
+
+    def test_commit(self):
+
+        count = ITERATIONS // 8  # test accessor lookups are linear
+
+        def commit(index):
+
+            for iteration in range(count):
+                record = VersionRecord(id=index * count + iteration)
+                record.commit(stores=[self.store])
+
+        self._run(commit)
+
+        records = self.store.find()
+        self.assertEqual(len(records), THREADS * count)
+        self.assertTrue(all(self.store in record.stores for record in records))
+
+    def test_shared_record(self):
+
+        record = VersionRecord(id=1, version=0)
+        record.commit(stores=[self.store])
+
+        def commit(index):
+
+            for iteration in range(ITERATIONS):
+                record.version = index * ITERATIONS + iteration
+                record.name = str(index)
+                record.commit()
+
+        self._run(commit)
+
+        record.commit()  # commit the last change if any
+        self.assertFalse(record.isdirty)
+        self.assertEqual(
+            self.store.get(record=record).raw(), record.raw(dirty=False)
+        )
+        self.assertEqual(list(record.stores), [self.store])
+
+    def test_lazy(self):
+
+        for _ in range(ITERATIONS):
+            record = VersionRecord.lazy(data={'id': 1, 'name': 'a'})
+            self._run(lambda index: record.raw())
+            self.assertEqual(record.raw()['name'], 'a')
+
+    def test_registry(self):
+
+        registry = AccessorRegistry()
+        accessor = IdentityAccessor()
+
+        def register(index):
+
+            for _ in range(ITERATIONS):
+                if index % 2:
+                    registry.register(accessors=[accessor])
+                    # other threads can unregister it meanwhile
+                    resolved = registry.get(VersionRecord)
+                    self.assertIn(resolved, (None, accessor))
+                    registry.unregister(accessors=[accessor])
+
+                else:
+                    registry.get(VersionRecord)
+
+        self._run(register)
+
+        self.assertIsNone(registry.get(VersionRecord))
+
+    def test_cache(self):
+
+        store = MyCachedStore(accessors=[LockedAccessor()], cachesize=16)
+        count = ITERATIONS // 8
+
+        def write(index):
+
+            for iteration in range(count):
+                record = VersionRecord(id=index * count + iteration)
+
+                store.find(rtypes=[VersionRecord])
+                self.assertNotIn(record, store)
+
+                store.update(records=[record], upsert=True, override=True)
+
+                self.assertIn(record, store)
+                self.assertIn(record, store.find(rtypes=[VersionRecord]))
+
+        self._run(write)
+
+        self.assertEqual(
+            len(store.find(rtypes=[VersionRecord])), THREADS * count
+        )
+
+    def test_buffer(self):
+
+        buffer = StoreBuffer(store=self.store, size=50)
+
+        def push(index):
+
+            for iteration in range(ITERATIONS):
+                buffer.update(
+                    records=[VersionRecord(id=index * ITERATIONS + iteration)]
+                )
+
+        self._run(push)
+
+        buffer.flush()
+        self.assertEqual(len(self.store.find()), THREADS * ITERATIONS)
+
+
+if __name__ == '__main__':
+    main()
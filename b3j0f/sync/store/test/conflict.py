@@ -0,0 +1,295 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------------------------
+# The MIT License (MIT)
+#
+# Copyright (c) 2014 Jonathan Labéjof <jonathan.labejof@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# --------------------------------------------------------------------
+
+from unittest import main
+
+from b3j0f.utils.ut import UTCase
+
+from ..conflict import (
+    ConflictPolicy, LastWriterWins, SourcePriority, FieldMerge
+)
+from ..registry import StoreRegistry
+
+from .core import MyStore
+from .instrument import MyObserver
+
+from ...record.core import Record
+from ...record.field import Field
+from ...accessor.test.core import MyAccessor
+
+
+class VersionRecord(Record):
+
+    id = Field(ftype=int, identifier=True)
+    version = Field(ftype=int, default=0)
+    name = Field(ftype=str)
+    value = Field(ftype=int)
+
+
+class IdentityAccessor(MyAccessor):
+    """Accessor which stores records by identity and counts written records.
+    """
+
+    __rtypes__ = [VersionRecord]
+
+    def __init__(self, *args, **kwargs):
+
+        super(IdentityAccessor, self).__init__(*args, **kwargs)
+
+        self.written = 0
+
+    def add(self, store, records):
+
+        return self.update(store=store, records=records, upsert=True)
+
+    def update(self, store, records, upsert=False):
+
+        for record in records:
+            store._store[record.identity] = record.copy()
+
+        self.written += len(records)
+
+        return records
+
+    def get(self, store, record):
+
+        return store._store[record.identity]
+
+    def remove(self, store, rtypes, records=None, data=None):
+
+        result = []
+
+        if records is None:
+            result = super(IdentityAccessor, self).remove(
+                store=store, rtypes=rtypes, data=data
+            )
+
+        else:
+            for record in records:  # remove all records or nothing
+                store._store[record.identity]
+
+            for record in records:
+                result.append(store._store.pop(record.identity))
+
+        return result
+
+
+class ConflictPolicyTest(UTCase):
+
+    def setUp(self):
+
+        self.stores = [object(), object(), object()]
+        self.versions = [
+            (self.stores[0], VersionRecord(id=1, version=1, name='a')),
+            (self.stores[1], VersionRecord(id=1, version=3, value=2)),
+            (self.stores[2], VersionRecord(id=1, version=None, name='c')),
+        ]
+
+    def test_default(self):
+
+        record = ConflictPolicy().resolve(self.versions)
+
+        self.assertIs(record, self.versions[0][1])
+
+    def test_lastwriterwins(self):
+
+        policy = LastWriterWins()
+
+        self.assertIs(policy.resolve(self.versions), self.versions[1][1])
+        self.assertEqual(
+            policy.order(self.versions),
+            [self.versions[1], self.versions[0], self.versions[2]]
+        )
+
+    def test_lastwriterwins_tie(self):
+
+        versions = [
+            (self.stores[0], VersionRecord(id=1, version=1, name='a')),
+            (self.stores[1], VersionRecord(id=1, version=1, name='b')),
+        ]
+
+        record = LastWriterWins().resolve(versions)
+
+        self.assertIs(record, versions[0][1])
+
+    def test_sourcepriority(self):
+
+        policy = SourcePriority(stores=[self.stores[2], self.stores[1]])
+
+        self.assertEqual(
+            policy.order(self.versions),
+            [self.versions[2], self.versions[1], self.versions[0]]
+        )
+
+    def test_fieldmerge(self):
+
+        policy = FieldMerge(fallback=LastWriterWins())
+
+        record = policy.resolve(self.versions)
+
+        self.assertEqual(record.id, 1)
+        self.assertEqual(record.version, 3)
+        self.assertEqual(record.value, 2)
+        self.assertEqual(record.name, 'a')
+
+    def test_fieldmerge_single(self):
+
+        record = FieldMerge().resolve(self.versions[:1])
+
+        self.assertIs(record, self.versions[0][1])
+
+
+class MergedSynchronizeTest(UTCase):
+
+    def setUp(self):
+
+        self.accessor = IdentityAccessor()
+        self.stores = [MyStore(accessors=[self.accessor]) for _ in range(3)]
+        self.registry = StoreRegistry(stores=self.stores)
+
+    def test_lastwriterwins(self):
+
+        self.stores[0].add(
+            records=[VersionRecord(id=i, version=1) for i in range(4)]
+        )
+        self.stores[1].add(
+            records=[VersionRecord(id=i, version=1) for i in range(4)]
+        )
+        self.stores[2].add(
+            records=[VersionRecord(id=i, version=2) for i in range(2)]
+        )
+        self.accessor.written = 0
+
+        report = self.registry.synchronize(policy=LastWriterWins(), count=3)
+
+        # two divergent records in two stores, and two missing records
+        self.assertEqual(self.accessor.written, 6)
+        self.assertEqual(report.written, 6)
+        self.assertEqual(report.skipped, 4 * 3 - 6)
+        # the last store is read once merged records are written in it
+        self.assertEqual(report.read, 4 + 4 + 4)
+
+        for store in self.stores:
+            records = sorted(
+                store.find(rtypes=[VersionRecord]),
+                key=lambda record: record.id
+            )
+
+            self.assertEqual(
+                [(record.id, record.version) for record in records],
+                [(0, 2), (1, 2), (2, 1), (3, 1)]
+            )
+
+    def test_paged(self):
+
+        for index, store in enumerate(self.stores):
+            store.add(
+                records=[
+                    VersionRecord(id=i, version=index) for i in range(index, 7)
+                ]
+            )
+
+        pages = []
+
+        def progress(report, source, records):
+
+            pages.append((len(records), report.written))
+
+        self.registry.synchronize(
+            policy=LastWriterWins(), count=2, progress=progress
+        )
+
+        # records are merged and written page per page
+        self.assertTrue(all(count <= 2 for count, _ in pages))
+        self.assertTrue(pages[0][1])
+
+        for store in self.stores:
+            records = sorted(
+                store.find(rtypes=[VersionRecord]),
+                key=lambda record: record.id
+            )
+
+            self.assertEqual(
+                [(record.id, record.version) for record in records],
+                [(0, 0), (1, 1)] + [(i, 2) for i in range(2, 7)]
+            )
+
+    def test_unchanged(self):
+
+        for store in self.stores:
+            store.add(records=[VersionRecord(id=i) for i in range(4)])
+
+        self.accessor.written = 0
+
+        report = self.registry.synchronize(policy=ConflictPolicy())
+
+        self.assertEqual(self.accessor.written, 0)
+        self.assertEqual(report.skipped, 12)
+
+    def test_targets(self):
+
+        self.stores[0].add(records=[VersionRecord(id=1, name='a')])
+        self.stores[1].add(records=[VersionRecord(id=1, name='b')])
+        self.stores[2].add(records=[VersionRecord(id=2, name='c')])
+
+        self.registry.synchronize(
+            sources=self.stores[:2], targets=self.stores[1:],
+            policy=SourcePriority(stores=[self.stores[0]])
+        )
+
+        self.assertEqual(len(self.stores[0].find()), 1)
+
+        for store in self.stores[1:]:
+            record = store.get(record=VersionRecord(id=1))
+            self.assertEqual(record.name, 'a')
+
+        # records only in targets are not synchronized
+        self.assertEqual(len(self.stores[1].find()), 1)
+
+    def test_targets_unread(self):
+
+        self.stores[0].add(records=[VersionRecord(id=i) for i in range(2)])
+        self.stores[1].add(records=[VersionRecord(id=2)])
+        self.stores[2].add(records=[VersionRecord(id=i) for i in range(10)])
+
+        observer = MyObserver()
+        self.stores[2].observers = [observer]
+
+        report = self.registry.synchronize(
+            sources=self.stores[:2], targets=self.stores[2:],
+            policy=ConflictPolicy(), count=2
+        )
+
+        # target versions are found once per source page, targets are not read
+        finds = [
+            measure for measure in observer.measures if measure.cmd == 'find'
+        ]
+        self.assertEqual(len(finds), 2)
+        self.assertEqual(report.read, 3)
+
+
+if __name__ == '__main__':
+    main()
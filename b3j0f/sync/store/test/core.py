@@ -31,6 +31,11 @@ from unittest import main
 from b3j0f.utils.ut import UTCase
 
 from ..core import Store
+from ..instrument import HistogramCollector
+from ..retry import CircuitBreaker, RetryPolicy
+
+from ...record.batch import RecordBatch
+from ...record.test.core import MyRecord
 
 from ...accessor.test.registry import (
     MyAccessor0, MyAccessor12, MyRecord0, MyRecord1, MyRecord2
@@ -46,6 +51,31 @@ class MyStore(Store):
         self._store = {}
 
 
+class PooledAccessor(MyAccessor12):
+    """Accessor which records connections used by calls."""
+
+    def connect(self, store):
+
+        return object()
+
+    def find(self, store, *args, **kwargs):
+
+        self._used.append(store.connection(self))
+
+        return super(PooledAccessor, self).find(store, *args, **kwargs)
+
+
+class FlakyAccessor(MyAccessor12):
+    """Accessor which fails with transient errors."""
+
+    def add(self, store, records):
+
+        if self._errors:
+            raise self._errors.pop()
+
+        return super(FlakyAccessor, self).add(store, records)
+
+
 class StoreTest(UTCase):
 
     def setUp(self):
@@ -58,6 +88,11 @@ class StoreTest(UTCase):
 
         self.assertTrue(self.store._accreg)
 
+        # accessors of several record types are listed once
+        self.assertEqual(
+            self.store.accessors, [self.myaccessor0, self.myaccessor12]
+        )
+
         self.store.accessors = []
 
         self.assertFalse(self.store._accreg)
@@ -98,6 +133,34 @@ class StoreTest(UTCase):
             self.assertIn(self.store, record.stores)
             self.assertIn(record, self.store)
 
+    def test_add_iterable(self):
+
+        records = [MyRecord0(), MyRecord1(), MyRecord0(test=1)]
+
+        result = self.store.add(records=set(records[:2]))
+
+        self.assertEqual(len(result), 2)
+
+        result = self.store.add(records=(record for record in records[2:]))
+
+        self.assertEqual(len(result), 1)
+
+        result = self.store.update(
+            records=(record for record in records), override=True
+        )
+
+        self.assertEqual(len(result), 3)
+
+        for record in records:
+            self.assertIn(record, self.store)
+
+        result = self.store.remove(records=(record for record in records))
+
+        self.assertEqual(len(result), 3)
+
+        for record in records:
+            self.assertNotIn(record, self.store)
+
     def test_update(self):
 
         records = [MyRecord1(**{'test': i}) for i in range(5)]
@@ -146,6 +209,167 @@ class StoreTest(UTCase):
         records = self.store.find(data={'two': 2})
         self.assertEqual(len(records), 1)
 
+    def test_count(self):
+
+        self.store.add(
+            records=[MyRecord0(), MyRecord1(two=1), MyRecord1(two=2)]
+        )
+
+        self.assertEqual(self.store.count(rtypes=[MyRecord1]), 2)
+        self.assertEqual(self.store.count(rtypes=[MyRecord0, MyRecord1]), 3)
+        self.assertEqual(self.store.count(), 3)
+        self.assertEqual(self.store.count(data={'two': 1}), 1)
+
+    def test_estimate_count(self):
+
+        self.store.add(records=[MyRecord1(), MyRecord1()])
+
+        self.assertIsNone(
+            self.store.estimate_count(rtypes=[MyRecord1], count=False)
+        )
+        self.assertEqual(self.store.estimate_count(rtypes=[MyRecord1]), 2)
+        self.assertIn(MyRecord1, self.store.stats)
+
+        # estimates are maintained without accessor calls
+        accessor = self.myaccessor12
+        accessor.count = None
+
+        self.store.add(records=[MyRecord1(), MyRecord1(), MyRecord2()])
+        self.assertEqual(self.store.estimate_count(rtypes=[MyRecord1]), 4)
+
+        self.store.remove(records=self.store.find(rtypes=[MyRecord1])[:3])
+        self.assertEqual(self.store.estimate_count(rtypes=[MyRecord1]), 1)
+
+        del accessor.count
+
+        self.store.update(records=[MyRecord1()], upsert=True)
+        self.assertNotIn(MyRecord1, self.store.stats)
+
+        self.assertEqual(self.store.estimate_count(maxage=0), 3)
+        self.store.stats.set(rtype=MyRecord1, count=10)
+        self.assertEqual(self.store.estimate_count(rtypes=[MyRecord1]), 10)
+
+    def test_pool(self):
+
+        accessor = PooledAccessor()
+        accessor._used = []
+
+        with MyStore(accessors=[accessor, self.myaccessor0]) as store:
+            self.assertEqual(list(store.pools), [accessor])
+
+            store.add(records=[MyRecord1()])
+            store.find(rtypes=[MyRecord1])
+            store.find(rtypes=[MyRecord1])
+            store.find(rtypes=[MyRecord0])
+
+            self.assertIsNotNone(accessor._used[0])
+            self.assertIs(accessor._used[0], accessor._used[1])
+            self.assertIsNone(store.connection(accessor))
+
+            stats = store.pools[accessor].stats
+            self.assertEqual(stats['created'], 1)
+            self.assertEqual(stats['reused'], 2)
+            self.assertEqual(stats['busy'], 0)
+
+        self.assertFalse(store.pools)
+
+    def test_retry(self):
+
+        accessor = FlakyAccessor()
+        accessor._errors = [IOError(), IOError()]
+
+        store = MyStore(
+            accessors=[accessor],
+            retry=RetryPolicy(retries=2, sleep=lambda delay: None)
+        )
+
+        records = [MyRecord1()]
+        self.assertEqual(store.add(records=records), records)
+
+        accessor._errors = [ValueError()]  # not transient
+        self.assertRaises(Store.Error, store.add, records=records)
+
+    def test_breaker(self):
+
+        accessor = FlakyAccessor()
+        accessor._errors = [IOError(), IOError()]
+
+        store = MyStore(
+            accessors=[accessor], breaker=CircuitBreaker(threshold=2)
+        )
+
+        for _ in range(3):
+            self.assertRaises(Store.Error, store.add, records=[MyRecord1()])
+
+        self.assertEqual(store._breaker.refused, 1)
+        self.assertFalse(accessor._errors)
+
+    def test_throttle(self):
+
+        collector = HistogramCollector()
+
+        store = MyStore(
+            accessors=[self.myaccessor0], rate=50., burst=1, maxinflight=1,
+            observers=[collector]
+        )
+
+        for _ in range(3):
+            store.add(records=[MyRecord0()])
+
+        self.assertEqual(store.throttle.throttled, 2)
+
+        summary = collector.stats(cmd='add')[0]
+        self.assertEqual(summary['throttled'], 2)
+        self.assertEqual(summary['wait'], store.throttle.wait)
+        self.assertIsNone(MyStore().throttle)
+
+    def test_throttle_retry(self):
+
+        accessor = FlakyAccessor()
+        accessor._errors = [IOError(), IOError()]
+
+        collector = HistogramCollector()
+
+        store = MyStore(
+            accessors=[accessor], rate=50., burst=1, maxinflight=1,
+            retry=RetryPolicy(retries=2, sleep=lambda delay: None),
+            observers=[collector]
+        )
+
+        store.add(records=[MyRecord1()])
+
+        # each attempt takes a token
+        self.assertEqual(store.throttle.throttled, 2)
+        self.assertEqual(
+            collector.stats(cmd='add')[0]['wait'], store.throttle.wait
+        )
+
+    def test_partial(self):
+
+        accessor = FlakyAccessor()
+        accessor._errors = [IOError()]
+
+        store = MyStore(accessors=[self.myaccessor0, accessor])
+
+        records = [MyRecord0(), MyRecord1(), MyRecord0()]
+
+        try:
+            store.add(records=records)
+
+        except Store.Error as ex:
+            self.assertEqual(ex.result, [records[0], records[2]])
+            self.assertEqual(
+                [record for record, _ in ex.failures], [records[1]]
+            )
+            self.assertIsInstance(ex.failures[0][1], IOError)
+
+        else:
+            self.fail()
+
+        self.assertIn(records[0], store)
+        self.assertIn(store, records[2].stores)
+        self.assertNotIn(records[1], store)
+
     def test_remove(self):
 
         record = MyRecord1()
@@ -184,11 +408,74 @@ class StoreTest(UTCase):
 
         self.assertNotIn(record, self.store)
 
+    def test_order(self):
+
+        records = [
+            MyRecord0() if i % 3 == 0 else MyRecord1() if i % 3 == 1
+            else MyRecord2() for i in range(10)
+        ]
+
+        result = self.store.add(records=records)
+
+        self.assertEqual(result, records)
+
+        for record in records:
+            self.assertIn(self.store, record.stores)
+
+    def test_remove_records(self):
+
+        record0, record1 = MyRecord0(), MyRecord1()
+
+        self.store.add(records=[record0, record1])
+
+        self.store.remove(records=[record1])
+
+        self.assertIn(record0, self.store)
+        self.assertNotIn(record1, self.store)
+        self.assertNotIn(self.store, record1.stores)
+
+    def test_subclass(self):
+
+        class MyRecord11(MyRecord1):
+            pass
+
+        record = MyRecord11()
+
+        self.store.add(records=[record])
+
+        self.assertIn(record, self.store)
+        self.assertEqual(self.store.find(rtypes=[MyRecord11]), [record])
+
+    def test_noaccessor(self):
+
+        self.store.accessors = [self.myaccessor0]
+
+        self.assertRaises(Store.Error, self.store.add, records=[MyRecord1()])
+
+    def test_batch(self):
+
+        records = [MyRecord1(two=i) for i in range(3)]
+        batch = RecordBatch.fromrecords(rtype=MyRecord1, records=records)
+
+        self.assertEqual(self.store.add_batch(batch=batch), 3)
+        self.assertEqual(self.store.update_batch(batch=batch[1:]), 2)
+
+        batch = self.store.find_batch(rtype=MyRecord1, sort=['two'])
+
+        self.assertIsInstance(batch, RecordBatch)
+        self.assertEqual(len(batch), 3)
+        self.assertIn(self.store, batch[0].stores)
+
+        self.assertRaises(
+            Store.Error, self.store.find_batch, rtype=MyRecord
+        )
+
     def test_rtypes(self):
 
-        rtypes = set(self.store.rtypes)
+        rtypes = self.store.rtypes
 
-        self.assertEqual(rtypes, set((MyRecord0, MyRecord1, MyRecord2)))
+        self.assertEqual(len(rtypes), 3)
+        self.assertEqual(set(rtypes), set((MyRecord0, MyRecord1, MyRecord2)))
 
 
 if __name__ == '__main__':
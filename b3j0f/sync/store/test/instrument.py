@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------------------------
+# The MIT License (MIT)
+#
+# Copyright (c) 2014 Jonathan Labéjof <jonathan.labejof@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# --------------------------------------------------------------------
+
+"""store.instrument UTs"""
+
+from unittest import main
+
+from b3j0f.utils.ut import UTCase
+
+from ..core import Store
+from ..registry import StoreRegistry
+from ..instrument import HistogramCollector, Measure, Observer
+
+from .core import MyStore
+
+from ...accessor.test.registry import MyAccessor0, MyAccessor12, MyRecord1
+
+
+class MyObserver(Observer):
+
+    def __init__(self, *args, **kwargs):
+
+        super(MyObserver, self).__init__(*args, **kwargs)
+
+        self.measures = []
+
+    def notify(self, measure):
+
+        self.measures.append(measure)
+
+
+class BytesAccessor(MyAccessor12):
+
+    def bytesize(self, store, cmd, params, result):
+
+        return 10 * len(result) if cmd == 'add' else None
+
+
+class InstrumentTest(UTCase):
+
+    def setUp(self):
+
+        self.observer = MyObserver()
+        self.accessor0 = MyAccessor0()
+        self.accessor12 = BytesAccessor()
+        self.store = MyStore(
+            accessors=[self.accessor0, self.accessor12],
+            observers=[self.observer]
+        )
+
+    def test_noobserver(self):
+
+        store = MyStore(accessors=[self.accessor0, self.accessor12])
+
+        self.assertEqual(store.observers, [])
+
+        store.add(records=[MyRecord1()])
+
+        self.assertFalse(self.observer.measures)
+
+    def test_store(self):
+
+        records = [MyRecord1(), MyRecord1()]
+
+        self.store.add(records=records)
+
+        self.assertEqual(len(self.observer.measures), 1)
+
+        measure = self.observer.measures[0]
+
+        self.assertIsInstance(measure, Measure)
+        self.assertIs(measure.source, self.store)
+        self.assertIs(measure.accessor, self.accessor12)
+        self.assertEqual(measure.cmd, 'add')
+        self.assertEqual(measure.count, 2)
+        self.assertEqual(measure.nbytes, 20)
+        self.assertIsNone(measure.error)
+        self.assertGreaterEqual(measure.duration, 0)
+
+    def test_error(self):
+
+        self.assertRaises(Store.Error, self.store.get, MyRecord1())
+
+        measure = self.observer.measures[0]
+
+        self.assertEqual(measure.cmd, 'get')
+        self.assertIsInstance(measure.error, KeyError)
+
+    def test_registry(self):
+
+        observer = MyObserver()
+        registry = StoreRegistry(stores=[self.store], observers=[observer])
+
+        self.assertNotIn('observers', registry._data)
+
+        registry.add(records=[MyRecord1()])
+        registry.get(record=MyRecord1())  # error is measured
+
+        self.assertEqual(
+            [(measure.source, measure.accessor, measure.cmd)
+             for measure in observer.measures],
+            [(self.store, None, 'add'), (self.store, None, 'get')]
+        )
+        self.assertEqual(observer.measures[0].count, 1)
+        self.assertIsNotNone(observer.measures[1].error)
+
+
+class HistogramCollectorTest(UTCase):
+
+    def test_stats(self):
+
+        collector = HistogramCollector()
+        store = MyStore(accessors=[MyAccessor12()], observers=[collector])
+
+        for _ in range(10):
+            store.add(records=[MyRecord1()])
+
+        self.assertRaises(Store.Error, store.get, MyRecord1())
+
+        stats = collector.stats(source=store, cmd='add')
+
+        self.assertEqual(len(stats), 1)
+
+        stat = stats[0]
+
+        self.assertEqual(stat['calls'], 10)
+        self.assertEqual(stat['records'], 10)
+        self.assertEqual(stat['errors'], 0)
+        self.assertEqual(sum(stat['buckets']), 10)
+        self.assertLessEqual(stat['min'], stat['p50'])
+        self.assertLessEqual(stat['p50'], stat['p99'])
+        self.assertLessEqual(stat['p99'], stat['max'])
+
+        stats = collector.stats(cmd='get')
+
+        self.assertEqual(stats[0]['errors'], 1)
+
+        collector.reset()
+
+        self.assertFalse(collector.stats())
+
+
+if __name__ == '__main__':
+    main()
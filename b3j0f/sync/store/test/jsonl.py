@@ -0,0 +1,342 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------------------------
+# The MIT License (MIT)
+#
+# Copyright (c) 2014 Jonathan Labéjof <jonathan.labejof@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# --------------------------------------------------------------------
+
+from unittest import main
+
+from os import remove
+from os.path import exists, getsize, join
+
+from shutil import rmtree
+
+from tempfile import mkdtemp
+
+from b3j0f.utils.ut import UTCase
+
+from ..core import Store
+from ..jsonl import JSONLStore
+from ..registry import StoreRegistry
+
+from .conflict import VersionRecord
+
+from ...record.batch import RecordBatch
+
+
+class JSONLStoreTest(UTCase):
+
+    def setUp(self):
+
+        self.dirname = mkdtemp()
+        self.path = join(self.dirname, 'records.jsonl')
+        self.store = self._store()
+
+    def tearDown(self):
+
+        self.store.close()
+        rmtree(self.dirname)
+
+    def _store(self, **kwargs):
+
+        kwargs.setdefault('rtypes', [VersionRecord])
+
+        return JSONLStore(path=self.path, **kwargs)
+
+    def test_add(self):
+
+        records = [VersionRecord(id=i, name=str(i)) for i in range(5)]
+
+        self.store.add(records=records)
+
+        self.assertEqual(self.store.find(), records)
+
+        record = self.store.get(record=VersionRecord(id=3))
+        self.assertEqual(record, records[3])
+        self.assertIn(self.store, record.stores)
+
+        self.assertRaises(
+            Store.Error, self.store.get, record=VersionRecord(id=5)
+        )
+
+    def test_update(self):
+
+        self.store.add(records=[VersionRecord(id=1, name='a')])
+
+        self.assertRaises(
+            Store.Error, self.store.update, records=[VersionRecord(id=2)]
+        )
+
+        self.store.update(records=[VersionRecord(id=1, name='b')])
+        self.store.update(records=[VersionRecord(id=2)], upsert=True)
+
+        records = self.store.find()
+        self.assertEqual(
+            [(record.id, record.name) for record in records],
+            [(1, 'b'), (2, None)]
+        )
+
+    def test_find(self):
+
+        self.store.add(
+            records=[VersionRecord(id=i, value=i % 2) for i in range(6)]
+        )
+
+        records = self.store.find(data={'value': 1}, skip=1, limit=1)
+        self.assertEqual([record.id for record in records], [3])
+
+        records = self.store.find(sort=['value', 'id'])
+        self.assertEqual(
+            [record.id for record in records], [0, 2, 4, 1, 3, 5]
+        )
+
+        records = self.store.find(
+            records=[VersionRecord(id=2), VersionRecord(id=9)]
+        )
+        self.assertEqual([record.id for record in records], [2])
+
+    def test_projection(self):
+
+        self.store.add(
+            records=[
+                VersionRecord(id=i, version=i, name=str(i)) for i in range(3)
+            ]
+        )
+
+        records = self.store.find(fields=['version'])
+
+        self.assertEqual(
+            [(record.id, record.version) for record in records],
+            [(0, 0), (1, 1), (2, 2)]
+        )
+        self.assertIsNone(records[0].name)
+        self.assertEqual(records[0].unloaded, frozenset(['name', 'value']))
+        self.assertRaises(Store.Error, self.store.update, records=records)
+        self.assertRaises(
+            Store.Error, self.store.add,
+            records=(record for record in records)
+        )
+
+        batch = RecordBatch.fromrecords(rtype=VersionRecord, records=records)
+        self.assertEqual(batch.unloaded, records[0].unloaded)
+        self.assertEqual(batch[1:].unloaded, records[0].unloaded)
+        self.assertRaises(Store.Error, self.store.add_batch, batch=batch)
+        self.assertRaises(Store.Error, self.store.update_batch, batch=batch)
+
+        record = self.store.get(record=VersionRecord(id=1), fields=['name'])
+        self.assertEqual(record.name, '1')
+        self.assertEqual(record.version, None)
+
+        record.version = 2
+        record.value = 3
+        self.assertFalse(record.unloaded)
+        self.store.update(records=[record])
+        self.assertEqual(
+            self.store.get(record=VersionRecord(id=1)).raw(),
+            {'id': 1, 'version': 2, 'name': '1', 'value': 3}
+        )
+
+    def test_remove(self):
+
+        self.store.add(records=[VersionRecord(id=i) for i in range(4)])
+
+        self.store.remove(records=[VersionRecord(id=1)])
+        self.assertEqual(
+            [record.id for record in self.store.find()], [0, 2, 3]
+        )
+
+        self.store.remove(data={'id': 2})
+        self.assertEqual([record.id for record in self.store.find()], [0, 3])
+
+        self.store.remove()
+        self.assertFalse(self.store.find())
+
+    def test_reopen(self):
+
+        self.store.add(records=[VersionRecord(id=i) for i in range(4)])
+        self.store.update(records=[VersionRecord(id=0, name='a')])
+        self.store.remove(records=[VersionRecord(id=2)])
+
+        with open(self.path, 'ab') as jsonlfile:  # unknown and partial lines
+            jsonlfile.write(b'{"_rtype":"unknown","a":1}\n{"_rtype":')
+
+        self.store.close()
+        self.store = self._store()
+
+        records = self.store.find()
+        self.assertEqual(
+            [(record.id, record.name) for record in records],
+            [(0, 'a'), (1, None), (3, None)]
+        )
+
+    def test_open(self):
+
+        records = [VersionRecord(id=i) for i in range(3)]
+
+        with self.store as store:
+            store.add(records=records)
+
+        self.store.open()
+
+        self.assertEqual(self.store.find(), records)
+
+    def test_torn(self):
+
+        records = [VersionRecord(id=i) for i in range(3)]
+
+        self.store.add(records=records[:2])
+        self.store.close()
+
+        with open(self.path, 'ab') as jsonlfile:
+            jsonlfile.write(b'{"_rtype":"ver')  # interrupted write
+
+        self.store = self._store()
+        self.assertEqual(self.store.find(), records[:2])
+
+        self.store.add(records=records[2:])
+        self.store.close()
+
+        self.store = self._store()
+        self.assertEqual(self.store.find(), records)
+
+    def test_compact(self):
+
+        self.store.close()
+        self.store = self._store(ratio=None)
+
+        for version in range(10):
+            self.store.update(
+                records=[
+                    VersionRecord(id=i, version=version) for i in range(10)
+                ],
+                upsert=True
+            )
+
+        with open(self.path, 'ab') as jsonlfile:
+            jsonlfile.write(b'{"_rtype":"unknown","a":1}\n')
+
+        self.store.close()
+        self.store = self._store(ratio=None)
+
+        size = getsize(self.path)
+
+        self.store.compact()
+
+        self.assertLess(getsize(self.path), size / 5)
+        self.assertFalse(exists('{0}.compact'.format(self.path)))
+
+        records = self.store.find()
+        self.assertEqual(
+            [(record.id, record.version) for record in records],
+            [(i, 9) for i in range(10)]
+        )
+
+        self.store.add(records=[VersionRecord(id=10)])
+        self.store.close()
+
+        with open(self.path, 'rb') as jsonlfile:
+            lines = jsonlfile.readlines()
+
+        self.assertEqual(len(lines), 12)
+        self.assertEqual(lines[0], b'{"_rtype":"unknown","a":1}\n')
+
+    def test_background(self):
+
+        self.store.close()
+        self.store = self._store(ratio=0.5, minlines=10)
+
+        for version in range(3):
+            self.store.update(
+                records=[
+                    VersionRecord(id=i, version=version) for i in range(5)
+                ],
+                upsert=True
+            )
+
+        self.store.close()  # wait for the compaction
+
+        self.assertLessEqual(self.store._lines, 10)
+
+        self.store = self._store()
+
+        self.assertEqual(
+            [record.version for record in self.store.find()], [2] * 5
+        )
+
+    def test_batch(self):
+
+        batch = RecordBatch(
+            rtype=VersionRecord,
+            columns={'id': [1, 2, 3], 'version': [0, 0, 1]}
+        )
+
+        self.assertEqual(self.store.add_batch(batch=batch), 3)
+        self.assertIsNone(batch._records)
+
+        self.assertRaises(
+            Store.Error, self.store.update_batch,
+            batch=RecordBatch(rtype=VersionRecord, columns={'id': [4]})
+        )
+
+        self.store.update_batch(
+            batch=RecordBatch(
+                rtype=VersionRecord, columns={'id': [2], 'name': ['b']}
+            )
+        )
+
+        batch = self.store.find_batch(
+            rtype=VersionRecord, data={'version': 0}, sort=['id']
+        )
+
+        self.assertEqual(list(batch.column('id')), [1, 2])
+        self.assertEqual(batch.column('name'), [None, 'b'])
+        self.assertIsNone(batch._records)
+
+        record = batch[1]
+        self.assertEqual(record, self.store.get(record=VersionRecord(id=2)))
+        self.assertIn(self.store, record.stores)
+
+    def test_synchronize(self):
+
+        records = [VersionRecord(id=i) for i in range(5)]
+
+        self.store.add(records=records)
+
+        otherpath = join(self.dirname, 'other.jsonl')
+        other = JSONLStore(path=otherpath, rtypes=[VersionRecord])
+
+        try:
+            report = StoreRegistry(stores=[self.store, other]).synchronize(
+                count=2
+            )
+
+            self.assertEqual(other.find(), records)
+            self.assertEqual(report.source(self.store).total, 5)
+
+        finally:
+            other.close()
+            remove(otherpath)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------------------------
+# The MIT License (MIT)
+#
+# Copyright (c) 2014 Jonathan Labéjof <jonathan.labejof@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# --------------------------------------------------------------------
+
+from unittest import main
+
+from b3j0f.utils.ut import UTCase
+
+from ..pagesize import PageSizer
+
+
+class PageSizerTest(UTCase):
+
+    def setUp(self):
+
+        self.sizer = PageSizer(
+            count=100, mincount=10, maxcount=1000, pagetime=1., factor=2.
+        )
+        self.source = object()
+
+    def test_first(self):
+
+        self.assertEqual(self.sizer.count(self.source), 100)
+
+    def test_grow(self):
+
+        count = self.sizer.observe(
+            source=self.source, count=100, records=100, duration=0.1
+        )
+
+        self.assertEqual(count, 200)
+        self.assertEqual(self.sizer.count(self.source), 200)
+
+    def test_shrink(self):
+
+        count = self.sizer.observe(
+            source=self.source, count=100, records=100, duration=1.25
+        )
+
+        self.assertEqual(count, 80)
+
+        count = self.sizer.observe(
+            source=self.source, count=80, records=80, duration=100
+        )
+
+        self.assertEqual(count, 40)
+
+    def test_bounds(self):
+
+        sizer = PageSizer(count=800, maxcount=1000, mincount=500)
+
+        count = sizer.observe(
+            source=self.source, count=800, records=800, duration=0
+        )
+        self.assertEqual(count, 1000)
+
+        count = sizer.observe(
+            source=self.source, count=600, records=600, duration=10
+        )
+        self.assertEqual(count, 500)
+
+    def test_maxbytes(self):
+
+        self.sizer.maxbytes = 1000
+
+        count = self.sizer.observe(
+            source=self.source, count=100, records=100, duration=0.1,
+            nbytes=2000
+        )
+
+        self.assertEqual(count, 50)
+
+    def test_empty(self):
+
+        count = self.sizer.observe(
+            source=self.source, count=100, records=0, duration=10
+        )
+
+        self.assertEqual(count, 100)
+
+    def test_reset(self):
+
+        self.sizer.observe(
+            source=self.source, count=100, records=100, duration=0.1
+        )
+        self.sizer.reset()
+
+        self.assertEqual(self.sizer.count(self.source), 100)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------------------------
+# The MIT License (MIT)
+#
+# Copyright (c) 2014 Jonathan Labéjof <jonathan.labejof@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# --------------------------------------------------------------------
+
+from unittest import main
+
+from b3j0f.utils.ut import UTCase
+
+from ..conflict import LastWriterWins
+from ..plan import SyncPlan
+from ..registry import StoreRegistry
+
+from .conflict import IdentityAccessor, VersionRecord
+from .core import MyStore
+
+
+class SyncPlanTest(UTCase):
+
+    def setUp(self):
+
+        self.accessor = IdentityAccessor()
+        self.stores = [
+            MyStore(accessors=[self.accessor], retention=60) for _ in range(2)
+        ]
+        self.registry = StoreRegistry(stores=self.stores)
+
+        self.stores[0].add(
+            records=[VersionRecord(id=i, version=1) for i in range(5)]
+        )
+        self.stores[1].add(
+            records=[VersionRecord(id=i, version=i % 2) for i in range(3)]
+        )
+        self.stores[0].remove(records=[VersionRecord(id=4)])
+
+        self.accessor.written = 0
+
+    def test_plan(self):
+
+        plan = self.registry.synchronize(
+            sources=self.stores[:1], targets=self.stores[1:], plan=True
+        )
+
+        self.assertIsInstance(plan, SyncPlan)
+        self.assertEqual(self.accessor.written, 0)
+        self.assertEqual(plan.report.read, 4)
+
+        targetplan = plan.target(self.stores[1])
+
+        self.assertEqual(
+            [identity[1] for identity in targetplan.adds], [(3,)]
+        )
+        self.assertEqual(
+            sorted(identity[1] for identity in targetplan.updates),
+            [(0,), (2,)]
+        )
+        self.assertFalse(targetplan.deletes)
+        self.assertEqual(len(plan), 3)
+
+        report = plan.apply()
+
+        self.assertEqual(self.accessor.written, 3)
+        self.assertEqual(report.written, 3)
+
+        records = self.stores[1].find()
+        self.assertEqual(
+            sorted((record.id, record.version) for record in records),
+            [(i, 1) for i in range(4)]
+        )
+
+        plan = self.registry.synchronize(
+            sources=self.stores[:1], targets=self.stores[1:], plan=True
+        )
+        self.assertFalse(plan)
+
+    def test_deletes(self):
+
+        self.stores[1].add(records=[VersionRecord(id=4)])
+
+        plan = self.registry.synchronize(
+            sources=self.stores[:1], targets=self.stores[1:], plan=True
+        )
+
+        self.assertEqual(plan.deletes, 1)
+        self.assertIn(VersionRecord(id=4), self.stores[1].find())
+
+        report = plan.apply()
+
+        self.assertEqual(report.removed, 1)
+        self.assertNotIn(VersionRecord(id=4), self.stores[1].find())
+
+    def test_policy(self):
+
+        plan = self.registry.synchronize(policy=LastWriterWins(), plan=True)
+
+        self.assertEqual(self.accessor.written, 0)
+        self.assertEqual(plan.adds, 1)
+        self.assertEqual(plan.updates, 2)
+
+        plan.apply()
+
+        for store in self.stores:
+            records = store.find()
+            self.assertEqual(
+                sorted((record.id, record.version) for record in records),
+                [(i, 1) for i in range(4)]
+            )
+
+
+if __name__ == '__main__':
+    main()
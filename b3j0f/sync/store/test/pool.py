@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------------------------
+# The MIT License (MIT)
+#
+# Copyright (c) 2014 Jonathan Labéjof <jonathan.labejof@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# --------------------------------------------------------------------
+
+from unittest import main
+
+from threading import Thread
+
+from b3j0f.utils.ut import UTCase
+
+from ..pool import ConnectionPool
+
+
+class ConnectionPoolTest(UTCase):
+
+    def setUp(self):
+
+        self.connections = []
+        self.closed = []
+
+        self.pool = ConnectionPool(
+            connect=self._connect, disconnect=self.closed.append, size=2
+        )
+
+    def _connect(self):
+
+        result = len(self.connections)
+        self.connections.append(result)
+
+        return result
+
+    def test_reuse(self):
+
+        connection = self.pool.acquire()
+        self.pool.release(connection)
+
+        self.assertEqual(self.pool.acquire(), connection)
+        self.assertEqual(self.pool.stats['created'], 1)
+        self.assertEqual(self.pool.stats['reused'], 1)
+        self.assertEqual(self.pool.stats['busy'], 1)
+
+    def test_size(self):
+
+        connections = [self.pool.acquire(), self.pool.acquire()]
+
+        self.assertRaises(ConnectionPool.Error, self.pool.acquire, timeout=0.01)
+        self.assertEqual(self.pool.stats['waits'], 1)
+
+        acquired = []
+        thread = Thread(target=lambda: acquired.append(self.pool.acquire()))
+        thread.start()
+
+        self.pool.release(connections[1])
+        thread.join()
+
+        self.assertEqual(acquired, [connections[1]])
+        self.assertEqual(len(self.connections), 2)
+
+    def test_discard(self):
+
+        connection = self.pool.acquire()
+        self.pool.release(connection, discard=True)
+
+        self.assertEqual(self.closed, [connection])
+        self.assertEqual(self.pool.stats['discarded'], 1)
+        self.assertEqual(self.pool.stats['open'], 0)
+
+        self.pool._check = lambda connection: connection != 1
+        self.pool.release(self.pool.acquire())  # create connection 1
+
+        self.assertEqual(self.pool.acquire(), 2)  # 1 is discarded
+        self.assertEqual(self.closed, [0, 1])
+
+    def test_close(self):
+
+        connection = self.pool.acquire()
+        self.pool.release(self.pool.acquire())
+
+        self.pool.close()
+
+        self.assertEqual(self.closed, [1])
+        self.assertRaises(ConnectionPool.Error, self.pool.acquire)
+
+        self.pool.release(connection)
+        self.assertEqual(self.closed, [1, 0])
+        self.assertEqual(self.pool.stats['open'], 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -30,7 +30,9 @@ from unittest import main
 
 from b3j0f.utils.ut import UTCase
 
+from ..core import Store
 from ..registry import StoreRegistry
+from ..pagesize import PageSizer
 
 from .core import MyStore
 
@@ -97,6 +99,113 @@ class StoreRegistryTest(UTCase):
         records2 = self.registry.find(rtypes=[MyRecord2])
         self.assertTrue(records2[self.stores[0]])
 
+    def test_report(self):
+
+        records = [MyRecord0(one=i) for i in range(5)]
+        self.stores[0].add(records=records)
+        self.stores[1].add(records=records[:2])
+
+        pages = []
+
+        def progress(report, source, records):
+            pages.append((source, len(records)))
+
+        report = self.registry.synchronize(
+            sources=[self.stores[0]], targets=self.stores[1:], count=2,
+            progress=progress
+        )
+
+        self.assertEqual(
+            pages,
+            [(self.stores[0], 2), (self.stores[0], 2), (self.stores[0], 1)]
+        )
+
+        self.assertEqual(report.read, 5)
+        self.assertEqual(report.written, 3 + 5)
+        self.assertEqual(report.skipped, 2)
+        self.assertEqual(report.failed, 0)
+        self.assertIsNotNone(report.duration)
+        self.assertTrue(report.rps)
+
+        sourcereport = report.source(self.stores[0])
+        self.assertEqual(sourcereport.pages, 3)
+        self.assertEqual(sourcereport.rtypes, {MyRecord0: {'read': 5}})
+
+        targetreport = report.target(self.stores[0], self.stores[1])
+        self.assertEqual(targetreport.written, 3)
+        self.assertEqual(targetreport.skipped, 2)
+        self.assertEqual(
+            targetreport.rtypes, {MyRecord0: {'written': 3, 'skipped': 2}}
+        )
+
+        for store in self.stores:
+            self.assertNotIn(report, store.observers)
+
+    def test_pagesizer(self):
+
+        records = [MyRecord0(one=i) for i in range(10)]
+        self.stores[0].add(records=records)
+
+        sizer = PageSizer(count=1, mincount=1, maxcount=4, pagetime=60)
+
+        report = self.registry.synchronize(
+            sources=[self.stores[0]], targets=self.stores[1:], count=sizer
+        )
+
+        sourcereport = report.source(self.stores[0])
+        self.assertEqual(sourcereport.counts, [1, 2, 4, 4])
+        self.assertEqual(report.read, 10)
+        self.assertEqual(sizer.count(self.stores[0]), 4)
+
+    def test_report_error(self):
+
+        record = MyRecord0()
+        self.stores[0].add(records=[record])
+
+        target = MyStore(accessors=[MyAccessor12()])
+
+        try:
+            self.registry.synchronize(
+                sources=[self.stores[0]], targets=[target]
+            )
+
+        except StoreRegistry.Error as ex:
+            self.assertEqual(ex.report.failed, 1)
+
+        else:
+            self.fail()
+
+    def test_write_failure(self):
+
+        record = MyRecord1()
+        target = MyStore(accessors=[MyAccessor0()])  # no MyRecord1 accessor
+
+        try:
+            self.registry.add(
+                records=[record], stores=[self.stores[0], target]
+            )
+
+        except StoreRegistry.Error as ex:
+            self.assertEqual(list(ex.failures), [target])
+            self.assertEqual(ex.results, {self.stores[0]: [record]})
+
+        else:
+            self.fail()
+
+        # read failures are not raised but given in results
+        result = self.registry.get(
+            record=record, stores=[self.stores[0], target]
+        )
+
+        self.assertEqual(result, {self.stores[0]: record})
+        self.assertEqual(list(result.failures), [target])
+        self.assertIsInstance(result.failures[target], Store.Error)
+
+        result = self.registry.find(stores=[self.stores[0], target])
+
+        self.assertEqual(list(result), [self.stores[0], target])
+        self.assertFalse(result.failures)
+
 
 if __name__ == '__main__':
     main()
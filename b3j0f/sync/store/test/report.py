@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------------------------
+# The MIT License (MIT)
+#
+# Copyright (c) 2014 Jonathan Labéjof <jonathan.labejof@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# --------------------------------------------------------------------
+
+"""store.report UTs"""
+
+from unittest import main
+
+from threading import Thread
+
+from b3j0f.utils.ut import UTCase
+
+from ..report import SyncReport
+from ..instrument import Measure
+
+from ...accessor.test.registry import MyRecord0, MyRecord1
+
+
+class SyncReportTest(UTCase):
+
+    def setUp(self):
+
+        self.report = SyncReport()
+        self.source, self.target = object(), object()
+
+    def test_source(self):
+
+        sourcereport = self.report.source(self.source)
+
+        self.assertIs(self.report.source(self.source), sourcereport)
+
+        sourcereport._page(records=[MyRecord0(), MyRecord1()], duration=1)
+
+        self.assertEqual(self.report.read, 2)
+        self.assertEqual(sourcereport.duration, 1)
+        self.assertEqual(
+            sourcereport.rtypes,
+            {MyRecord0: {'read': 1}, MyRecord1: {'read': 1}}
+        )
+
+    def test_target(self):
+
+        targetreport = self.report.target(self.source, self.target)
+
+        self.assertIs(
+            self.report.target(self.source, self.target), targetreport
+        )
+
+        records = [MyRecord0(), MyRecord1()]
+
+        targetreport._page(records=records, written=records[:1], duration=1)
+        targetreport._page(
+            records=records, written=[], failed=records, duration=1
+        )
+
+        self.assertEqual(self.report.written, 1)
+        self.assertEqual(self.report.skipped, 1)
+        self.assertEqual(self.report.failed, 2)
+        self.assertEqual(targetreport.pages, 2)
+        self.assertEqual(
+            targetreport.rtypes,
+            {
+                MyRecord0: {'written': 1, 'failed': 1},
+                MyRecord1: {'skipped': 1, 'failed': 1}
+            }
+        )
+
+    def test_notify(self):
+
+        sourcereport = self.report._current = self.report.source(self.source)
+
+        self.report.notify(
+            Measure(
+                source=self.source, accessor=None, cmd='data2record',
+                duration=1
+            )
+        )
+        self.report.notify(
+            Measure(
+                source=self.source, accessor=None, cmd='find', duration=1,
+                nbytes=10
+            )
+        )
+
+        self.assertEqual(sourcereport.convert, 1)
+        self.assertEqual(sourcereport.nbytes, 10)
+
+        self.report._stop()
+
+        self.assertIsNotNone(self.report.duration)
+        self.assertIsNone(self.report._current)
+
+    def test_notify_threads(self):
+
+        sourcereport = self.report._current = self.report.source(self.source)
+        targetreport = self.report.target(
+            source=self.source, target=self.target
+        )
+
+        def write():
+            self.report._current = targetreport
+            self.report.notify(
+                Measure(
+                    source=self.target, accessor=None, cmd='update',
+                    duration=1, nbytes=5
+                )
+            )
+
+        thread = Thread(target=write)
+        thread.start()
+        thread.join()
+
+        self.assertIs(self.report._current, sourcereport)
+        self.assertEqual(sourcereport.nbytes, 0)
+        self.assertEqual(targetreport.nbytes, 5)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------------------------
+# The MIT License (MIT)
+#
+# Copyright (c) 2014 Jonathan Labéjof <jonathan.labejof@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# --------------------------------------------------------------------
+
+from unittest import main
+
+from time import sleep
+
+from b3j0f.utils.ut import UTCase
+
+from ..retry import CircuitBreaker, RetryPolicy
+
+
+class RetryPolicyTest(UTCase):
+
+    def setUp(self):
+
+        self.sleeps = []
+        self.policy = RetryPolicy(
+            retries=3, delay=1., maxdelay=3., jitter=0.5,
+            sleep=self.sleeps.append
+        )
+
+    def test_delays(self):
+
+        delays = list(self.policy.delays())
+
+        self.assertEqual(len(delays), 3)
+
+        for delay, maxdelay in zip(delays, (1., 2., 3.)):
+            self.assertTrue(maxdelay / 2 <= delay <= maxdelay)
+
+    def test_call(self):
+
+        errors = [IOError(), IOError()]
+
+        def func(value):
+            if errors:
+                raise errors.pop()
+            return value
+
+        self.assertEqual(self.policy.call(func, 1), 1)
+        self.assertEqual(len(self.sleeps), 2)
+        self.assertEqual(self.policy.retried, 2)
+
+    def test_exhausted(self):
+
+        def func():
+            raise IOError()
+
+        self.assertRaises(IOError, self.policy.call, func)
+        self.assertEqual(len(self.sleeps), 3)
+
+    def test_transient(self):
+
+        def func():
+            raise ValueError()
+
+        self.assertRaises(ValueError, self.policy.call, func)
+        self.assertFalse(self.sleeps)
+
+        self.policy._transient = lambda error: isinstance(error, ValueError)
+        self.assertRaises(ValueError, self.policy.call, func)
+        self.assertEqual(len(self.sleeps), 3)
+
+
+class CircuitBreakerTest(UTCase):
+
+    def setUp(self):
+
+        self.breaker = CircuitBreaker(threshold=2, reset=0.02)
+
+    def test_open(self):
+
+        self.breaker.allow()
+        self.breaker.failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+        self.breaker.failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.assertRaises(CircuitBreaker.Error, self.breaker.allow)
+        self.assertEqual(self.breaker.refused, 1)
+
+    def test_halfopen(self):
+
+        self.breaker.failure()
+        self.breaker.failure()
+
+        sleep(0.03)
+        self.assertEqual(self.breaker.state, CircuitBreaker.HALFOPEN)
+
+        self.breaker.allow()  # trial call
+        self.assertRaises(CircuitBreaker.Error, self.breaker.allow)
+
+        self.breaker.failure()  # the trial failed
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+
+        sleep(0.03)
+        self.breaker.allow()
+        self.breaker.success()
+
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+        self.breaker.allow()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------------------------
+# The MIT License (MIT)
+#
+# Copyright (c) 2014 Jonathan Labéjof <jonathan.labejof@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# --------------------------------------------------------------------
+
+from unittest import main
+
+from threading import Event
+
+from b3j0f.utils.ut import UTCase
+
+from ..registry import StoreRegistry
+from ..spill import SpillBuffer
+
+from .conflict import IdentityAccessor, VersionRecord
+from .core import MyStore
+
+
+class SpillBufferTest(UTCase):
+
+    def setUp(self):
+
+        self.buffer = SpillBuffer(consumers=2, maxrecords=4)
+        self.pages = [
+            [VersionRecord(id=i * 3 + j, name='n') for j in range(3)]
+            for i in range(3)
+        ]
+
+    def tearDown(self):
+
+        self.buffer.dispose()
+
+    def test_memory(self):
+
+        self.buffer.put(self.pages[0])
+
+        self.assertEqual(self.buffer.spilled, 0)
+        self.assertIs(self.buffer.get(0), self.pages[0])
+        self.assertIs(self.buffer.get(1), self.pages[0])
+        self.assertEqual(self.buffer._records, 0)
+
+    def test_spill(self):
+
+        for page in self.pages:
+            self.buffer.put(page)
+
+        self.buffer.close()
+
+        self.assertEqual(self.buffer.spilled, 2)
+
+        for consumer in range(2):
+            pages = list(iter(lambda: self.buffer.get(consumer), None))
+
+            self.assertIs(pages[0], self.pages[0])
+            self.assertEqual(
+                [[record.raw() for record in page] for page in pages],
+                [[record.raw() for record in page] for page in self.pages]
+            )
+
+    def test_release(self):
+
+        self.buffer.put(self.pages[0])
+        self.buffer.release(1)
+
+        self.assertIs(self.buffer.get(0), self.pages[0])
+        self.assertEqual(self.buffer._records, 0)
+
+        self.buffer.put(self.pages[1])
+        self.assertEqual(self.buffer.spilled, 0)
+        self.assertIsNone(self.buffer.get(1))
+
+    def test_timeout(self):
+
+        self.assertIsNone(self.buffer.get(0, timeout=0.01))
+
+        self.buffer.close()
+
+        self.assertIsNone(self.buffer.get(0))
+
+        self.assertRaises(ValueError, self.buffer.put, self.pages[0])
+
+
+class SlowAccessor(IdentityAccessor):
+    """Accessor which waits for an event before writing."""
+
+    def __init__(self, event, *args, **kwargs):
+
+        super(SlowAccessor, self).__init__(*args, **kwargs)
+
+        self._event = event
+
+    def update(self, store, records, upsert=False):
+
+        self._event.wait()
+
+        return super(SlowAccessor, self).update(
+            store=store, records=records, upsert=upsert
+        )
+
+
+class BrokenStore(MyStore):
+    """Store which fails with an unexpected error."""
+
+    def update(self, *args, **kwargs):
+
+        raise RuntimeError('broken')
+
+
+class SyncSpillTest(UTCase):
+
+    def setUp(self):
+
+        self.event = Event()
+
+        self.stores = [
+            MyStore(accessors=[IdentityAccessor()]),
+            MyStore(accessors=[IdentityAccessor()]),
+            MyStore(accessors=[SlowAccessor(event=self.event)])
+        ]
+        self.registry = StoreRegistry(stores=self.stores)
+
+        self.records = [VersionRecord(id=i) for i in range(10)]
+        self.stores[0].add(records=self.records)
+
+    def test_synchronize(self):
+
+        def progress(report, source, records):
+
+            if report.read == len(self.records):  # fast target is done
+                self.event.set()
+
+        report = self.registry.synchronize(
+            sources=self.stores[:1], count=3, spill=4, progress=progress
+        )
+
+        self.assertEqual(report.read, 10)
+        self.assertEqual(report.written, 20)
+
+        for store in self.stores[1:]:
+            self.assertEqual(
+                sorted(record.id for record in store.find()), list(range(10))
+            )
+
+    def test_error(self):
+
+        self.event.set()
+        self.stores[1].accessors = []
+
+        try:
+            self.registry.synchronize(sources=self.stores[:1], count=3, spill=4)
+
+        except StoreRegistry.Error as ex:
+            self.assertEqual(ex.report.failed, 3)
+            self.assertEqual(
+                ex.report.target(self.stores[0], self.stores[1]).failed, 3
+            )
+
+        else:
+            self.fail()
+
+    def test_unexpected_error(self):
+
+        self.event.set()
+        registry = StoreRegistry(
+            stores=[
+                self.stores[0], BrokenStore(accessors=[IdentityAccessor()])
+            ]
+        )
+
+        self.assertRaises(
+            RuntimeError, registry.synchronize,
+            sources=self.stores[:1], count=3
+        )
+        self.assertRaises(
+            RuntimeError, registry.synchronize,
+            sources=self.stores[:1], count=3, spill=4
+        )
+
+
+if __name__ == '__main__':
+    main()
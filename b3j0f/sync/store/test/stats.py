@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------------------------
+# The MIT License (MIT)
+#
+# Copyright (c) 2014 Jonathan Labéjof <jonathan.labejof@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# --------------------------------------------------------------------
+
+from unittest import main
+
+from time import sleep
+
+from b3j0f.utils.ut import UTCase
+
+from ..stats import CountStats
+
+from ...accessor.test.registry import MyRecord0
+from ...record.test.core import MyRecord
+
+
+class MyRecord00(MyRecord0):
+    pass
+
+
+class CountStatsTest(UTCase):
+
+    def setUp(self):
+
+        self.stats = CountStats()
+
+    def test_set(self):
+
+        self.assertIsNone(self.stats.get(rtype=MyRecord0))
+
+        self.stats.set(rtype=MyRecord0, count=3)
+
+        self.assertEqual(self.stats.get(rtype=MyRecord0), 3)
+        self.assertEqual(self.stats.get(rtype=MyRecord0, maxage=60), 3)
+
+        sleep(0.01)
+        self.assertIsNone(self.stats.get(rtype=MyRecord0, maxage=0.005))
+
+    def test_add(self):
+
+        self.stats.add(records=[MyRecord0()])  # no count to maintain
+        self.assertFalse(self.stats)
+
+        self.stats.set(rtype=MyRecord, count=1)
+        self.stats.set(rtype=MyRecord0, count=1)
+        self.stats.set(rtype=MyRecord00, count=0)
+
+        self.stats.add(records=[MyRecord00(), MyRecord0()])
+        self.assertEqual(self.stats.get(rtype=MyRecord), 3)
+        self.assertEqual(self.stats.get(rtype=MyRecord0), 3)
+        self.assertEqual(self.stats.get(rtype=MyRecord00), 1)
+
+        self.stats.add(rtype=MyRecord0, count=5, sign=-1)
+        self.assertEqual(self.stats.get(rtype=MyRecord), 0)
+        self.assertEqual(self.stats.get(rtype=MyRecord00), 1)
+
+    def test_discard(self):
+
+        self.stats.set(rtype=MyRecord, count=1)
+        self.stats.set(rtype=MyRecord00, count=1)
+
+        self.stats.discard([MyRecord0])
+
+        self.assertNotIn(MyRecord, self.stats)
+        self.assertIn(MyRecord00, self.stats)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------------------------
+# The MIT License (MIT)
+#
+# Copyright (c) 2014 Jonathan Labéjof <jonathan.labejof@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# --------------------------------------------------------------------
+
+from unittest import main
+
+from threading import Lock, Thread
+
+from time import sleep
+
+from b3j0f.utils.ut import UTCase
+
+from ..throttle import Throttle, TokenBucket
+
+
+class TokenBucketTest(UTCase):
+
+    def setUp(self):
+
+        self.now = 0.
+        self.sleeps = []
+
+        self.bucket = TokenBucket(
+            rate=2., burst=2, clock=lambda: self.now,
+            sleep=self.sleeps.append
+        )
+
+    def test_burst(self):
+
+        self.assertEqual(self.bucket.acquire(), 0.)
+        self.assertEqual(self.bucket.acquire(), 0.)
+        self.assertFalse(self.sleeps)
+
+    def test_wait(self):
+
+        self.bucket.acquire(tokens=2)
+
+        self.assertEqual(self.bucket.acquire(), 0.5)
+        self.assertEqual(self.bucket.acquire(), 1.)  # reserved in order
+        self.assertEqual(self.sleeps, [0.5, 1.])
+
+    def test_refill(self):
+
+        self.bucket.acquire(tokens=2)
+        self.now = 10.
+
+        self.assertEqual(self.bucket.acquire(tokens=2), 0.)  # bounded burst
+        self.assertEqual(self.bucket.acquire(), 0.5)
+
+
+class ThrottleTest(UTCase):
+
+    def test_default(self):
+
+        throttle = Throttle()
+
+        self.assertEqual(throttle.acquire(), 0.)
+        throttle.release()
+        self.assertEqual(throttle.throttled, 0)
+
+    def test_maxinflight(self):
+
+        throttle = Throttle(maxinflight=2)
+        lock = Lock()
+        inflight = [0, 0]  # current and maximal number of concurrent calls
+
+        def call():
+            throttle.acquire()
+
+            with lock:
+                inflight[0] += 1
+                inflight[1] = max(inflight)
+
+            sleep(0.01)
+
+            with lock:
+                inflight[0] -= 1
+
+            throttle.release()
+
+        threads = [Thread(target=call) for _ in range(6)]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(inflight, [0, 2])
+        self.assertGreater(throttle.throttled, 0)
+        self.assertGreater(throttle.wait, 0.)
+
+
+if __name__ == '__main__':
+    main()
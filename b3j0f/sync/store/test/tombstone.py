@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------------------------
+# The MIT License (MIT)
+#
+# Copyright (c) 2014 Jonathan Labéjof <jonathan.labejof@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# --------------------------------------------------------------------
+
+from unittest import main
+
+from time import sleep
+
+from b3j0f.utils.ut import UTCase
+
+from ..registry import StoreRegistry
+from ..tombstone import TombstoneLog
+
+from .conflict import IdentityAccessor, VersionRecord
+from .core import MyStore
+from .instrument import MyObserver
+
+
+class TombstoneLogTest(UTCase):
+
+    def setUp(self):
+
+        self.log = TombstoneLog(retention=60)
+        self.records = [VersionRecord(id=i) for i in range(3)]
+
+    def test_bury(self):
+
+        self.log.bury(self.records)
+
+        self.assertEqual(len(self.log), 3)
+        self.assertEqual(self.log.records(), self.records)
+        self.assertIn(VersionRecord(id=1, name='other'), self.log)
+
+    def test_unbury(self):
+
+        self.log.bury(self.records)
+        self.log.unbury([VersionRecord(id=1)])
+
+        self.assertEqual(
+            self.log.records(), [self.records[0], self.records[2]]
+        )
+
+    def test_order(self):
+
+        self.log.bury(self.records)
+        self.log.bury(self.records[:1])
+
+        self.assertEqual(
+            self.log.records(),
+            [self.records[1], self.records[2], self.records[0]]
+        )
+
+    def test_since(self):
+
+        self.log.bury(self.records[:1])
+        sleep(0.01)
+        since = self.log._tombstones[self.records[0].identity][0] + 0.005
+        self.log.bury(self.records[1:])
+
+        self.assertEqual(self.log.records(since=since), self.records[1:])
+
+    def test_retention(self):
+
+        self.log.retention = 0.01
+        self.log.bury(self.records)
+
+        sleep(0.02)
+
+        self.assertFalse(self.log)
+        self.assertFalse(self.log.records())
+
+    def test_clear(self):
+
+        self.log.bury(self.records)
+        self.log.clear()
+
+        self.assertFalse(self.log)
+
+
+class StoreTombstoneTest(UTCase):
+
+    def setUp(self):
+
+        self.accessor = IdentityAccessor()
+        self.stores = [
+            MyStore(accessors=[self.accessor], retention=60) for _ in range(3)
+        ]
+        self.registry = StoreRegistry(stores=self.stores)
+
+        self.records = [VersionRecord(id=i) for i in range(4)]
+
+        for store in self.stores:
+            store.add(records=self.records)
+
+    def test_store(self):
+
+        store = MyStore(accessors=[self.accessor])
+        self.assertIsNone(store.tombstones)
+
+        store = self.stores[0]
+
+        store.remove(records=self.records[:2])
+        self.assertEqual(store.tombstones.records(), self.records[:2])
+
+        store.add(records=self.records[:1])
+        self.assertEqual(store.tombstones.records(), self.records[1:2])
+
+        self.records[2].delete()
+        self.assertFalse(self.records[2].stores)
+
+        for store in self.stores:
+            self.assertIn(self.records[2], store.tombstones)
+
+    def test_synchronize(self):
+
+        self.stores[0].remove(records=self.records[:2])
+
+        report = self.registry.synchronize()
+
+        self.assertEqual(report.removed, 4)
+        self.assertEqual(report.failed, 0)
+
+        for store in self.stores:
+            self.assertEqual(
+                sorted(record.id for record in store.find()), [2, 3]
+            )
+
+    def test_watermark(self):
+
+        self.stores[0].remove(records=self.records[:2])
+
+        self.registry.synchronize()
+
+        observer = MyObserver()
+
+        for store in self.stores:
+            store.observers = [observer]
+
+        report = self.registry.synchronize()
+
+        removes = [
+            measure for measure in observer.measures if measure.cmd == 'remove'
+        ]
+        self.assertEqual(report.removed, 0)
+        self.assertFalse(removes)
+
+        self.stores[0].remove(records=self.records[2:3])
+
+        report = self.registry.synchronize()
+
+        self.assertEqual(report.removed, 2)
+        self.assertEqual(self.stores[1].find(), self.records[3:])
+
+        del observer.measures[:]
+
+        report = self.registry.synchronize()
+
+        removes = [
+            measure for measure in observer.measures if measure.cmd == 'remove'
+        ]
+        self.assertEqual(report.removed, 0)
+        self.assertFalse(removes)
+
+    def test_absent(self):
+
+        self.stores[0].remove(records=self.records[:2])
+        self.stores[1].remove(records=self.records[1:2])
+
+        report = self.registry.synchronize(sources=self.stores[:1])
+
+        self.assertEqual(report.removed, 1 + 2)
+
+        for store in self.stores:
+            self.assertEqual(
+                sorted(record.id for record in store.find()), [2, 3]
+            )
+
+
+if __name__ == '__main__':
+    main()
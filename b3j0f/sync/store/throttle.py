@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------------------------
+# The MIT License (MIT)
+#
+# Copyright (c) 2014 Jonathan Labéjof <jonathan.labejof@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# --------------------------------------------------------------------
+
+"""Store call rate and concurrency limits."""
+
+__all__ = ['TokenBucket', 'Throttle']
+
+from threading import BoundedSemaphore, Lock
+
+from time import sleep
+
+from timeit import default_timer as timer
+
+
+class TokenBucket(object):
+    """Limit a rate of calls with bursts.
+
+    The bucket contains at most ``burst`` tokens and is refilled with ``rate``
+    tokens per second. A call takes a token, and waits for it if the bucket is
+    empty. Tokens are reserved in call order, so waiting callers are served
+    first come first served without busy loops."""
+
+    def __init__(
+            self, rate, burst=None, clock=timer, sleep=sleep, *args, **kwargs
+    ):
+        """
+        :param float rate: tokens per second.
+        :param int burst: bucket size. Default is max(1, rate).
+        :param clock: function which returns the current time in seconds.
+        :param sleep: function(seconds) which waits.
+        """
+
+        super(TokenBucket, self).__init__(*args, **kwargs)
+
+        self.rate = rate
+        self.burst = max(1, rate) if burst is None else burst
+
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.burst  # negative if tokens are reserved
+        self._last = clock()  # last refill time
+        self._lock = Lock()
+
+    def acquire(self, tokens=1):
+        """Take tokens and wait for them if needed.
+
+        :param int tokens: number of tokens to take.
+        :return: waited time in seconds.
+        :rtype: float"""
+
+        with self._lock:
+            now = self._clock()
+
+            available = min(
+                self.burst, self._tokens + (now - self._last) * self.rate
+            )
+
+            self._last = now
+            self._tokens = available - tokens
+
+            result = 0. if available >= tokens \
+                else (tokens - available) / self.rate
+
+        if result:
+            self._sleep(result)
+
+        return result
+
+
+class Throttle(object):
+    """Limit calls of a store with a token bucket and a maximal number of
+    concurrent calls."""
+
+    def __init__(
+            self, rate=None, burst=None, maxinflight=None, *args, **kwargs
+    ):
+        """
+        :param float rate: maximal number of calls per second. Default is
+            None (no rate limit).
+        :param int burst: maximal number of calls at once over the rate.
+        :param int maxinflight: maximal number of concurrent calls. Default is
+            None (no limit).
+        """
+
+        super(Throttle, self).__init__(*args, **kwargs)
+
+        self.bucket = None if rate is None else TokenBucket(
+            rate=rate, burst=burst
+        )
+        self.maxinflight = maxinflight
+
+        self._inflight = None if maxinflight is None else BoundedSemaphore(
+            maxinflight
+        )
+
+        self.throttled = 0  #: number of delayed calls.
+        self.wait = 0.  #: total wait time in seconds.
+
+        self._lock = Lock()
+
+    def acquire(self):
+        """Wait until a call is allowed.
+
+        :return: waited time in seconds.
+        :rtype: float"""
+
+        result = 0.
+
+        inflight = self._inflight
+
+        if inflight is not None and not inflight.acquire(False):
+            start = timer()
+            inflight.acquire()
+            result += timer() - start
+
+        if self.bucket is not None:
+            result += self.bucket.acquire()
+
+        if result:
+            with self._lock:
+                self.throttled += 1
+                self.wait += result
+
+        return result
+
+    def release(self):
+        """Release a call slot once a call is done."""
+
+        if self._inflight is not None:
+            self._inflight.release()
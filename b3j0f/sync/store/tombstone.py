@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------------------------
+# The MIT License (MIT)
+#
+# Copyright (c) 2014 Jonathan Labéjof <jonathan.labejof@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# --------------------------------------------------------------------
+
+"""Store deletion log definition module."""
+
+__all__ = ['TombstoneLog']
+
+from collections import OrderedDict
+
+from threading import Lock
+
+from time import time
+
+
+class TombstoneLog(object):
+    """Log records removed from a store during a retention window.
+
+    Tombstones are indexed by record identity. Adding again a removed record
+    drops its tombstone, and tombstones older than ``retention`` seconds are
+    purged at each access. Methods are thread-safe."""
+
+    def __init__(self, retention, *args, **kwargs):
+        """
+        :param float retention: tombstone retention in seconds.
+        """
+
+        super(TombstoneLog, self).__init__(*args, **kwargs)
+
+        self.retention = retention
+
+        self._tombstones = OrderedDict()  # (time, record) by identity.
+        self._lock = Lock()
+
+    def __len__(self):
+
+        with self._lock:
+            self._purge()
+            result = len(self._tombstones)
+
+        return result
+
+    def __contains__(self, record):
+
+        identity = record.identity
+
+        with self._lock:
+            self._purge()
+            result = identity in self._tombstones
+
+        return result
+
+    def bury(self, records):
+        """Add tombstones of removed records.
+
+        :param list records: removed records."""
+
+        items = [(record.identity, record) for record in records]
+
+        with self._lock:
+            tombstones = self._tombstones
+            now = time()
+
+            for identity, record in items:
+                tombstones.pop(identity, None)  # keep the log sorted by time
+                tombstones[identity] = now, record
+
+            self._purge(now)
+
+    def unbury(self, records=None, identities=None):
+        """Drop tombstones of written records.
+
+        :param list records: written records.
+        :param list identities: written record identities."""
+
+        tombstones = self._tombstones
+
+        if tombstones:
+            if identities is None:
+                identities = [record.identity for record in records]
+
+            with self._lock:
+                for identity in identities:
+                    tombstones.pop(identity, None)
+
+    def records(self, since=None):
+        """Get removed records.
+
+        :param float since: minimal removal time. Default is None.
+        :return: removed records in removal order.
+        :rtype: list"""
+
+        with self._lock:
+            self._purge()
+
+            result = [
+                record for removed, record in self._tombstones.values()
+                if since is None or removed >= since
+            ]
+
+        return result
+
+    def clear(self):
+        """Drop all tombstones."""
+
+        with self._lock:
+            self._tombstones.clear()
+
+    def _purge(self, now=None):
+        """Drop expired tombstones. The lock must be acquired."""
+
+        tombstones = self._tombstones
+
+        if tombstones:
+            expiry = (time() if now is None else now) - self.retention
+
+            while tombstones:
+                identity = next(iter(tombstones))
+
+                if tombstones[identity][0] >= expiry:
+                    break
+
+                del tombstones[identity]
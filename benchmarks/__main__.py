@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------------------------
+# The MIT License (MIT)
+#
+# Copyright (c) 2014 Jonathan Labéjof <jonathan.labejof@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# --------------------------------------------------------------------
+
+"""Benchmark runner.
+
+Results are written in JSON with elapsed seconds and records per second by
+workload and size. A result file can be saved as a baseline, and compared to
+later runs in order to detect regressions."""
+
+from argparse import ArgumentParser
+
+from json import dump, load
+
+from platform import python_implementation, python_version
+
+from sys import exit, stdout
+
+from b3j0f.sync import __version__
+
+from .workloads import WORKLOADS
+
+DEFAULT_SIZES = '1000,100000'  #: default numbers of records.
+DEFAULT_TOLERANCE = 0.2  #: default relative slowdown tolerance.
+
+
+def run(workloads, sizes, repeat=3):
+    """Run workloads and keep the best time of repeated runs.
+
+    :param list workloads: workload names.
+    :param list sizes: numbers of records.
+    :param int repeat: number of runs per workload and size.
+    :rtype: dict"""
+
+    results = {}
+
+    for name in workloads:
+        workload = WORKLOADS[name]
+
+        for size in sizes:
+            elapsed = min(workload(size) for _ in range(repeat))
+
+            results['{0}:{1}'.format(name, size)] = {
+                'workload': name,
+                'size': size,
+                'seconds': elapsed,
+                'rps': size / elapsed if elapsed else None
+            }
+
+    return {
+        'version': __version__,
+        'python': '{0} {1}'.format(python_implementation(), python_version()),
+        'repeat': repeat,
+        'results': results
+    }
+
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Compare results with a baseline.
+
+    :param dict results: run results.
+    :param dict baseline: baseline results.
+    :param float tolerance: relative slowdown tolerance.
+    :return: time ratios by result key, and sorted keys of regressions.
+    :rtype: tuple"""
+
+    ratios, regressions = {}, []
+
+    for key, result in results['results'].items():
+        base = baseline['results'].get(key)
+
+        if base is not None and base['seconds']:
+            ratio = result['seconds'] / base['seconds']
+            ratios[key] = ratio
+
+            if ratio > 1 + tolerance:
+                regressions.append(key)
+
+    return ratios, sorted(regressions)
+
+
+def main(argv=None):
+    """Run benchmarks from command line arguments.
+
+    :return: 1 if a regression is detected, otherwise 0.
+    :rtype: int"""
+
+    parser = ArgumentParser(prog='python -m benchmarks', description=__doc__)
+    parser.add_argument(
+        '-w', '--workloads', default=','.join(sorted(WORKLOADS)),
+        help='comma separated workload names (default all)'
+    )
+    parser.add_argument(
+        '-s', '--sizes', default=DEFAULT_SIZES,
+        help='comma separated numbers of records (default %(default)s)'
+    )
+    parser.add_argument(
+        '-r', '--repeat', type=int, default=3,
+        help='runs per workload, the best one is kept (default %(default)s)'
+    )
+    parser.add_argument('-o', '--output', help='JSON result file to write')
+    parser.add_argument('-b', '--baseline', help='JSON result file to compare')
+    parser.add_argument(
+        '-t', '--tolerance', type=float, default=DEFAULT_TOLERANCE,
+        help='relative slowdown tolerance (default %(default)s)'
+    )
+
+    args = parser.parse_args(argv)
+
+    results = run(
+        workloads=args.workloads.split(','),
+        sizes=[int(size) for size in args.sizes.split(',')],
+        repeat=args.repeat
+    )
+
+    ratios, regressions = {}, []
+
+    if args.baseline:
+        with open(args.baseline) as baseline:
+            ratios, regressions = compare(
+                results=results, baseline=load(baseline),
+                tolerance=args.tolerance
+            )
+
+    for key in sorted(results['results']):
+        result = results['results'][key]
+        line = '{0:<24} {1:>10.4f}s {2:>12.0f} records/s'.format(
+            key, result['seconds'], result['rps'] or 0
+        )
+
+        if key in ratios:
+            line += ' x{0:.2f}'.format(ratios[key])
+
+            if key in regressions:
+                line += ' REGRESSION'
+
+        stdout.write(line + '\n')
+
+    if args.output:
+        with open(args.output, 'w') as output:
+            dump(results, output, indent=2, sort_keys=True)
+
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    exit(main())
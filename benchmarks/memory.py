@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------------------------
+# The MIT License (MIT)
+#
+# Copyright (c) 2014 Jonathan Labéjof <jonathan.labejof@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# --------------------------------------------------------------------
+
+"""In-memory reference accessor and store used by benchmarks."""
+
+__all__ = ['MemoryAccessor', 'MemoryStore']
+
+from collections import OrderedDict
+
+from b3j0f.sync import Accessor, Store
+
+
+class MemoryStore(Store):
+    """Store which keeps record data by record type and identity."""
+
+    def __init__(self, *args, **kwargs):
+
+        super(MemoryStore, self).__init__(*args, **kwargs)
+
+        self._records = {}
+
+    def _table(self, rtype):
+        """Get record data by identity of input record type."""
+
+        result = self._records.get(rtype)
+
+        if result is None:
+            result = self._records[rtype] = OrderedDict()
+
+        return result
+
+
+class MemoryAccessor(Accessor):
+    """Accessor of records saved in a MemoryStore."""
+
+    def __init__(self, rtypes=None, *args, **kwargs):
+        """
+        :param list rtypes: record types to access.
+        """
+
+        super(MemoryAccessor, self).__init__(*args, **kwargs)
+
+        if rtypes is not None:
+            self.__rtypes__ = rtypes
+
+    def record2data(self, store, record, dirty=True):
+
+        return record.raw(dirty=dirty)
+
+    def data2record(self, store, rtype, data=None):
+
+        return rtype(**{} if data is None else data)
+
+    def add(self, store, records):
+
+        for record in records:
+            table = store._table(record.__class__)
+            table[record.identity] = record.raw()
+
+        return records
+
+    def update(self, store, records, upsert=False):
+
+        for record in records:
+            table = store._table(record.__class__)
+            identity = record.identity
+
+            if not upsert and identity not in table:
+                raise Accessor.Error('No record {0}.'.format(identity))
+
+            table[identity] = record.raw()
+
+        return records
+
+    def get(self, store, record):
+
+        data = store._table(record.__class__)[record.identity]
+
+        return self.data2record(store=store, rtype=record.__class__, data=data)
+
+    def count(self, store, rtypes, data=None):
+
+        return sum(
+            1 for _ in self._iterdata(store=store, rtypes=rtypes, data=data)
+        )
+
+    def find(
+        self, store, rtypes, records=None, data=None,
+        limit=None, skip=None, sort=None
+    ):
+
+        if records is None:
+            items = list(self._iterdata(store=store, rtypes=rtypes, data=data))
+
+        else:
+            items = []
+
+            for record in records:
+                rtype = record.__class__
+                rdata = store._table(rtype).get(record.identity)
+
+                if rdata is not None:
+                    items.append((rtype, rdata))
+
+        if sort:
+            items.sort(key=lambda item: [item[1].get(name) for name in sort])
+
+        if skip:
+            items = items[skip:]
+
+        if limit is not None:
+            items = items[:limit]
+
+        return [
+            self.data2record(store=store, rtype=rtype, data=rdata)
+            for rtype, rdata in items
+        ]
+
+    def remove(self, store, rtypes, records=None, data=None):
+
+        result = []
+
+        if records is None:
+            for rtype, rdata in list(
+                    self._iterdata(store=store, rtypes=rtypes, data=data)
+            ):
+                record = self.data2record(store=store, rtype=rtype, data=rdata)
+                del store._table(rtype)[record.identity]
+                result.append(record)
+
+        else:
+            for record in records:
+                del store._table(record.__class__)[record.identity]
+                result.append(record)
+
+        return result
+
+    def _iterdata(self, store, rtypes, data=None):
+        """Iterate on (rtype, data) of input record types matching data."""
+
+        for rtype in rtypes:
+            for rdata in store._table(rtype).values():
+                if data is None or all(
+                        rdata.get(name) == data[name] for name in data
+                ):
+                    yield rtype, rdata
@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+
+# --------------------------------------------------------------------
+# The MIT License (MIT)
+#
+# Copyright (c) 2014 Jonathan Labéjof <jonathan.labejof@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# --------------------------------------------------------------------
+
+"""Benchmark workloads.
+
+A workload is a function which takes a number of records, prepares its data,
+and returns elapsed seconds of its measured part."""
+
+__all__ = ['WORKLOADS']
+
+from timeit import default_timer as timer
+
+from b3j0f.sync import Field, Record, Store, StoreRegistry
+
+from .memory import MemoryAccessor, MemoryStore
+
+
+class BenchRecord(Record):
+
+    uid = Field(ftype=int, identifier=True)
+    value = Field(ftype=int, default=0)
+    name = Field(ftype=str, default='')
+
+
+class BenchRecord0(BenchRecord):
+    pass
+
+
+class BenchRecord1(BenchRecord):
+    pass
+
+
+class BenchRecord2(BenchRecord):
+    pass
+
+
+class BenchRecord3(BenchRecord):
+    pass
+
+
+RTYPES = [BenchRecord0, BenchRecord1, BenchRecord2, BenchRecord3]
+
+
+def _records(size, rtypes=RTYPES, offset=0):
+    """Create size records of input record types."""
+
+    count = len(rtypes)
+
+    return [
+        rtypes[index % count](
+            uid=offset + index, value=index % 10, name='name{0}'.format(index)
+        )
+        for index in range(size)
+    ]
+
+
+def _store(**kwargs):
+    """Create a store with an accessor per two record types."""
+
+    return MemoryStore(
+        accessors=[
+            MemoryAccessor(rtypes=RTYPES[:2]), MemoryAccessor(rtypes=RTYPES[2:])
+        ],
+        **kwargs
+    )
+
+
+class _DispatchAccessor(MemoryAccessor):
+    """Accessor which only returns added records."""
+
+    def add(self, store, records):
+
+        return records
+
+
+def construct(size):
+    """Record construction."""
+
+    start = timer()
+    _records(size)
+
+    return timer() - start
+
+
+def equality(size):
+    """Record hashing, equality and set operations."""
+
+    records = _records(size)
+    copies = [record.copy() for record in records]
+
+    start = timer()
+
+    for left, right in zip(records, copies):
+        left == right
+
+    set(records) & set(copies[::2])
+
+    return timer() - start
+
+
+def raw(size):
+    """Record conversion to raw data."""
+
+    records = _records(size)
+
+    start = timer()
+
+    for record in records:
+        record.raw()
+
+    return timer() - start
+
+
+def dispatch(size):
+    """Store._execute dispatch of heterogeneous records."""
+
+    records = _records(size)
+
+    store = Store(
+        accessors=[
+            _DispatchAccessor(rtypes=RTYPES[:2]),
+            _DispatchAccessor(rtypes=RTYPES[2:])
+        ]
+    )
+
+    start = timer()
+    store.add(records=records)
+
+    return timer() - start
+
+
+def add(size):
+    """Bulk add."""
+
+    records = _records(size)
+    store = _store()
+
+    start = timer()
+    store.add(records=records)
+
+    return timer() - start
+
+
+def update(size):
+    """Bulk update of modified records."""
+
+    records = _records(size)
+    store = _store()
+    store.add(records=records)
+
+    for record in records:
+        record.value += 1
+
+    start = timer()
+    store.update(records=records)
+
+    return timer() - start
+
+
+def find(size):
+    """Find with filters, skip, limit and sort."""
+
+    store = _store()
+    store.add(records=_records(size))
+
+    start = timer()
+
+    store.find(data={'value': 1})
+    store.find(rtypes=[BenchRecord0], data={'value': 2}, sort=['uid'])
+    store.find(skip=size // 2, limit=size // 10)
+
+    return timer() - start
+
+
+def synchronize(size):
+    """Synchronization of two sources to two targets."""
+
+    sources = [_store(id=0), _store(id=1)]
+    targets = [_store(id=2), _store(id=3)]
+
+    sources[0].add(records=_records(size // 2))
+    sources[1].add(records=_records(size - size // 2, offset=size // 2))
+
+    registry = StoreRegistry(stores=sources + targets)
+
+    start = timer()
+    registry.synchronize(sources=sources, targets=targets)
+
+    return timer() - start
+
+
+#: workloads by name.
+WORKLOADS = dict(
+    (workload.__name__, workload) for workload in [
+        construct, equality, raw, dispatch, add, update, find, synchronize
+    ]
+)
@@ -67,7 +67,9 @@ URL = 'https://github.com/{0}'.format(NAMEPATH)
 setup(
     name=NAME,
     version=VERSION,
-    packages=find_packages(exclude=['test.*', '*.test.*']),
+    packages=find_packages(
+        exclude=['test.*', '*.test.*', 'benchmarks', 'benchmarks.*']
+    ),
     author='b3j0f',
     author_email='ib3j0f@gmail.com',
     install_requires=DEPENDENCIES,